@@ -0,0 +1,71 @@
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from backend.core.config import settings
+from backend.models.schemas import BulkJobResponse, SkillExtractor
+from backend.services.bulk_service import get_bulk_store, submit_bulk_job
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/bulk", tags=["bulk"])
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+@router.post("", response_model=BulkJobResponse)
+async def create_bulk_job(file: UploadFile = File(...), extractor: Optional[SkillExtractor] = Form(None)):
+    """
+    Queue a bulk matching job.
+
+    - **file**: JSONL, one {"job_text": ..., "resume_text": ..., "id": ...} object per line (`id` is optional)
+    - **extractor**: skill extractor for every pair (defaults to the server setting)
+
+    Returns the job ID and its progress. Uploading the same file again returns the existing job.
+    """
+    logger.info("Bulk job upload - Filename: %s", file.filename)
+
+    max_bytes = settings.bulk_max_upload_mb * 1024 * 1024
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            logger.warning("Bulk upload too large: over %sMB", settings.bulk_max_upload_mb)
+            raise HTTPException(status_code=400, detail=f"File size must be less than {settings.bulk_max_upload_mb}MB")
+        chunks.append(chunk)
+
+    try:
+        job = await submit_bulk_job(b"".join(chunks), extractor=extractor)
+    except ValueError as e:
+        logger.warning("Invalid bulk job input: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BulkJobResponse(**job, status="success")
+
+@router.get("/{job_id}", response_model=BulkJobResponse)
+def get_bulk_job(job_id: str):
+    """
+    Return the progress of a bulk job.
+    """
+    job = get_bulk_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return BulkJobResponse(**job, status="success")
+
+@router.get("/{job_id}/results")
+def get_bulk_results(job_id: str, after: int = -1):
+    """
+    Stream the finished results of a bulk job as JSON lines, in input order.
+
+    Results are available while the job is still running. Pass the last
+    `index` received as `after` to fetch only newer results.
+    """
+    store = get_bulk_store()
+    if store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+
+    return StreamingResponse(
+        store.results(job_id, after=after),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="bulk-{job_id}.jsonl"'},
+    )
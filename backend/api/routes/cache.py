@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from backend.services.cache_service import skill_cache
+from backend.services.embedding_batcher import current_batcher
+from backend.services.matcher_service import current_embedding_store
+from backend.services.resume_service import resume_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/cache", tags=["cache"])
+
+@router.get("/stats")
+def cache_stats():
+    """
+    Hit/miss counters and sizes for the skill, embedding and uploaded resume stores, plus
+    batch size and queue wait stats for the embedding micro-batcher.
+
+    The embedding store and batcher are null until the first encode: reading
+    stats never loads the model or starts the batcher.
+    """
+    logger.debug("Cache stats endpoint called")
+    embedding_store = current_embedding_store()
+    batcher = current_batcher()
+    return {
+        "skills": skill_cache.stats(),
+        "embeddings": embedding_store.stats() if embedding_store is not None else None,
+        "resumes": resume_store.stats(),
+        "embedding_batcher": batcher.stats() if batcher is not None else None,
+    }
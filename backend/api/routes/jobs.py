@@ -0,0 +1,80 @@
+from fastapi import APIRouter, HTTPException
+from backend.core.config import settings
+from backend.models.schemas import (
+    JobPostingRequest,
+    JobPostingResponse,
+    JobSearchRequest,
+    JobSearchResponse,
+    JobSearchResult,
+)
+from backend.services.ai_service import SkillExtractionError
+from backend.services.job_index_service import get_job_index, recommend_jobs, register_job
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+@router.post("", response_model=JobPostingResponse)
+async def create_job(data: JobPostingRequest):
+    """
+    Register a job posting so resumes can be searched against it.
+    """
+    logger.info("Job registration request - %s chars", len(data.job_text))
+
+    if not data.job_text.strip():
+        raise HTTPException(status_code=400, detail="Job text must not be empty")
+
+    try:
+        result = await register_job(data.job_text, title=data.title)
+    except SkillExtractionError as e:
+        logger.error("Job not registered: %s", e)
+        raise HTTPException(status_code=502, detail="Skill extraction failed, the job was not registered; please retry")
+    return JobPostingResponse(**result, status="success")
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    """
+    Return a registered job posting with its extracted skills.
+    """
+    job = get_job_index().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {**job, "status": "success"}
+
+@router.post("/search", response_model=JobSearchResponse)
+async def search_jobs(data: JobSearchRequest):
+    """
+    Find the top-k registered jobs for a resume.
+    """
+    logger.info("Job search request - top %s, rerank: %s", data.top_k, data.rerank)
+
+    if not 1 <= data.top_k <= settings.job_search_max_k:
+        raise HTTPException(
+            status_code=400,
+            detail=f"top_k must be between 1 and {settings.job_search_max_k}"
+        )
+
+    start_time = time.time()
+
+    try:
+        results = await recommend_jobs(
+            data.resume_text,
+            top_k=data.top_k,
+            shortlist_size=settings.job_search_shortlist_size,
+            rerank=data.rerank,
+        )
+
+        elapsed_time = time.time() - start_time
+        logger.info("Job search completed in %.2fs - %s results", elapsed_time, len(results))
+
+        return JobSearchResponse(
+            total_jobs=get_job_index().size(),
+            results=[JobSearchResult(**r) for r in results],
+            status="success"
+        )
+
+    except Exception as e:
+        logger.exception("Job search failed: %s", e)
+        raise
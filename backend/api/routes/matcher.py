@@ -1,6 +1,18 @@
-from fastapi import APIRouter, Request
-from backend.models.schemas import JobMatchRequest, JobMatchResponse
-from backend.services.matcher_service import calculate_job_match
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from backend.core.config import settings
+from backend.models.schemas import (
+    BatchMatchRequest,
+    BatchMatchResponse,
+    BatchMatchResult,
+    JobMatchRequest,
+    JobMatchResponse,
+)
+from backend.services.matcher_service import calculate_batch_match, calculate_job_match, stream_job_match
+from backend.services.resilience import UpstreamUnavailableError
+from backend.services.resume_service import resume_store
+import asyncio
+import json
 import logging
 import time
 from typing import Optional
@@ -9,25 +21,40 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["matcher"])
 
+async def resolve_resume_text(data: JobMatchRequest) -> str:
+    """
+    The resume text of a match request, given inline or as a stored resume_id.
+    """
+    if (data.resume_text is None) == (data.resume_id is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of resume_text and resume_id")
+    if data.resume_text is not None:
+        return data.resume_text
+
+    stored = await asyncio.to_thread(resume_store.get, data.resume_id)
+    if stored is None:
+        logger.warning("Unknown or expired resume_id: %s", data.resume_id)
+        raise HTTPException(status_code=404, detail="Resume not found or expired; upload it again")
+    return stored["text"]
+
 @router.post("/match", response_model=JobMatchResponse)
-def match_job_resume(data: JobMatchRequest, request: Request):
+async def match_job_resume(data: JobMatchRequest, request: Request):
     """
     Calculate how well a resume matches a job description.
     """
     client_ip: Optional[str] = request.client.host if request.client else "unknown"
-    logger.info(f"New match request from {client_ip}")
-    logger.debug(f"Request data - Job: {len(data.job_text)} chars, Resume: {len(data.resume_text)} chars")
+    logger.info("New match request from %s", client_ip)
+    resume_text = await resolve_resume_text(data)
+    logger.debug("Request data - Job: %d chars, Resume: %d chars", len(data.job_text), len(resume_text))
 
     start_time = time.time()
 
     try:
-        result = calculate_job_match(data.job_text, data.resume_text)
+        result = await calculate_job_match(data.job_text, resume_text, extractor=data.extractor)
         
         elapsed_time = time.time() - start_time
         logger.info(
-            f"Match request completed in {elapsed_time:.2f}s - "
-            f"Semantic: {result['similarity_score']}%, "
-            f"Skills: {result['matched_skill_percentage']}%"
+            "Match request completed in %.2fs - Semantic: %s%%, Skills: %s%%",
+            elapsed_time, result["similarity_score"], result["matched_skill_percentage"],
         )
         
         response = JobMatchResponse(
@@ -39,13 +66,90 @@ def match_job_resume(data: JobMatchRequest, request: Request):
             status="success"
         )
         
-        logger.debug(f"Returning response with {len(response.matched_skills)} matched skills")
+        logger.debug("Returning response with %d matched skills", len(response.matched_skills))
         return response
         
+    except UpstreamUnavailableError:
+        raise
+    except Exception as e:
+        elapsed_time = time.time() - start_time
+        logger.exception(
+            "Match request failed after %.2fs from %s: %s", elapsed_time, client_ip, e,
+        )
+        raise
+
+@router.post("/match/stream")
+async def match_job_resume_stream(data: JobMatchRequest, request: Request):
+    """
+    Same as /match, but streams each stage as a Server-Sent Event when it is ready:
+    `similarity`, `job_skills`, `resume_skills`, then `result` (or `error`).
+    """
+    client_ip: Optional[str] = request.client.host if request.client else "unknown"
+    logger.info("New streaming match request from %s", client_ip)
+    resume_text = await resolve_resume_text(data)
+
+    async def event_stream():
+        start_time = time.time()
+        try:
+            async for stage, payload in stream_job_match(data.job_text, resume_text, extractor=data.extractor):
+                logger.debug("Streaming stage '%s' after %.2fs", stage, time.time() - start_time)
+                yield f"event: {stage}\ndata: {json.dumps(payload)}\n\n"
+            logger.info("Streaming match request completed in %.2fs", time.time() - start_time)
+        except Exception as e:
+            logger.exception("Streaming match request failed from %s: %s", client_ip, e)
+            yield f"event: error\ndata: {json.dumps({'detail': 'Failed to calculate match'})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/match/batch", response_model=BatchMatchResponse)
+async def match_job_resumes_batch(data: BatchMatchRequest, request: Request):
+    """
+    Rank many resumes against one job description, best match first.
+    """
+    client_ip: Optional[str] = request.client.host if request.client else "unknown"
+    logger.info("New batch match request from %s - %s resumes", client_ip, len(data.resumes))
+
+    if not data.resumes:
+        raise HTTPException(status_code=400, detail="At least one resume is required")
+    if len(data.resumes) > settings.batch_max_resumes:
+        logger.warning("Batch too large: %s resumes", len(data.resumes))
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {settings.batch_max_resumes} resumes"
+        )
+
+    start_time = time.time()
+
+    try:
+        result = await calculate_batch_match(
+            data.job_text,
+            [resume.resume_text for resume in data.resumes],
+            top_k=data.top_k,
+            extractor=data.extractor,
+        )
+
+        elapsed_time = time.time() - start_time
+        logger.info("Batch match request completed in %.2fs - %s resumes", elapsed_time, len(data.resumes))
+
+        return BatchMatchResponse(
+            job_skills=result["job_skills"],
+            total_resumes=len(data.resumes),
+            results=[
+                BatchMatchResult(candidate_id=data.resumes[r["index"]].candidate_id, **r)
+                for r in result["results"]
+            ],
+            status="success"
+        )
+
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
         elapsed_time = time.time() - start_time
-        logger.error(
-            f"Match request failed after {elapsed_time:.2f}s from {client_ip}: {str(e)}",
-            exc_info=True
+        logger.exception(
+            "Batch match request failed after %.2fs from %s: %s", elapsed_time, client_ip, e,
         )
-        raise
\ No newline at end of file
+        raise
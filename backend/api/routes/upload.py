@@ -1,12 +1,20 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from backend.core.config import settings
 from backend.models.schemas import PDFUploadResponse
-from backend.services.pdf_service import extract_text_pdf
+from backend.services.pdf_service import extract_pdf
+from backend.services.resume_service import make_resume_id, prepare_resume, resume_store
+import asyncio
+import hashlib
 import logging
+import os
+import tempfile
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["upload"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 @router.post("/upload-pdf", response_model=PDFUploadResponse)
 async def upload_pdf(file: UploadFile =  File(...)):
     """
@@ -14,45 +22,83 @@ async def upload_pdf(file: UploadFile =  File(...)):
     
     - **file**: PDF file to upload
     
-    Returns the extracted text.
+    Returns the extracted text and a `resume_id` that /api/match accepts
+    instead of `resume_text`. The ID is a hash of the file, so uploading the
+    same file again returns the stored text without extracting it.
     """
-    logger.info(f"PDF upload request - Filename: {file.filename}, Content-Type: {file.content_type}")
+    logger.info("PDF upload request - Filename: %s, Content-Type: %s", file.filename, file.content_type)
 
     # Validate file type
     if file.content_type != "application/pdf":
-        logger.warning(f"Invalid file type: {file.content_type}")
+        logger.warning("Invalid file type: %s", file.content_type)
         raise HTTPException(status_code=400, detail="File must be a PDF")  
     
-    # Validate file size (max 10MB)
-    file_bytes = await file.read()
-    file_size_mb = len(file_bytes) / (1024 * 1024)
-    
-    if file_size_mb > 10:
-        logger.warning(f"File too large: {file_size_mb:.2f}MB")
-        raise HTTPException(status_code=400, detail="File size must be less than 10MB")
-
-    logger.debug(f"File size: {file_size_mb:.2f}MB")
+    # Validate file size while copying to a temp file, so oversized uploads
+    # are rejected without ever being held in memory
+    max_bytes = settings.pdf_max_upload_mb * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        logger.warning("File too large: %.2fMB", file.size / (1024 * 1024))
+        raise HTTPException(status_code=400, detail=f"File size must be less than {settings.pdf_max_upload_mb}MB")
 
+    tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
     try:
+        file_size = 0
+        pdf_sha256 = hashlib.sha256()
+        with tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > max_bytes:
+                    logger.warning("File too large: over %sMB", settings.pdf_max_upload_mb)
+                    raise HTTPException(status_code=400, detail=f"File size must be less than {settings.pdf_max_upload_mb}MB")
+                pdf_sha256.update(chunk)
+                tmp.write(chunk)
+
+        logger.debug("File size: %.2fMB", file_size / (1024 * 1024))
+
+        resume_id = make_resume_id(pdf_sha256)
+        stored = await asyncio.to_thread(resume_store.get, resume_id)
+        if stored is not None:
+            logger.info("PDF already uploaded - Resume: %s, skipping extraction", resume_id)
+            return PDFUploadResponse(
+                resume_id=resume_id,
+                text=stored["text"],
+                page_count=stored["page_count"],
+                char_count=len(stored["text"]),
+                cached=True,
+                status="success"
+            )
+
         # Extract text
-        text = extract_text_pdf(file_bytes)
-        
-        # Count pages (rough estimate)
-        page_count = text.count('\f') + 1 if '\f' in text else len(text) // 2000
+        result = await extract_pdf(tmp.name)
+        text = result["text"]
+        page_count = result["page_count"]
         char_count = len(text)
         
-        logger.info(f"PDF processed successfully - {page_count} pages, {char_count} chars")
+        logger.info("PDF processed successfully - Resume: %s, %s pages, %s chars", resume_id, page_count, char_count)
+
+        await asyncio.to_thread(resume_store.put, resume_id, text, page_count)
+        if settings.resume_prepare_on_upload:
+            prepare_resume(text)
         
         return PDFUploadResponse(
+            resume_id=resume_id,
             text=text,
             page_count=page_count,
             char_count=char_count,
+            cached=False,
             status="success"
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
-        logger.error(f"PDF extraction failed: {str(e)}")
+        logger.error("PDF extraction failed: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        logger.error("PDF extraction timed out after %ss", settings.pdf_extraction_timeout_seconds)
+        raise HTTPException(status_code=504, detail="PDF processing timed out")
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to process PDF")
\ No newline at end of file
+        logger.exception("Unexpected error: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to process PDF")
+    finally:
+        os.unlink(tmp.name)
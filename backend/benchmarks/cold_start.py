@@ -0,0 +1,90 @@
+"""
+Cold-start measurements for the API.
+
+Reports, each in a fresh process:
+- import time of `backend.main`
+- time until /health/live and /health/ready answer under uvicorn
+- latency of the first /api/match request (local extractor, so no OpenAI call)
+
+    python -m backend.benchmarks.cold_start --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import backend.main; "
+    "print(time.perf_counter() - started)"
+)
+
+SAMPLE_MATCH = {
+    "job_text": "Backend engineer: Python, FastAPI, PostgreSQL, Docker, Kubernetes, AWS.",
+    "resume_text": "Built REST APIs in Python with FastAPI and Postgres, deployed with Docker on AWS.",
+    "extractor": "local",
+}
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def wait_for(client: httpx.Client, path: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(path).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{path} did not become healthy within {timeout}s")
+
+
+def measure_server(port: int, timeout: float) -> dict:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            live = wait_for(client, "/health/live", started, timeout)
+            ready = wait_for(client, "/health/ready", started, timeout)
+            request_started = time.perf_counter()
+            client.post("/api/match", json=SAMPLE_MATCH).raise_for_status()
+            first_request = time.perf_counter() - request_started
+            request_started = time.perf_counter()
+            client.post("/api/match", json=SAMPLE_MATCH).raise_for_status()
+            second_request = time.perf_counter() - request_started
+    finally:
+        server.terminate()
+        server.wait()
+    return {"live_s": live, "ready_s": ready, "first_request_s": first_request, "second_request_s": second_request}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    servers = [measure_server(args.port, args.timeout) for _ in range(args.runs)]
+
+    summary = {"import_s": statistics.median(imports)}
+    for key in servers[0]:
+        summary[key] = statistics.median(run[key] for run in servers)
+    print(json.dumps({k: round(v, 3) for k, v in summary.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Shared helpers for benchmark scripts: latency summaries, run metadata and JSON results.
+"""
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+def summarize(latencies_s: list[float], elapsed_s: float = None) -> dict:
+    """
+    Latency percentiles in milliseconds, plus throughput when the wall time is known.
+    """
+    ms = np.array(latencies_s) * 1000 if latencies_s else np.zeros(1)
+    summary = {
+        "count": len(latencies_s),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+    if elapsed_s:
+        summary["throughput_per_s"] = round(len(latencies_s) / elapsed_s, 2)
+    return summary
+
+
+def time_calls(fn, rounds: int, warmup: int = 3) -> dict:
+    """
+    Call `fn` `warmup` times untimed, then `rounds` times, and summarize per-call latency.
+    """
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        call_started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "argv": sys.argv[1:],
+    }
+
+
+def write_results(kind: str, results: dict, output: str = None) -> dict:
+    """
+    Print the results and, with `output`, write them as
+    {"kind", "meta", "results": {name: summary}} for compare.py.
+    """
+    document = {"kind": kind, "meta": run_metadata(), "results": results}
+    print(json.dumps(document, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+    return document
@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files (from micro.py or load.py) and flag regressions.
+
+A benchmark regresses when its p50 or p95 latency grows, or its throughput
+drops, by more than `--threshold` (default 10%). Exits with status 1 if
+anything regressed, so it can gate CI.
+
+    python -m backend.benchmarks.compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import json
+
+# (metric, True if higher is better)
+METRICS = (("p50_ms", False), ("p95_ms", False), ("throughput_per_s", True))
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    rows = []
+    for name, current_stats in current["results"].items():
+        baseline_stats = baseline["results"].get(name)
+        if baseline_stats is None:
+            continue
+        for metric, higher_is_better in METRICS:
+            before, after = baseline_stats.get(metric), current_stats.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            regressed = change < -threshold if higher_is_better else change > threshold
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regressed": regressed,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'benchmark':<32} {'metric':<18} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['benchmark']:<32} {row['metric']:<18} {row['baseline']:>12.3f} "
+            f"{row['current']:>12.3f} {row['change']:>+9.1%}{flag}"
+        )
+    raise SystemExit(1 if any(row["regressed"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Fixed benchmark corpus: sample job descriptions, resumes, and text-based PDFs
+built from them, so every run (and every version) works on the same inputs.
+"""
+import itertools
+
+JOBS = [
+    """Senior Backend Engineer (Python). You will design and operate microservices in Python 3
+with FastAPI and Django, backed by PostgreSQL and Redis. We deploy with Docker and Kubernetes
+on AWS (EC2, S3, Lambda) and ship through GitLab CI/CD. Experience with Celery or RabbitMQ,
+REST APIs and GraphQL is expected. You will own monitoring with Prometheus and Grafana, write
+tests with pytest, take part in code reviews and work in an Agile/Scrum team.""",
+
+    """Machine Learning Engineer. Build and deploy models for fraud detection using Python,
+scikit-learn, XGBoost and PyTorch. Own the MLOps pipeline: feature pipelines in Airflow,
+experiment tracking with MLflow, model serving with FastAPI in Docker on GCP. Strong SQL,
+pandas and NumPy skills are required; Spark and Kafka are a plus. You will collaborate with
+data engineers and present results to stakeholders.""",
+
+    """Full Stack Developer. Our product is a React and TypeScript single-page app with a
+Node.js and Express API, MongoDB and Redis. You will write unit and integration tests with
+Jest, build CI pipelines with GitHub Actions and deploy to Azure. Familiarity with GraphQL,
+WebSockets, OAuth and JWT authentication is important. We value clean code, pair programming
+and TDD.""",
+
+    """DevOps / Platform Engineer. Operate Kubernetes clusters with Helm and Argo CD, write
+Terraform and Ansible for AWS infrastructure, and maintain Jenkins and GitLab CI/CD pipelines.
+You will run observability with Prometheus, Grafana and the ELK stack (Elasticsearch), manage
+Linux servers and Nginx, and script in Bash and Python. On-call rotation and incident reviews
+are part of the role.""",
+
+    """Data Engineer. Design batch and streaming data pipelines with Spark, Kafka and Airflow.
+Model data in PostgreSQL, MySQL and a cloud data warehouse on AWS. Write production Python
+and SQL, containerize jobs with Docker and orchestrate them on Kubernetes. Experience with
+ETL, data quality checks and dbt is desirable. Agile delivery with two-week sprints.""",
+
+    """Java Backend Developer. Build REST APIs with Java and Spring Boot, persist data in Oracle
+and PostgreSQL, and integrate with RabbitMQ and Kafka. Services run in Docker on Kubernetes.
+You will write JUnit tests, use Git and Jenkins for CI/CD, and follow secure coding practices
+including OAuth, RBAC and JWT.""",
+]
+
+RESUMES = [
+    """Backend developer with six years of Python experience. Built REST APIs with FastAPI and
+Flask, stored data in Postgres and Redis, and ran async tasks with Celery. Containerized all
+services with Docker and deployed them to k8s on AWS using GitLab pipelines. Added Prometheus
+metrics and Grafana dashboards, wrote pytest suites and mentored juniors in code reviews.
+Worked in Scrum teams.""",
+
+    """Data scientist turned ML engineer. Trained gradient boosting (XGBoost) and PyTorch models
+for credit risk, tracked experiments in MLflow and scheduled retraining with Airflow. Served
+models behind FastAPI in Docker containers on Google Cloud. Daily tools: Python, pandas, NumPy,
+scikit-learn, SQL and Jupyter. Some experience with Spark.""",
+
+    """Frontend-focused full stack engineer. Built React.js and TypeScript applications with
+Redux, a Node/Express backend and MongoDB. Wrote Jest and Cypress tests, set up GitHub Actions,
+and deployed to Vercel and Azure. Implemented OAuth login and JWT sessions and real-time
+features over WebSockets.""",
+
+    """Site reliability engineer. Ran production Kubernetes with Helm charts, automated AWS
+infrastructure with Terraform and Ansible, and maintained Jenkins pipelines. Built monitoring
+with Prometheus, Grafana and Elasticsearch, tuned Nginx, and wrote tooling in Bash, Python and
+Go. Led incident postmortems and on-call.""",
+
+    """Data engineer with experience building ETL pipelines in Python and SQL. Streamed events
+through Kafka into Spark jobs, orchestrated with Airflow, and modeled data in PostgreSQL and
+Snowflake on AWS. Packaged jobs in Docker. Familiar with dbt, data quality testing and agile
+delivery.""",
+
+    """Software engineer focused on Java and Spring Boot microservices. Worked with MySQL, Oracle
+and RabbitMQ, built CI/CD with Jenkins and Git, deployed to Docker and OpenShift. Wrote JUnit
+and Mockito tests and implemented role-based access control and OAuth2 security.""",
+]
+
+
+def match_pairs() -> list[tuple[str, str]]:
+    """Every job paired with every resume, in a fixed order."""
+    return list(itertools.product(JOBS, RESUMES))
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """
+    Build a minimal text-based PDF with one page per string (Helvetica, one
+    text line per input line), readable by PyPDF2.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    font_id = 3 + 2 * len(pages)
+    for i, page in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        lines = " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page.splitlines())
+        stream = f"BT /F1 10 Tf 12 TL 50 750 Td {lines} ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def resume_pdf(index: int, pages: int = 1) -> bytes:
+    """A PDF of RESUMES[index], repeated over `pages` pages."""
+    return make_pdf([RESUMES[index % len(RESUMES)]] * pages)
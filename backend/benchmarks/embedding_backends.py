@@ -0,0 +1,113 @@
+"""
+Compare embedding backends (torch, onnx, onnx-int8) on this machine.
+
+Each backend runs in its own process so peak RSS is measured in isolation.
+Reports load time, batch throughput, single-text latency and peak RSS, plus
+the largest cosine deviation from the torch backend on the same texts.
+
+    python -m backend.services.embedding_model export-onnx   # once
+    python -m backend.benchmarks.embedding_backends --output embedding_backends.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+SENTENCES = [
+    "Designed and operated Python microservices on Kubernetes with FastAPI and PostgreSQL.",
+    "Led a team building React and TypeScript dashboards backed by GraphQL APIs.",
+    "Owned CI/CD pipelines in GitLab, Terraform modules and AWS infrastructure.",
+    "Trained and deployed PyTorch models with MLflow tracking and Airflow schedules.",
+    "Improved query performance in MySQL and Redis caching for a payments platform.",
+    "Practiced TDD with pytest, code reviews and pair programming in an agile team.",
+]
+
+
+def make_texts(count: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    return [
+        " ".join(rng.choice(SENTENCES, size=int(rng.integers(1, 12))))
+        for _ in range(count)
+    ]
+
+
+def run_child(backend: str, count: int, batch_size: int, single_calls: int) -> dict:
+    os.environ["EMBEDDING_BACKEND"] = backend
+    from backend.services.embedding_model import get_model
+
+    texts = make_texts(count)
+    started = time.perf_counter()
+    model = get_model()
+    load_s = time.perf_counter() - started
+    model.encode(texts[:batch_size], batch_size=batch_size, normalize_embeddings=True)
+
+    started = time.perf_counter()
+    vectors = model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    batch_s = time.perf_counter() - started
+
+    latencies = []
+    for text in texts[:single_calls]:
+        started = time.perf_counter()
+        model.encode([text], normalize_embeddings=True)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    np.save(f"/tmp/embedding_backend_{backend}.npy", np.asarray(vectors, dtype=np.float32))
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 3),
+        "throughput_texts_per_s": round(count / batch_s, 1),
+        "single_p50_ms": round(statistics.median(latencies), 2),
+        "single_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--single-calls", type=int, default=100)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.texts, args.batch_size, args.single_calls)))
+        return
+
+    results = []
+    for backend in args.backends:
+        output = subprocess.run(
+            [sys.executable, "-m", "backend.benchmarks.embedding_backends", "--child", backend,
+             "--texts", str(args.texts), "--batch-size", str(args.batch_size),
+             "--single-calls", str(args.single_calls)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    if "torch" in args.backends:
+        reference = np.load("/tmp/embedding_backend_torch.npy")
+        for result in results:
+            vectors = np.load(f"/tmp/embedding_backend_{result['backend']}.npy")
+            # Cosine of every text against the first one, as a proxy for match scores
+            deltas = np.abs(vectors @ vectors[0] - reference @ reference[0])
+            result["max_cosine_delta_vs_torch"] = float(deltas.max())
+
+    for result in results:
+        print(json.dumps(result))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
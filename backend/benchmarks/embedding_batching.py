@@ -0,0 +1,93 @@
+"""
+Encode throughput and latency with and without the embedding micro-batcher.
+
+Simulates `--concurrency` in-flight matches, each encoding a job/resume pair
+(two texts, like _semantic_similarity) in a loop. Runs once with direct
+model.encode calls and once through the batcher, and reports texts/s, p50 and
+p99 request latency, and the batcher's batch size and queue wait stats.
+
+    python -m backend.benchmarks.embedding_batching --concurrency 64 --requests 2000
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+
+from backend.benchmarks.embedding_backends import make_texts
+from backend.core.config import settings
+from backend.services.embedding_batcher import EmbeddingBatcher
+from backend.services.embedding_model import get_model
+
+
+def run(encode, texts: list[str], concurrency: int, requests: int) -> dict:
+    latencies = []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            pair = [texts[(2 * index) % len(texts)], texts[(2 * index + 1) % len(texts)]]
+            started = time.perf_counter()
+            encode(pair)
+            latency = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(latency)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "texts_per_s": round(2 * requests / elapsed, 1),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+        "latency_ms_p99": round(float(np.percentile(latencies, 99)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--window-ms", type=float, default=settings.embedding_batch_window_ms)
+    parser.add_argument("--max-texts", type=int, default=settings.embedding_batch_max_texts)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    model = get_model()
+    texts = make_texts(1000)
+    model.encode(texts[:64], normalize_embeddings=True)
+
+    direct = run(
+        lambda pair: model.encode(pair, normalize_embeddings=True),
+        texts, args.concurrency, args.requests,
+    )
+    batcher = EmbeddingBatcher(model, args.window_ms, args.max_texts, settings.batch_encode_size)
+    batched = run(batcher.encode, texts, args.concurrency, args.requests)
+    batched["batcher"] = batcher.stats()
+    batcher.stop()
+
+    results = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "direct": direct,
+        "batched": batched,
+        "throughput_gain": round(batched["texts_per_s"] / direct["texts_per_s"], 2),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
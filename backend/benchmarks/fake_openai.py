@@ -0,0 +1,143 @@
+"""
+Offline stand-in for the OpenAI Responses API, for benchmarks and load tests.
+
+Answers POST /v1/responses after a configurable delay. The skill list it
+returns is canned: the text embedded in the extraction prompt is run through
+the local taxonomy extractor, so outputs are deterministic and realistic
+without a network call. Requests with a JSON-schema text format (the
+"structured" extractor) get a {"job_skills": [...], "resume_skills": [...]}
+object built the same way, and per-section requests (incremental matching)
+a {"sections": [...]} object. A fraction of calls can fail with a given status.
+
+    python -m backend.benchmarks.fake_openai --port 8001 --latency-ms 400 --jitter-ms 200 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=fake uvicorn backend.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from backend.services.skill_extractor import get_local_extractor
+
+# The extraction prompt embeds the input as "<CONTEXT> TEXT:\n...\n\nOUTPUT FORMAT:"
+PROMPT_TEXT_PATTERN = re.compile(r"TEXT:\n(.*?)\n\nOUTPUT FORMAT", re.DOTALL)
+# The structured prompt embeds each document as "<LABEL>:\n<<<\n...\n>>>"
+STRUCTURED_DOCUMENT_PATTERN = re.compile(r"(JOB DESCRIPTION|RESUME):\n<<<\n(.*?)\n>>>", re.DOTALL)
+STRUCTURED_FIELDS = {"JOB DESCRIPTION": "job_skills", "RESUME": "resume_skills"}
+# The per-section prompt embeds each section as "SECTION <n>:\n<<<\n...\n>>>"
+SECTION_PATTERN = re.compile(r"SECTION (\d+):\n<<<\n(.*?)\n>>>", re.DOTALL)
+
+
+def canned_skills(prompt: str) -> list[str]:
+    match = PROMPT_TEXT_PATTERN.search(prompt)
+    return get_local_extractor().extract(match.group(1) if match else prompt)
+
+
+def canned_structured(prompt: str) -> str:
+    output = {"job_skills": [], "resume_skills": []}
+    for label, text in STRUCTURED_DOCUMENT_PATTERN.findall(prompt):
+        output[STRUCTURED_FIELDS[label]] = [
+            {"skill": skill, "canonical": skill} for skill in get_local_extractor().extract(text)
+        ]
+    return json.dumps(output)
+
+
+def canned_sections(prompt: str) -> str:
+    sections = [
+        {"section": int(number), "skills": [{"skill": skill, "canonical": skill} for skill in get_local_extractor().extract(text)]}
+        for number, text in SECTION_PATTERN.findall(prompt)
+    ]
+    return json.dumps({"sections": sections})
+
+
+def make_response(model: str, text: str, input_tokens: int) -> dict:
+    output_tokens = max(1, len(text) // 4)
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [{
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def create_app(latency_ms: float, jitter_ms: float, error_rate: float, error_status: int, seed: int) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(seed)
+    app.state.calls = 0
+    app.state.errors = 0
+
+    @app.post("/v1/responses")
+    async def create_response(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep(max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+        if rng.random() < error_rate:
+            app.state.errors += 1
+            return JSONResponse(
+                status_code=error_status,
+                content={"error": {"message": "Injected failure", "type": "server_error", "code": None}},
+            )
+
+        prompt = body.get("input", "")
+        if isinstance(prompt, list):
+            prompt = "\n".join(str(item.get("content", "")) for item in prompt if isinstance(item, dict))
+        text_format = body.get("text", {}).get("format", {})
+        if text_format.get("name") == "section_skill_extraction":
+            text = canned_sections(prompt)
+        elif text_format.get("type") == "json_schema":
+            text = canned_structured(prompt)
+        else:
+            text = ", ".join(canned_skills(prompt))
+        prompt_chars = len(prompt) + len(body.get("instructions") or "")
+        return make_response(body.get("model", "gpt-4o-mini"), text, input_tokens=max(1, prompt_chars // 4))
+
+    @app.get("/stats")
+    def stats():
+        return {"calls": app.state.calls, "errors": app.state.errors}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
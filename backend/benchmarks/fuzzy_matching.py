@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the fuzzy phase of skill matching.
+
+Compares the vectorized `fuzzy_match_skills` against the original pairwise
+loop on randomized skill sets, checks that both pick the same pairs, and
+reports the speedup.
+
+    python -m backend.benchmarks.fuzzy_matching --sizes 50 100 200 --rounds 20
+"""
+import argparse
+import logging
+import random
+import time
+
+from rapidfuzz import fuzz
+
+from backend.services.ai_service import expand_skills_with_synonyms, fuzzy_match_skills
+from backend.services.taxonomy import get_skill_graph
+
+EXTRA_TERMS = [
+    "react", "react native", "node.js", "graphql", "mongodb", "mysql", "kafka", "spark",
+    "airflow", "terraform", "ansible", "jenkins", "linux", "bash", "git", "java", "spring boot",
+    "go", "rust", "c++", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "mlflow",
+    "data pipelines", "etl", "oauth", "jwt", "websockets", "nginx", "helm", "argo cd",
+]
+
+
+def pairwise_fuzzy_match(job_skills: set[str], resume_skills: set[str], exact_matches: set[str]) -> tuple[set[str], set[str]]:
+    """The original O(J x R) loop, kept here as the reference implementation."""
+    fuzzy_matched_resume = set()
+    fuzzy_matched_job = set()
+    for job_skill in job_skills:
+        if job_skill in exact_matches:
+            continue
+        best_match = None
+        best_score = 0
+        for resume_skill in resume_skills:
+            if resume_skill in exact_matches or resume_skill in fuzzy_matched_resume:
+                continue
+            score = fuzz.ratio(job_skill, resume_skill)
+            if job_skill in resume_skill or resume_skill in job_skill:
+                score = max(score, 85)
+            if score > best_score:
+                best_score = score
+                best_match = resume_skill
+        if best_score >= 80:
+            fuzzy_matched_resume.add(best_match)
+            fuzzy_matched_job.add(job_skill)
+    return fuzzy_matched_job, fuzzy_matched_resume
+
+
+def make_vocabulary(rng: random.Random) -> list[str]:
+    vocabulary = set(EXTRA_TERMS) | set(get_skill_graph().term_class)
+    # Add near-duplicates so the fuzzy phase has real work to do
+    for term in list(vocabulary):
+        vocabulary.add(term + rng.choice(["s", " framework", " development", "-based", " 3"]))
+    return sorted(vocabulary)
+
+
+def time_call(fn, rounds: int, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(*args)
+    return (time.perf_counter() - started) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+
+    print(f"{'terms':>6} {'pairwise ms':>12} {'vectorized ms':>14} {'speedup':>8}  identical")
+    for size in args.sizes:
+        job_skills = expand_skills_with_synonyms(rng.sample(vocabulary, min(size, len(vocabulary))))
+        resume_skills = expand_skills_with_synonyms(rng.sample(vocabulary, min(size, len(vocabulary))))
+        exact_matches = job_skills & resume_skills
+
+        identical = (
+            pairwise_fuzzy_match(job_skills, resume_skills, exact_matches)
+            == fuzzy_match_skills(job_skills, resume_skills, exact_matches)
+        )
+        pairwise = time_call(pairwise_fuzzy_match, args.rounds, job_skills, resume_skills, exact_matches)
+        vectorized = time_call(fuzzy_match_skills, args.rounds, job_skills, resume_skills, exact_matches)
+        print(f"{size:>6} {pairwise * 1000:>12.2f} {vectorized * 1000:>14.2f} {pairwise / vectorized:>7.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+HTTP load generator for /api/match, /cvjob-compare and /api/upload-pdf.
+
+By default it starts its own stack: the fake OpenAI server
+(backend/benchmarks/fake_openai.py) and the API under uvicorn. Caches
+live in a temporary directory, so every run starts cold. Each endpoint is
+driven with `--concurrency` in-flight requests until `--requests` have
+completed. Requests cycle through the fixed corpus. The report gives
+throughput, p50/p95/p99 latency and status counts per endpoint.
+
+    python -m backend.benchmarks.load --concurrency 32 --requests 500 --output load.json
+    python -m backend.benchmarks.load --target http://127.0.0.1:8000   # an already running API
+    python -m backend.benchmarks.compare baseline.json load.json
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import httpx
+
+from backend.benchmarks.common import summarize, write_results
+from backend.benchmarks.corpus import RESUMES, match_pairs, resume_pdf
+
+ENDPOINTS = ("match", "cvjob-compare", "upload-pdf")
+
+
+def make_requests(endpoint: str, extractor: str, pdf_pages: int):
+    """Endless cycle of httpx request kwargs for `endpoint`."""
+    if endpoint == "upload-pdf":
+        pdfs = [resume_pdf(i, pdf_pages) for i in range(len(RESUMES))]
+        while True:
+            for i, pdf in enumerate(pdfs):
+                yield {
+                    "method": "POST",
+                    "url": "/api/upload-pdf",
+                    "files": {"file": (f"resume-{i}.pdf", pdf, "application/pdf")},
+                }
+    path = "/api/match" if endpoint == "match" else "/cvjob-compare"
+    while True:
+        for job, resume in match_pairs():
+            yield {
+                "method": "POST",
+                "url": path,
+                "json": {"job_text": job, "resume_text": resume, "extractor": extractor},
+            }
+
+
+async def drive(client: httpx.AsyncClient, requests, total: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = Counter()
+    remaining = {"count": total}
+
+    async def worker():
+        while remaining["count"] > 0:
+            remaining["count"] -= 1
+            request = next(requests)
+            started = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = summarize(latencies, time.perf_counter() - started)
+    summary["statuses"] = dict(statuses)
+    summary["error_rate"] = round(1 - statuses.get("200", 0) / max(1, len(latencies)), 4)
+    return summary
+
+
+def wait_until_ready(base_url: str, processes: list[subprocess.Popen], timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    with httpx.Client(base_url=base_url, timeout=5) as client:
+        while time.perf_counter() < deadline:
+            if any(process.poll() is not None for process in processes):
+                raise RuntimeError("A benchmark server exited during startup")
+            try:
+                if client.get("/health/ready").status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+    raise TimeoutError(f"API did not become ready within {timeout}s")
+
+
+@contextmanager
+def local_stack(args):
+    """Start the fake OpenAI server and the API, yield the API base URL, then stop both."""
+    processes = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {
+            **os.environ,
+            "PYTHONUNBUFFERED": "1",
+            "OPENAI_API_KEY": "fake",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{args.openai_port}/v1",
+            "SKILL_CACHE_PATH": os.path.join(data_dir, "skill_cache.sqlite3"),
+            "EMBEDDING_STORE_PATH": os.path.join(data_dir, "embeddings"),
+            "JOB_INDEX_PATH": os.path.join(data_dir, "jobs.sqlite3"),
+        }
+        if args.no_cache:
+            env.update({"SKILL_CACHE_ENABLED": "false", "EMBEDDING_CACHE_ENABLED": "false"})
+        try:
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "backend.benchmarks.fake_openai",
+                "--port", str(args.openai_port),
+                "--latency-ms", str(args.openai_latency_ms),
+                "--jitter-ms", str(args.openai_jitter_ms),
+                "--error-rate", str(args.openai_error_rate),
+            ], env=env))
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "uvicorn", "backend.main:app",
+                "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning",
+            ], env=env))
+            base_url = f"http://127.0.0.1:{args.port}"
+            wait_until_ready(base_url, processes, args.startup_timeout)
+            yield base_url
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait()
+
+
+async def run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        for endpoint in args.endpoints:
+            requests = make_requests(endpoint, args.extractor, args.pdf_pages)
+            # Warm up connections and lazy initialization outside the measurement
+            await drive(client, requests, min(args.concurrency, args.requests), args.concurrency)
+            results[endpoint] = await drive(client, requests, args.requests, args.concurrency)
+            print(f"{endpoint}: {results[endpoint]}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="Base URL of a running API; by default a local stack is started")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--extractor", choices=("llm", "local", "hybrid", "structured"), default="llm")
+    parser.add_argument("--pdf-pages", type=int, default=2)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    local = parser.add_argument_group("local stack")
+    local.add_argument("--port", type=int, default=8766)
+    local.add_argument("--workers", type=int, default=1)
+    local.add_argument("--no-cache", action="store_true", help="Disable the skill and embedding caches")
+    local.add_argument("--startup-timeout", type=float, default=180.0)
+    local.add_argument("--openai-port", type=int, default=8767)
+    local.add_argument("--openai-latency-ms", type=float, default=400.0)
+    local.add_argument("--openai-jitter-ms", type=float, default=100.0)
+    local.add_argument("--openai-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.target:
+        results = asyncio.run(run(args.target, args))
+    else:
+        with local_stack(args) as base_url:
+            results = asyncio.run(run(base_url, args))
+    write_results("load", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+In-process micro-benchmarks for the hot functions of the match pipeline.
+
+Runs on the fixed corpus (backend/benchmarks/corpus.py) without any network
+access: skill lists come from the local extractor, so `compare_skills` is
+measured with extractor="local".
+
+    python -m backend.benchmarks.micro --rounds 200 --output micro.json
+    python -m backend.benchmarks.compare baseline.json micro.json
+"""
+import argparse
+import asyncio
+import logging
+
+from backend.benchmarks.common import time_calls, write_results
+from backend.benchmarks.corpus import JOBS, RESUMES, match_pairs, resume_pdf
+from backend.core.config import settings
+from backend.services.ai_service import compare_skills, expand_skills_with_synonyms, match_skill_lists
+from backend.services.pdf_service import extract_text_pdf
+from backend.services.skill_extractor import get_local_extractor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--skip-encode", action="store_true", help="Do not load the embedding model")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.skip_encode:
+        # Semantic skill matching would load the model
+        settings.semantic_skill_matching = False
+    extractor = get_local_extractor()
+    pairs = match_pairs()
+    skill_pairs = [(extractor.extract(job), extractor.extract(resume)) for job, resume in pairs]
+    cycle = {"i": 0}
+
+    def next_index(size: int) -> int:
+        cycle["i"] = (cycle["i"] + 1) % size
+        return cycle["i"]
+
+    loop = asyncio.new_event_loop()
+    results = {}
+
+    results["local_extract"] = time_calls(
+        lambda: extractor.extract(RESUMES[next_index(len(RESUMES))]), args.rounds
+    )
+    results["expand_skills_with_synonyms"] = time_calls(
+        lambda: expand_skills_with_synonyms(skill_pairs[next_index(len(skill_pairs))][0]), args.rounds
+    )
+    results["match_skill_lists"] = time_calls(
+        lambda: match_skill_lists(*skill_pairs[next_index(len(skill_pairs))]), args.rounds
+    )
+    results["compare_skills_local"] = time_calls(
+        lambda: loop.run_until_complete(compare_skills(*pairs[next_index(len(pairs))], extractor="local")),
+        args.rounds,
+    )
+
+    for pages in (1, 10):
+        pdf = resume_pdf(0, pages)
+        results[f"extract_text_pdf_{pages}p"] = time_calls(lambda: extract_text_pdf(pdf), max(10, args.rounds // 10))
+
+    if not args.skip_encode:
+        from backend.services.embedding_model import get_model
+
+        model = get_model()
+        texts = JOBS + RESUMES
+        results["encode_single"] = time_calls(
+            lambda: model.encode([texts[next_index(len(texts))]], normalize_embeddings=True), args.rounds
+        )
+        results["encode_batch_12"] = time_calls(
+            lambda: model.encode(texts, normalize_embeddings=True), max(10, args.rounds // 10)
+        )
+
+        from backend.services.matcher_service import _chunked_similarities
+
+        # Chunking, cache lookups and scoring for a ~4-page resume, once its chunks are cached
+        long_resume = " ".join(RESUMES * 4)
+        results["similarity_chunked_cached"] = time_calls(
+            lambda: _chunked_similarities(JOBS[next_index(len(JOBS))], [long_resume]), args.rounds
+        )
+
+    loop.close()
+    write_results("micro", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
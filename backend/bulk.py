@@ -0,0 +1,151 @@
+"""
+Bulk matching from the command line, without the HTTP server.
+
+Input is JSONL, one {"job_text": ..., "resume_text": ..., "id": ...} object
+per line (`id` is optional). Progress is checkpointed to BULK_STORE_PATH
+after every pair, so running the same command again after a crash resumes
+the job where it stopped. If the crashed run was on this host, the rerun
+takes the job over at once; a job last run on another host is resumed once
+its heartbeat is older than BULK_STALE_SECONDS. Results are JSON lines in
+input order.
+
+    python -m backend.bulk run pairs.jsonl --output results.jsonl --concurrency 16 --extractor local
+    python -m backend.bulk status <job_id>
+    python -m backend.bulk export <job_id> --output results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from contextlib import nullcontext
+
+from backend.core.config import settings
+from backend.services.ai_service import EXTRACTORS, close_client
+from backend.services.bulk_service import BulkRunner, get_bulk_store, owner_is_dead, submit_bulk_job
+from backend.services.embedding_batcher import shutdown_batcher
+
+
+def export(job_id: str, output) -> int:
+    count = 0
+    with open(output, "w", encoding="utf-8") if output else nullcontext(sys.stdout) as f:
+        for line in get_bulk_store().results(job_id):
+            f.write(line)
+            count += 1
+    return count
+
+
+async def report_progress(job_id: str, interval: float) -> None:
+    store = get_bulk_store()
+    started = time.perf_counter()
+    first = store.get(job_id)
+    finished_before = first["done"] + first["failed"]
+    while True:
+        await asyncio.sleep(interval)
+        job = await asyncio.to_thread(store.get, job_id)
+        finished = job["done"] + job["failed"]
+        rate = (finished - finished_before) / (time.perf_counter() - started)
+        eta = f", ~{job['pending'] / rate:.0f}s left" if rate > 0 else ""
+        print(
+            f"{job_id}: {finished}/{job['total']} pairs ({job['failed']} failed), {rate:.1f} pairs/s{eta}",
+            file=sys.stderr,
+        )
+
+
+async def keep_alive(store, job_id: str, owner: str) -> None:
+    while True:
+        await asyncio.sleep(settings.bulk_poll_seconds)
+        await asyncio.to_thread(store.heartbeat, [job_id], owner)
+
+
+async def claim(store, job_id: str, owner: str) -> bool:
+    """
+    Claim the job, taking it over from a crashed run on this host if needed.
+    """
+    if await asyncio.to_thread(store.claim, job_id, owner):
+        return True
+    previous_owner = (await asyncio.to_thread(store.get, job_id))["owner"]
+    if owner_is_dead(previous_owner) and await asyncio.to_thread(store.take_over, job_id, previous_owner, owner):
+        print(f"Bulk job {job_id}: took over from {previous_owner}, which is no longer running", file=sys.stderr)
+        return True
+    print(
+        f"Bulk job {job_id} is being run by {previous_owner}; if that run is gone, "
+        f"it can be resumed once its heartbeat is older than {settings.bulk_stale_seconds:.0f}s",
+        file=sys.stderr,
+    )
+    return False
+
+
+async def run(args) -> int:
+    with open(args.input, "rb") as f:
+        data = f.read()
+    job = await submit_bulk_job(data, extractor=args.extractor)
+    job_id = job["job_id"]
+    print(f"Bulk job {job_id}: {job['total']} pairs, {job['pending']} pending", file=sys.stderr)
+
+    store = get_bulk_store()
+    runner = BulkRunner(store, concurrency=args.concurrency, max_jobs=1, poll_seconds=settings.bulk_poll_seconds)
+    if job["state"] != "completed":
+        if not await claim(store, job_id, runner.owner):
+            return 1
+
+        progress = asyncio.create_task(report_progress(job_id, args.progress_seconds))
+        heartbeat = asyncio.create_task(keep_alive(store, job_id, runner.owner))
+        try:
+            await runner.run_job(job_id)
+        finally:
+            progress.cancel()
+            heartbeat.cancel()
+            # Interrupted runs go back to the queue so the next run resumes at once
+            store.release(job_id, runner.owner)
+        await close_client()
+        shutdown_batcher()
+
+    job = store.get(job_id)
+    count = export(job_id, args.output)
+    print(f"Bulk job {job_id} {job['state']}: wrote {count} results ({job['failed']} failed)", file=sys.stderr)
+    return 0 if job["state"] == "completed" else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="Log each pair at INFO level")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Submit a JSONL file (or resume it) and run it to completion")
+    run_parser.add_argument("input")
+    run_parser.add_argument("--output", help="Write results to this file instead of stdout")
+    run_parser.add_argument("--extractor", choices=EXTRACTORS)
+    run_parser.add_argument("--concurrency", type=int, default=settings.bulk_concurrency)
+    run_parser.add_argument("--progress-seconds", type=float, default=10.0)
+
+    status_parser = commands.add_parser("status", help="Print the progress of a job as JSON")
+    status_parser.add_argument("job_id")
+
+    export_parser = commands.add_parser("export", help="Write the finished results of a job")
+    export_parser.add_argument("job_id")
+    export_parser.add_argument("--output", help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(levelname)s - %(message)s")
+
+    if args.command == "run":
+        try:
+            raise SystemExit(asyncio.run(run(args)))
+        except KeyboardInterrupt:
+            print("Interrupted; run the same command again to resume", file=sys.stderr)
+            raise SystemExit(130)
+
+    job = get_bulk_store().get(args.job_id)
+    if job is None:
+        print(f"Bulk job {args.job_id} not found", file=sys.stderr)
+        raise SystemExit(1)
+    if args.command == "status":
+        print(json.dumps(job, indent=2))
+    else:
+        print(f"Wrote {export(args.job_id, args.output)} results", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,161 @@
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
+from pathlib import Path
+from typing import Literal
 import os
 
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+PACKAGE_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
 class Settings(BaseSettings):
     # App settings
     app_name: str = "Job Matcher API"
     app_version: str = "1.0.0"
-    
+
     # OpenAI API key
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
-    
+
+    # OpenAI client (openai_base_url points the client at a compatible server, e.g. the benchmark stand-in)
+    openai_base_url: str = ""
+    openai_timeout_seconds: float = 30.0
+    openai_max_connections: int = 100
+
+    # OpenAI call resilience: concurrency cap and bounded wait queue (load is shed beyond it),
+    # per-attempt timeout, jittered retries and the circuit breaker
+    openai_max_concurrency: int = 32
+    openai_max_queue: int = 256
+    openai_queue_timeout_seconds: float = 10.0
+    openai_call_timeout_seconds: float = 20.0
+    openai_max_retries: int = 2
+    openai_retry_base_seconds: float = 0.25
+    openai_retry_max_seconds: float = 4.0
+    openai_breaker_failure_threshold: int = 5
+    openai_breaker_reset_seconds: float = 30.0
+
+    # Embedding model: "torch", "onnx" or "onnx-int8"; optional pre-serialized artifact directory
+    embedding_backend: str = "torch"
+    embedding_model_path: str = ""
+    onnx_model_dir: str = str(DATA_DIR / "onnx" / "all-MiniLM-L6-v2")
+    onnx_intra_op_threads: int = 0
+    warm_up_on_startup: bool = True
+
+    # Shared embedding server: when set, workers encode through this Unix socket instead of loading the model
+    embedding_server_socket: str = ""
+    embedding_server_connect_timeout_seconds: float = 60.0
+
+    # Micro-batching of encode calls across concurrent requests
+    embedding_batching_enabled: bool = True
+    embedding_batch_window_ms: float = 5.0
+    embedding_batch_max_texts: int = 256
+
+    # Semantic similarity: "whole" documents (the model truncates at 256 word-pieces) or "chunked"
+    # into overlapping word windows scored with "max", "mean_of_max" or "top_k" aggregation
+    similarity_mode: Literal["whole", "chunked"] = "whole"
+    chunk_words: int = Field(default=128, ge=1)
+    chunk_overlap_words: int = Field(default=32, ge=0)
+    chunk_aggregation: Literal["max", "mean_of_max", "top_k"] = "mean_of_max"
+    chunk_top_k: int = Field(default=3, ge=1)
+
+    # Incremental re-matching: documents are split into sections at blank lines (merged up to
+    # section_min_words) and skills and chunk embeddings are cached per section, so a re-run after
+    # an edit only recomputes the changed sections
+    incremental_matching: bool = False
+    section_min_words: int = 40
+
+    # Embedding cache
+    embedding_cache_enabled: bool = True
+    embedding_store_path: str = str(DATA_DIR / "embeddings")
+    embedding_cache_memory_size: int = 4096
+    embedding_store_max_rows: int = 500_000
+
+    # Batch matching
+    batch_max_resumes: int = 2000
+    batch_encode_size: int = 64
+    batch_extraction_concurrency: int = 16
+
+    # Bulk matching jobs: JSONL input checkpointed to SQLite and run in the background.
+    # A running job whose heartbeat is older than bulk_stale_seconds is resumed by another runner
+    bulk_store_path: str = str(DATA_DIR / "bulk.sqlite3")
+    bulk_worker_enabled: bool = True
+    bulk_concurrency: int = 8
+    bulk_max_running_jobs: int = 1
+    bulk_max_pairs: int = 100_000
+    bulk_max_upload_mb: int = 200
+    bulk_poll_seconds: float = 2.0
+    bulk_stale_seconds: float = 60.0
+
+    # Job recommendation index
+    job_index_path: str = str(DATA_DIR / "jobs.sqlite3")
+    job_index_ivf_threshold: int = 100_000
+    job_index_ivf_nprobe: int = 16
+    job_search_shortlist_size: int = 50
+    job_search_max_k: int = 100
+
+    # PDF upload & extraction
+    pdf_max_upload_mb: int = 10
+    pdf_max_pages: int = 50
+    pdf_parallel_min_pages: int = 8
+    pdf_pool_workers: int = 2
+    pdf_extraction_timeout_seconds: float = 30.0
+
+    # Uploaded resumes: extracted text stored by a hash of the PDF bytes, so repeat uploads skip
+    # extraction and /api/match accepts the returned resume_id. Entries expire resume_ttl_seconds
+    # after their last use; the embedding and skills are precomputed in the background on upload
+    resume_store_path: str = str(DATA_DIR / "resumes.sqlite3")
+    resume_ttl_seconds: int = 7 * 24 * 3600
+    resume_store_max_entries: int = 50_000
+    resume_prepare_on_upload: bool = True
+
+    # Logging: file level, JSON lines, rotation (by size, or by time when log_rotate_when is set, e.g. "midnight"),
+    # and the fraction of requests whose DEBUG records are kept
+    log_level: str = "DEBUG"
+    log_json: bool = True
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_rotate_when: str = ""
+    log_debug_sample_rate: float = 1.0
+
     # CORS settings
     frontend_url: str = "http://localhost:5173"
-    
+
+    # Skill extraction: "llm", "local", "hybrid" or "structured" (one JSON-schema call per match)
+    skill_extractor: str = "llm"
+    skill_taxonomy_path: str = str(PACKAGE_DATA_DIR / "skill_taxonomy.yaml")
+    hybrid_min_local_skills: int = 8
+
+    # LLM input compaction: normalize text, strip boilerplate (page numbers, contact lines, repeated
+    # headers) and cap each document at llm_input_max_tokens (counted with tiktoken when installed,
+    # otherwise estimated). Dropping sentences without skill signal is opt-in: it can drop prose
+    # with implied skills
+    llm_input_compaction: bool = True
+    llm_input_drop_unsignalled: bool = False
+    llm_input_max_tokens: int = 1500
+
+    # Semantic skill matching: job skills left unmatched by synonyms and fuzzy matching are compared
+    # with the resume skills by embedding cosine similarity (taxonomy terms are precomputed on disk).
+    # Off by default: it changes matched_skill_percentage, and the threshold is not yet calibrated
+    semantic_skill_matching: bool = False
+    semantic_skill_threshold: float = 0.72
+    skill_embeddings_path: str = str(DATA_DIR / "skill_embeddings")
+
+    # Skill extraction cache
+    skill_cache_enabled: bool = True
+    skill_cache_path: str = str(DATA_DIR / "skill_cache.sqlite3")
+    skill_cache_memory_size: int = 2048
+    skill_cache_max_entries: int = 200_000
+    skill_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    @model_validator(mode="after")
+    def check_chunking(self) -> "Settings":
+        # Windows advance by chunk_words - chunk_overlap_words words, which must be positive
+        if self.chunk_overlap_words >= self.chunk_words:
+            raise ValueError(
+                f"chunk_overlap_words ({self.chunk_overlap_words}) must be less than chunk_words ({self.chunk_words})"
+            )
+        return self
+
     class Config:
         env_file = ".env"
         case_sensitive = False
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
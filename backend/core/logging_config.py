@@ -1,44 +1,147 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Optional
+
+from backend.core.config import settings
 
 LOGS_DIR = Path(__file__).resolve().parent.parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Set per request by the request-ID middleware; copied into worker threads by asyncio.to_thread
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Whether this request's DEBUG records are kept (see settings.log_debug_sample_rate)
+debug_sampled_var: ContextVar[bool] = ContextVar("debug_sampled", default=True)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class RequestContextFilter(logging.Filter):
+    """
+    Attach the current request ID to every record, and drop DEBUG records of
+    requests that were not sampled. Runs on the logging thread, before the
+    record is queued, because the context variables are only visible there.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and not debug_sampled_var.get():
+            return False
+        record.request_id = request_id_var.get()
+        return True
+
+# Argument types whose rendering cannot change between enqueueing and formatting
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None), bytes, BaseException)
+
+def _args_are_immutable(args) -> bool:
+    if isinstance(args, dict):
+        args = args.values()
+    return all(
+        isinstance(arg, _IMMUTABLE_ARGS) or (isinstance(arg, tuple) and _args_are_immutable(arg))
+        for arg in args
+    )
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process listener.
+
+    The stock handler fully formats each record on the calling thread so it
+    can be pickled. Here the record is queued as is and the listener thread
+    does all formatting: merging %-style arguments, timestamps, tracebacks and
+    JSON encoding. Only records with mutable arguments (lists, dicts, other
+    objects) are merged on the calling thread, so later mutations cannot
+    change the logged message.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args and not _args_are_immutable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
 def setup_logging():
     """Configure logging for the application."""
-    
+    global _listener
+
+    root_logger = logging.getLogger()
+    if _listener is not None:
+        return root_logger
+
     # Detailed formatter (for files)
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
+    if settings.log_json:
+        file_formatter = JsonFormatter()
+    else:
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(funcName)s:%(lineno)d - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
     # Simple formatter (for console)
     simple_formatter = logging.Formatter(
-        '%(levelname)s - %(message)s'
+        '%(levelname)s - [%(request_id)s] %(message)s'
     )
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    
-    # File handler
-    file_handler = logging.FileHandler(LOGS_DIR / "app.log")
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(detailed_formatter)
-    
+
+    # File handler, rotated by size (default) or on a schedule (e.g. "midnight")
+    if settings.log_rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            LOGS_DIR / "app.log",
+            when=settings.log_rotate_when,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8",
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOGS_DIR / "app.log",
+            maxBytes=settings.log_max_bytes,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8",
+        )
+    file_handler.setLevel(settings.log_level.upper())
+    file_handler.setFormatter(file_formatter)
+
+    # Callers only enqueue records; formatting and disk I/O happen on the listener thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
     # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    
+    root_logger.setLevel(min(logging.INFO, logging.getLevelName(settings.log_level.upper())))
+    root_logger.addHandler(queue_handler)
+
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
-    
-    return root_logger
 
+    return root_logger
@@ -0,0 +1,111 @@
+"""
+Prometheus metrics shared by the API and services.
+
+Per-stage latency is recorded with `stage_timer`, which costs two
+perf_counter calls and one histogram observation, so it is safe on the hot
+path. Cache hit/miss counters are not updated per lookup here; the caches
+keep their own counters and a collector reads them at scrape time.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUESTS = Counter(
+    "jobmatcher_http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "jobmatcher_http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=STAGE_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    "jobmatcher_stage_duration_seconds", "Latency of each pipeline stage", ["stage"], buckets=STAGE_BUCKETS
+)
+ERRORS = Counter("jobmatcher_errors_total", "Errors by pipeline stage", ["stage"])
+LLM_REQUESTS = Counter("jobmatcher_llm_requests_total", "OpenAI calls by outcome", ["outcome"])
+LLM_TOKENS = Counter("jobmatcher_llm_tokens_total", "OpenAI token usage", ["kind"])
+LLM_INPUT_TOKENS_SAVED = Counter(
+    "jobmatcher_llm_input_tokens_saved_total", "Document tokens removed by input compaction before LLM calls"
+)
+EMBEDDING_BATCH_TEXTS = Histogram(
+    "jobmatcher_embedding_batch_texts", "Texts per batched encode call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+EMBEDDING_QUEUE_WAIT = Histogram(
+    "jobmatcher_embedding_queue_wait_seconds", "Time a request waits for its encode batch to start",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+_stage_histograms: dict = {}
+_stage_errors: dict = {}
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Time the wrapped block into jobmatcher_stage_duration_seconds{stage=...}
+    and count jobmatcher_errors_total{stage=...} if it raises.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if stage not in _stage_errors:
+            _stage_errors[stage] = ERRORS.labels(stage)
+        _stage_errors[stage].inc()
+        raise
+    finally:
+        if stage not in _stage_histograms:
+            _stage_histograms[stage] = STAGE_LATENCY.labels(stage)
+        _stage_histograms[stage].observe(time.perf_counter() - started)
+
+
+_caches: dict = {}
+
+def register_cache(name: str, cache) -> None:
+    """
+    Export a cache's memory_hits/disk_hits/misses counters under `name`.
+    """
+    _caches[name] = cache
+
+
+class CacheCollector:
+    """
+    Reads cache counters at scrape time instead of updating metrics per lookup.
+    """
+
+    def collect(self):
+        lookups = CounterMetricFamily("jobmatcher_cache_lookups", "Cache lookups by result", labels=["cache", "result"])
+        for name, cache in list(_caches.items()):
+            lookups.add_metric([name, "memory_hit"], cache.memory_hits)
+            lookups.add_metric([name, "disk_hit"], cache.disk_hits)
+            lookups.add_metric([name, "miss"], cache.misses)
+        yield lookups
+
+
+REGISTRY.register(CacheCollector())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Metrics in the Prometheus text format, plus its content type.
+
+    With PROMETHEUS_MULTIPROC_DIR set (several workers), samples from every
+    worker are aggregated; per-process cache counters are then not exported.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,24 +1,87 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import random
+import re
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from backend.core.logging_config import setup_logging
+from fastapi.responses import JSONResponse, Response
+from backend.core.logging_config import debug_sampled_var, request_id_var, setup_logging
 from backend.core.config import settings
+from backend.core.metrics import HTTP_LATENCY, HTTP_REQUESTS, render_metrics
 from backend.api.routes import matcher
 from backend.api.routes import upload
+from backend.api.routes import cache
+from backend.api.routes import jobs
+from backend.api.routes import bulk
+from backend.api.routes.matcher import resolve_resume_text
 from backend.models.schemas import JobMatchRequest
 from backend.services.matcher_service import calculate_job_match
+from backend.services.ai_service import close_client
+from backend.services.bulk_service import start_bulk_runner, stop_bulk_runner
+from backend.services.compaction import load_encoding
+from backend.services.embedding_batcher import shutdown_batcher
+from backend.services.embedding_model import is_loaded, warm_up
+from backend.services.skill_embeddings import get_skill_embedding_table
+from backend.services.taxonomy import get_skill_graph
+from backend.services.pdf_service import shutdown_executor
+from backend.services.resume_service import cancel_prepare_tasks
+from backend.services.resilience import UpstreamUnavailableError
 import logging
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 logger.info("="*50)
-logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+logger.info("Starting %s v%s", settings.app_name, settings.app_version)
 logger.info("="*50)
 
+async def _warm_up(app: FastAPI):
+    """
+    Load the taxonomy, the embedding model, the prompt tokenizer and the skill embedding table in the background,
+    then mark the app ready.
+    """
+    try:
+        await asyncio.to_thread(get_skill_graph)
+        await asyncio.to_thread(warm_up)
+        if settings.llm_input_compaction:
+            await asyncio.to_thread(load_encoding)
+        if settings.semantic_skill_matching:
+            await asyncio.to_thread(get_skill_embedding_table)
+        app.state.ready = True
+        logger.info("Application ready %.2fs after import started", time.perf_counter() - _import_started)
+    except Exception as e:
+        logger.exception("Warm-up failed: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start serving liveness checks immediately; readiness flips once warm-up is done
+    app.state.ready = not settings.warm_up_on_startup
+    app.state.first_request_logged = False
+    warm_up_task = asyncio.create_task(_warm_up(app)) if settings.warm_up_on_startup else None
+    if settings.bulk_worker_enabled:
+        start_bulk_runner()
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    # Unfinished bulk jobs go back to the queue and resume from their last checkpoint
+    await stop_bulk_runner()
+    await cancel_prepare_tasks()
+    # Release pooled OpenAI connections on shutdown
+    await close_client()
+    shutdown_executor()
+    shutdown_batcher()
+    logger.info("OpenAI client, PDF pool and embedding batcher closed")
+
 # Create app
 app = FastAPI(
     title=settings.app_name,
-    version=settings.app_version
+    version=settings.app_version,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -33,12 +96,85 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-logger.info(f"CORS configured for: {settings.frontend_url}")
+logger.info("CORS configured for: %s", settings.frontend_url)
+
+# Reject oversized uploads from the Content-Length header, before the body is received
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.url.path == "/api/upload-pdf":
+        content_length = request.headers.get("content-length")
+        # Allow some headroom for the multipart envelope
+        if content_length and content_length.isdigit() and int(content_length) > settings.pdf_max_upload_mb * 1024 * 1024 + 64 * 1024:
+            logger.warning("Upload rejected from Content-Length: %.2fMB", int(content_length) / (1024 * 1024))
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File size must be less than {settings.pdf_max_upload_mb}MB"}
+            )
+    return await call_next(request)
+
+# Log how long the first real request takes, to track cold-start cost
+@app.middleware("http")
+async def log_first_request(request: Request, call_next):
+    if app.state.first_request_logged or request.url.path.startswith("/health"):
+        return await call_next(request)
+    app.state.first_request_logged = True
+    started = time.perf_counter()
+    response = await call_next(request)
+    logger.info(
+        "First request %s %s took %.2fs (%.2fs after import started)",
+        request.method, request.url.path, time.perf_counter() - started, time.perf_counter() - _import_started,
+    )
+    return response
+
+# Accept caller-supplied request IDs only if they are safe to write into logs
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+# Tag each request with an ID (from X-Request-ID or generated), make it
+# available to log records, echo it back and record HTTP metrics.
+# Registered last, so it runs first and also covers the other middlewares.
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    request_id = request.headers.get("x-request-id", "")
+    if not REQUEST_ID_PATTERN.fullmatch(request_id):
+        request_id = uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    sampled_token = debug_sampled_var.set(
+        settings.log_debug_sample_rate >= 1 or random.random() < settings.log_debug_sample_rate
+    )
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        HTTP_REQUESTS.labels(request.method, route_path, str(status)).inc()
+        HTTP_LATENCY.labels(request.method, route_path).observe(time.perf_counter() - started)
+        request_id_var.reset(token)
+        debug_sampled_var.reset(sampled_token)
+
+# OpenAI calls shed by the concurrency limiter or circuit breaker become 429/503
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+    logger.warning("Shedding %s %s with %s: %s", request.method, request.url.path, exc.status_code, exc)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": "Skill extraction is temporarily overloaded, please retry"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
 
 # Include routers
 app.include_router(matcher.router)
 app.include_router(upload.router)
+app.include_router(cache.router)
+app.include_router(jobs.router)
+app.include_router(bulk.router)
 logger.info("API routes loaded")
+logger.info("Application imported in %.0fms", (time.perf_counter() - _import_started) * 1000)
 
 # Health check
 @app.get("/health")
@@ -46,21 +182,49 @@ def read_health():
     logger.debug("Health check endpoint called")
     return {"message": f"{settings.app_name} is running"}
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """
+    Prometheus metrics: HTTP and per-stage latency histograms, LLM token
+    usage, cache lookups, embedding batch sizes and error counts.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/health/live")
+def read_liveness():
+    """
+    Liveness probe: the process is up and serving requests.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def read_readiness():
+    """
+    Readiness probe: the embedding model and taxonomy are loaded.
+    """
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "model_loaded": is_loaded()})
+    return {"status": "ready", "model_loaded": is_loaded()}
+
 # Legacy endpoint (for backwards compatibility with existing frontend)
 @app.post("/cvjob-compare")
-def legacy_endpoint(data: JobMatchRequest):
+async def legacy_endpoint(data: JobMatchRequest):
     """
     Legacy endpoint - kept for backwards compatibility.
     New clients should use /api/match instead.
     """
     logger.info("Legacy /cvjob-compare endpoint called")
-    logger.debug(f"Request - Job text: {len(data.job_text)} chars, Resume: {len(data.resume_text)} chars")
+    resume_text = await resolve_resume_text(data)
+    logger.debug("Request - Job text: %d chars, Resume: %d chars", len(data.job_text), len(resume_text))
 
     try:
-        result = calculate_job_match(data.job_text, data.resume_text)
-        logger.info(f"Match calculated - Semantic: {result['similarity_score']}%, Skills: {result['matched_skill_percentage']}%")
-        logger.debug(f"Matched skills: {len(result['matched_skills'])}, Missing: {len(result['missing_skills'])}")
+        result = await calculate_job_match(data.job_text, resume_text, extractor=data.extractor)
+        logger.info("Match calculated - Semantic: %s%%, Skills: %s%%", result["similarity_score"], result["matched_skill_percentage"])
+        logger.debug("Matched skills: %d, Missing: %d", len(result["matched_skills"]), len(result["missing_skills"]))
         return {**result, "Status": "Success"}
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
-        logger.error(f"Error in match calculation: {str(e)}", exc_info=True)
+        logger.exception("Error in match calculation: %s", e)
         raise
\ No newline at end of file
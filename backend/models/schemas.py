@@ -1,9 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+SkillExtractor = Literal["llm", "local", "hybrid", "structured"]
 
 class JobMatchRequest(BaseModel):
-    """Request model for job matching"""
+    """Request model for job matching: the resume as text, or as the resume_id returned by /api/upload-pdf"""
     job_text: str
-    resume_text: str
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    extractor: Optional[SkillExtractor] = None
 
 class JobMatchResponse(BaseModel):
     """Response model for job matching"""
@@ -14,9 +19,93 @@ class JobMatchResponse(BaseModel):
     extra_skills: list[str]
     status: str
 
+class BatchResume(BaseModel):
+    """A single resume in a batch match request"""
+    candidate_id: Optional[str] = None
+    resume_text: str
+
+class BatchMatchRequest(BaseModel):
+    """Request model for ranking many resumes against one job"""
+    job_text: str
+    resumes: list[BatchResume]
+    top_k: Optional[int] = Field(default=None, ge=1)
+    extractor: Optional[SkillExtractor] = None
+
+class BatchMatchResult(BaseModel):
+    """Match result for one resume in a batch, with its rank"""
+    rank: int
+    index: int
+    candidate_id: Optional[str] = None
+    overall_score: float
+    similarity_score: float
+    matched_skill_percentage: float
+    matched_skills: list[str]
+    missing_skills: list[str]
+    extra_skills: list[str]
+
+class BatchMatchResponse(BaseModel):
+    """Response model for batch matching, ranked best first"""
+    job_skills: list[str]
+    total_resumes: int
+    results: list[BatchMatchResult]
+    status: str
+
+class BulkJobResponse(BaseModel):
+    """Progress of a bulk matching job"""
+    job_id: str
+    state: Literal["queued", "running", "completed"]
+    extractor: Optional[SkillExtractor] = None
+    total: int
+    done: int
+    failed: int
+    pending: int
+    created: Optional[bool] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str
+
+class JobPostingRequest(BaseModel):
+    """Request model for registering a job posting"""
+    job_text: str
+    title: Optional[str] = None
+
+class JobPostingResponse(BaseModel):
+    """Response after registering a job posting"""
+    job_id: str
+    title: Optional[str] = None
+    skills: list[str]
+    created: bool
+    status: str
+
+class JobSearchRequest(BaseModel):
+    """Request model for finding the best jobs for a resume"""
+    resume_text: str
+    top_k: int = Field(default=10, ge=1)
+    rerank: bool = True
+
+class JobSearchResult(BaseModel):
+    """A recommended job posting"""
+    rank: int
+    job_id: str
+    title: Optional[str] = None
+    overall_score: float
+    similarity_score: float
+    matched_skill_percentage: Optional[float] = None
+    matched_skills: list[str] = []
+    missing_skills: list[str] = []
+
+class JobSearchResponse(BaseModel):
+    """Response model for job recommendations, best match first"""
+    total_jobs: int
+    results: list[JobSearchResult]
+    status: str
+
 class PDFUploadResponse(BaseModel):
     """Response after uploading PDF"""
+    resume_id: str
     text: str
     page_count: int
     char_count: int
+    cached: bool
     status: str
\ No newline at end of file
@@ -1,112 +1,478 @@
+import asyncio
+import json
 import logging
-from rapidfuzz import fuzz
-from openai import OpenAI
+import httpx
+import numpy as np
+from typing import Awaitable, Callable, Optional
+from rapidfuzz import fuzz, process
 from backend.core.config import settings
+from backend.core.metrics import LLM_INPUT_TOKENS_SAVED, LLM_REQUESTS, LLM_TOKENS, stage_timer
+from backend.services.cache_service import make_cache_key, skill_cache
+from backend.services.chunking import split_sections
+from backend.services.compaction import COMPACTION_VERSION, compact_text
+from backend.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimiter,
+    SingleFlight,
+    UpstreamUnavailableError,
+    backoff_delay,
+)
+from backend.services.skill_embeddings import semantic_match_skills
+from backend.services.skill_extractor import get_local_extractor
+from backend.services.taxonomy import get_skill_graph
 
 logger = logging.getLogger(__name__)
-client = OpenAI(api_key=settings.openai_api_key)
-
-# Skill synonyms and related terms
-SKILL_SYNONYMS = {
-    # Programming languages
-    "python": ["python 3", "python3", "py"],
-    "javascript": ["js", "ecmascript"],
-    "typescript": ["ts"],
-    
-    # Cloud platforms
-    "aws": ["amazon web services", "cloud", "cloud infrastructure"],
-    "gcp": ["google cloud", "google cloud platform", "cloud infrastructure"],
-    "azure": ["microsoft azure", "cloud infrastructure"],
-    
-    # Cloud services
-    "ec2": ["aws ec2", "elastic compute"],
-    "lambda": ["aws lambda", "serverless"],
-    "s3": ["aws s3", "object storage"],
-    
-    # Containers & Orchestration
-    "docker": ["containerization", "containers"],
-    "kubernetes": ["k8s", "container orchestration", "cluster management"],
-    "container orchestration": ["kubernetes", "k8s", "docker swarm"],
-    
-    # Databases
-    "postgresql": ["postgres", "psql", "sql"],
-    "redis": ["caching", "in-memory database"],
-    
-    # DevOps & CI/CD
-    "ci/cd": ["continuous integration", "continuous deployment", "cicd", "deployment processes", "gitlab ci/cd", "github actions"],
-    "gitlab": ["gitlab ci/cd", "ci/cd"],
-    "github": ["github actions", "ci/cd"],
-    
-    # APIs & Architecture
-    "rest apis": ["restful apis", "rest", "api development", "apis"],
-    "restful apis": ["rest apis", "rest", "api development"],
-    "microservices": ["microservices architecture", "service-oriented architecture"],
-    "microservices architecture": ["microservices"],
-    
-    # Web Frameworks
-    "fastapi": ["fast api", "api framework"],
-    "django": ["django framework"],
-    "flask": ["flask framework"],
-    
-    # Testing
-    "pytest": ["unit testing", "automated testing", "testing"],
-    "automated testing": ["pytest", "unit testing", "integration testing", "testing"],
-    "tdd": ["test-driven development", "testing"],
-    
-    # Monitoring & Observability
-    "prometheus": ["monitoring", "metrics"],
-    "grafana": ["monitoring", "dashboards", "visualization"],
-    "elasticsearch": ["elk", "logging", "search"],
-    
-    # Message Queues
-    "rabbitmq": ["message queues", "message broker", "amqp"],
-    "celery": ["task queue", "background jobs", "async tasks"],
-    "message queues": ["rabbitmq", "celery", "kafka", "sqs"],
-    
-    # Methodologies
-    "agile": ["agile methodologies", "scrum", "agile/scrum"],
-    "scrum": ["agile", "agile methodologies"],
-    
-    # Performance
-    "performance optimization": ["optimization", "query optimization", "profiling"],
-    "query optimization": ["database optimization", "performance optimization"],
-    "high-performance apis": ["performance optimization", "low latency", "fast apis"],
-    
-    # Domains
-    "fintech": ["financial technology", "payments", "banking"],
-    "payments": ["fintech", "payments industry"],
-    
-    # General
-    "cloud infrastructure": ["aws", "gcp", "azure", "cloud"],
-    "production systems": ["deployment", "production deployment"],
-    "comprehensive tests": ["automated testing", "testing", "pytest"],
-}
+
+
+class SkillExtractionError(Exception):
+    """LLM skill extraction failed and the caller asked for no fallback."""
+
+
+class IncompleteResponseError(SkillExtractionError):
+    """The model stopped early (output token limit, content filter) or refused."""
+
+
+_client = None
+
+def get_client():
+    """
+    Return the OpenAI client, creating it on first use.
+
+    One pooled HTTP client is shared by every request on this worker.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_connections,
+            ),
+            timeout=httpx.Timeout(settings.openai_timeout_seconds, connect=5.0),
+        )
+        # Retries are handled by call_openai, with jitter and the circuit breaker
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+            http_client=http_client,
+            max_retries=0,
+        )
+    return _client
+
+async def close_client() -> None:
+    global _client, _limiter
+    if _client is not None:
+        await _client.close()
+        _client = None
+    _limiter = None
+
+# Identical extractions in flight at the same time share one OpenAI call
+_single_flight = SingleFlight()
+_limiter: Optional[ConcurrencyLimiter] = None
+_breaker = CircuitBreaker(
+    failure_threshold=settings.openai_breaker_failure_threshold,
+    reset_timeout=settings.openai_breaker_reset_seconds,
+    name="OpenAI",
+)
+
+def _get_limiter() -> ConcurrencyLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = ConcurrencyLimiter(
+            limit=settings.openai_max_concurrency,
+            max_queue=settings.openai_max_queue,
+            queue_timeout=settings.openai_queue_timeout_seconds,
+        )
+    return _limiter
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Timeouts, connection errors, rate limits and 5xx responses are worth retrying.
+    """
+    import openai
+
+    if isinstance(error, (asyncio.TimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+async def call_openai(make_call: Callable[[], Awaitable]):
+    """
+    Run an OpenAI call with a concurrency slot, a per-attempt timeout, jittered
+    retries on transient errors and the circuit breaker.
+
+    Raises UpstreamUnavailableError (429/503) when the call is shed or the
+    circuit is open; other errors propagate after the retry budget is spent.
+    """
+    for attempt in range(settings.openai_max_retries + 1):
+        try:
+            trial = _breaker.before_call()
+        except CircuitOpenError:
+            LLM_REQUESTS.labels("circuit_open").inc()
+            raise
+        try:
+            async with _get_limiter().slot():
+                try:
+                    response = await asyncio.wait_for(make_call(), settings.openai_call_timeout_seconds)
+                except Exception as e:
+                    if not _is_retryable(e):
+                        _breaker.record_success()
+                        raise
+                    _breaker.record_failure()
+                    if attempt == settings.openai_max_retries:
+                        raise
+                    logger.warning("OpenAI call failed (%s), retry %s/%s", type(e).__name__, attempt + 1, settings.openai_max_retries)
+                else:
+                    _breaker.record_success()
+                    return response
+        except UpstreamUnavailableError:
+            LLM_REQUESTS.labels("shed").inc()
+            raise
+        finally:
+            # A trial that was shed or cancelled never reached record_success/record_failure
+            if trial:
+                _breaker.end_trial()
+        LLM_REQUESTS.labels("retry").inc()
+        await asyncio.sleep(backoff_delay(attempt, settings.openai_retry_base_seconds, settings.openai_retry_max_seconds))
+
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Bump whenever the extraction prompt changes so cached results are not reused
+PROMPT_VERSION = "v1"
 
 def expand_skills_with_synonyms(skills: list[str]) -> set[str]:
     """
     Expand a list of skills to include synonyms and related terms.
     """
-    expanded = set(skills)
-    
-    for skill in skills:
-        skill_lower = skill.lower().strip()
-        if skill_lower in SKILL_SYNONYMS:
-            expanded.update(SKILL_SYNONYMS[skill_lower])
-    
-    return expanded
+    return get_skill_graph().expand(skills)
+
+EXTRACTORS = ("llm", "local", "hybrid", "structured")
+
+STRUCTURED_PROMPT_VERSION = "structured-v1"
+
+# Output budget per document. Each {"skill", "canonical"} object costs about 15
+# tokens, so this leaves room for well over 100 skills per document
+STRUCTURED_MAX_OUTPUT_TOKENS_PER_DOCUMENT = 2500
+
+# Shared by the structured and the per-section prompts
+_EXTRACTION_RULES = """EXTRACTION RULES:
+1. Extract BOTH the full term AND individual components ("GitLab CI/CD" -> "gitlab ci/cd", "gitlab", "ci/cd"; "AWS Lambda" -> "aws lambda", "aws", "lambda").
+2. Include common abbreviations and full names ("Kubernetes" and "k8s"; "PostgreSQL" and "postgres").
+3. Extract skills implied by descriptions ("built microservices" -> "microservices"; "deployed to production" -> "deployment").
+4. Recognize methodology and practice keywords ("Agile/Scrum" -> "agile", "scrum"; "code reviews").
+5. Extract versions and variants ("Python 3.x" -> "python", "python 3").
+6. Include domain expertise ("fraud detection system" -> "fraud detection"; "MLOps pipeline" -> "mlops", "pipelines").
+
+CATEGORIES: programming languages, frameworks and libraries, databases, cloud platforms and services, DevOps tools, monitoring and logging, message queues, ML/AI tools, development practices, web technologies, testing tools, version control, security."""
 
-def extract_skills(text: str, context: str = "job") -> list[str]:
+# Static, so every structured call shares the same prompt prefix and
+# provider-side prompt caching applies; only the documents vary
+STRUCTURED_INSTRUCTIONS = f"""You are an expert technical recruiter. You receive a job description, a resume, or both, each between <<< and >>>. For each document, extract ALL technical skills, tools, frameworks, technologies, methodologies, and competencies.
+
+{_EXTRACTION_RULES}
+
+OUTPUT:
+- For every skill, "skill" is the term as it appears (lowercase) and "canonical" is its standard name (lowercase), e.g. {{"skill": "k8s", "canonical": "kubernetes"}}, {{"skill": "react.js", "canonical": "react"}}. Use the same value for both when the term is already standard.
+- List each skill once per document.
+- Return an empty list for a document that was not provided."""
+
+_SKILL_LIST_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"skill": {"type": "string"}, "canonical": {"type": "string"}},
+        "required": ["skill", "canonical"],
+        "additionalProperties": False,
+    },
+}
+
+STRUCTURED_OUTPUT_FORMAT = {
+    "type": "json_schema",
+    "name": "skill_extraction",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"job_skills": _SKILL_LIST_SCHEMA, "resume_skills": _SKILL_LIST_SCHEMA},
+        "required": ["job_skills", "resume_skills"],
+        "additionalProperties": False,
+    },
+}
+
+STRUCTURED_DOCUMENT_LABELS = {"job": "JOB DESCRIPTION", "resume": "RESUME"}
+
+SECTIONED_PROMPT_VERSION = "sections-v1"
+
+# Sections are short (SECTION_MIN_WORDS and up), so they need less room than whole documents
+SECTIONED_MAX_OUTPUT_TOKENS_PER_SECTION = 800
+
+# Static like STRUCTURED_INSTRUCTIONS; only the sections vary
+SECTIONED_INSTRUCTIONS = f"""You are an expert technical recruiter. You receive the numbered sections of one job description or resume, each between <<< and >>>. For each section, extract ALL technical skills, tools, frameworks, technologies, methodologies, and competencies it mentions or implies.
+
+{_EXTRACTION_RULES}
+
+OUTPUT:
+- One entry per section, with the section's number in "section" and its skills in "skills".
+- For every skill, "skill" is the term as it appears (lowercase) and "canonical" is its standard name (lowercase), e.g. {{"skill": "k8s", "canonical": "kubernetes"}}. Use the same value for both when the term is already standard.
+- List each skill once per section, and return an empty list for a section without skills."""
+
+SECTIONED_OUTPUT_FORMAT = {
+    "type": "json_schema",
+    "name": "section_skill_extraction",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "sections": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"section": {"type": "integer"}, "skills": _SKILL_LIST_SCHEMA},
+                    "required": ["section", "skills"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["sections"],
+        "additionalProperties": False,
+    },
+}
+
+async def extract_skills(text: str, context: str = "job", extractor: Optional[str] = None, fallback: bool = True) -> list[str]:
     """
-    Extract technical skills from text using GPT.
+    Extract technical skills from text.
     
     Args:
         text: The text to analyze
         context: Either "job" or "resume"
+        extractor: "llm", "local" or "hybrid" (defaults to settings.skill_extractor)
+        fallback: On a failed LLM call, return an empty list (or the local
+            skills, for hybrid) instead of raising. Callers that persist the
+            result pass False.
         
     Returns:
         List of extracted skills
     """
-    logger.info(f"Extracting {context} skills from text ({len(text)} chars)")
+    extractor = extractor or settings.skill_extractor
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown skill extractor: {extractor}")
+
+    if extractor == "llm":
+        with stage_timer("extract_skills_llm"):
+            return await _extract_skills_llm(text, context, fallback=fallback)
+
+    if extractor == "structured":
+        with stage_timer("extract_skills_structured"):
+            return (await extract_skills_structured({context: text}, fallback=fallback))[context]
+
+    with stage_timer("extract_skills_local"):
+        local_skills = get_local_extractor().extract(text)
+    logger.info("Local extractor found %s %s skills", len(local_skills), context)
+
+    if extractor == "local" or len(local_skills) >= settings.hybrid_min_local_skills:
+        return local_skills
+
+    # Hybrid: local coverage is low, so ask the LLM and keep the local hits too
+    try:
+        with stage_timer("extract_skills_llm"):
+            llm_skills = await _extract_skills_llm(text, context, fallback=fallback)
+    except UpstreamUnavailableError as e:
+        if not fallback:
+            raise
+        logger.warning("LLM unavailable (%s), using %s local %s skills", e, len(local_skills), context)
+        return local_skills
+    if not llm_skills:
+        logger.warning("LLM extraction returned nothing, using %s local %s skills", len(local_skills), context)
+        return local_skills
+    return sorted(set(llm_skills) | set(local_skills))
+
+def _cache_version(prompt_version: str) -> str:
+    """
+    Prompt version for cache keys; results from compacted input are kept apart from raw-input ones.
+    """
+    if not settings.llm_input_compaction:
+        return prompt_version
+    drop = "drop" if settings.llm_input_drop_unsignalled else "keep"
+    return f"{prompt_version}+{COMPACTION_VERSION}-{settings.llm_input_max_tokens}-{drop}"
+
+async def _compact_for_llm(text: str, context: str) -> str:
+    """
+    Compact a document before it goes into a prompt, and record the tokens saved.
+
+    Token counting and the regex passes take milliseconds on long documents,
+    so they run in a worker thread.
+    """
+    if not settings.llm_input_compaction:
+        return text
+    with stage_timer("compact_input"):
+        result = await asyncio.to_thread(
+            compact_text, text, settings.llm_input_max_tokens, settings.llm_input_drop_unsignalled
+        )
+    saved = result["tokens_before"] - result["tokens_after"]
+    LLM_INPUT_TOKENS_SAVED.inc(max(0, saved))
+    logger.info(
+        "Compacted %s input: %s -> %s tokens (saved %s, dropped %s of %s sentences)",
+        context, result["tokens_before"], result["tokens_after"], saved,
+        result["units_dropped"], result["units_kept"] + result["units_dropped"],
+    )
+    return result["text"]
+
+async def extract_skills_by_section(text: str, context: str = "resume", extractor: Optional[str] = None, fallback: bool = True) -> list[str]:
+    """
+    Extract skills section by section and merge them, in first-seen order.
+
+    Each section is cached under its own content hash, so when a document is
+    edited and matched again only the changed sections are extracted. The
+    LLM-backed extractors send all uncached sections of a document in one
+    call, so a first match costs one call per document, not one per section.
+    """
+    extractor = extractor or settings.skill_extractor
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown skill extractor: {extractor}")
+
+    sections = split_sections(text, settings.section_min_words)
+    if extractor == "local":
+        results = await asyncio.gather(*(extract_skills(section, context=context, extractor="local") for section in sections))
+    else:
+        with stage_timer("extract_skills_sections"):
+            results = await _extract_sections(sections, context, extractor, fallback)
+    merged = list(dict.fromkeys(skill for skills in results for skill in skills))
+    logger.info("Merged %s %s skills from %s sections", len(merged), context, len(sections))
+    return merged
+
+async def _extract_sections(sections: list[str], context: str, extractor: str, fallback: bool) -> list[list[str]]:
+    """
+    Skills per section with the "llm", "structured" or "hybrid" extractor.
+
+    With hybrid, sections where the local extractor finds at least
+    `hybrid_min_local_skills` skills keep the local result; the others go to
+    the LLM and keep their local hits too, as in extract_skills.
+    """
+    local = [[] for _ in sections]
+    results: list[Optional[list[str]]] = [None] * len(sections)
+    if extractor == "hybrid":
+        local = [get_local_extractor().extract(section) for section in sections]
+        for i, skills in enumerate(local):
+            if len(skills) >= settings.hybrid_min_local_skills:
+                results[i] = skills
+
+    pending = [i for i, skills in enumerate(results) if skills is None]
+    if pending:
+        try:
+            llm_skills = await _extract_sections_llm([sections[i] for i in pending], context, fallback)
+        except UpstreamUnavailableError as e:
+            if extractor != "hybrid" or not fallback:
+                raise
+            logger.warning("LLM unavailable (%s), using local %s skills for %s sections", e, context, len(pending))
+            llm_skills = [[] for _ in pending]
+        for i, skills in zip(pending, llm_skills):
+            results[i] = sorted(set(skills) | set(local[i]))
+    return results
+
+async def _extract_sections_llm(sections: list[str], context: str, fallback: bool = True) -> list[list[str]]:
+    """
+    Skills per section from the cache, with every uncached section extracted in one LLM call.
+    """
+    cache_version = _cache_version(SECTIONED_PROMPT_VERSION)
+    keys = [make_cache_key(section, context, cache_version, OPENAI_MODEL) for section in sections]
+    results: list[Optional[list[str]]] = [None] * len(sections)
+    if settings.skill_cache_enabled:
+        results = list(await asyncio.gather(*(skill_cache.get_async(key) for key in keys)))
+
+    missing = [i for i, skills in enumerate(results) if skills is None]
+    if not missing:
+        logger.info("Skill cache hit for all %s %s sections", len(sections), context)
+        return results
+    logger.info("Extracting %s skills from %s of %s sections in one call", context, len(missing), len(sections))
+
+    compacted = await asyncio.gather(*(_compact_for_llm(sections[i], context) for i in missing))
+    missing_keys = [keys[i] for i in missing]
+    try:
+        extracted, shared = await _single_flight.do(
+            tuple(missing_keys), lambda: _request_section_skills(compacted, context, missing_keys)
+        )
+        if shared:
+            LLM_REQUESTS.labels("coalesced").inc()
+            logger.info("Reused in-flight %s section extraction", context)
+    except UpstreamUnavailableError as e:
+        logger.warning("OpenAI call shed for %s sections: %s", context, e)
+        raise
+    except IncompleteResponseError as e:
+        logger.error("Section skill extraction returned no usable result: %s", e)
+        if not fallback:
+            raise
+        logger.warning("Returning empty skills lists as fallback")
+        extracted = [[] for _ in missing]
+    except Exception as e:
+        LLM_REQUESTS.labels("error").inc()
+        logger.exception("OpenAI API error while extracting %s sections: %s", context, e)
+        if not fallback:
+            raise SkillExtractionError(f"{context} section skill extraction failed: {str(e)}") from e
+        logger.warning("Returning empty skills lists as fallback")
+        extracted = [[] for _ in missing]
+
+    for i, skills in zip(missing, extracted):
+        results[i] = list(skills)
+    return results
+
+async def _request_section_skills(sections: list[str], context: str, cache_keys: list[str]) -> list[list[str]]:
+    """
+    One JSON-schema call for the sections of a document; parses and caches each section's skills.
+    """
+    prompt = f"{STRUCTURED_DOCUMENT_LABELS[context]} SECTIONS:\n\n" + "\n\n".join(
+        f"SECTION {number}:\n<<<\n{section}\n>>>" for number, section in enumerate(sections, start=1)
+    )
+    logger.debug("Calling OpenAI API (model: %s, %d %s sections)", OPENAI_MODEL, len(sections), context)
+
+    with stage_timer("llm_call"):
+        response = await call_openai(lambda: get_client().responses.create(
+            model=OPENAI_MODEL,
+            instructions=SECTIONED_INSTRUCTIONS,
+            input=prompt,
+            text={"format": SECTIONED_OUTPUT_FORMAT},
+            max_output_tokens=SECTIONED_MAX_OUTPUT_TOKENS_PER_SECTION * len(sections),
+            temperature=0.3,
+        ))
+    _record_usage(response)
+
+    problem = _response_problem(response)
+    if problem:
+        LLM_REQUESTS.labels("incomplete").inc()
+        raise IncompleteResponseError(f"Section skill extraction: {problem}")
+    LLM_REQUESTS.labels("success").inc()
+
+    by_number = {entry["section"]: entry["skills"] for entry in json.loads(response.output_text)["sections"]}
+    results = []
+    for number, cache_key in enumerate(cache_keys, start=1):
+        skills = _skill_terms(by_number.get(number, []))
+        results.append(skills)
+        # Empty results are not cached so a transient bad response is retried
+        if settings.skill_cache_enabled and skills:
+            await skill_cache.set_async(cache_key, skills)
+
+    logger.info("Successfully extracted %s skills from %s %s sections", sum(map(len, results)), len(sections), context)
+    return results
+
+def document_skill_extractor() -> Callable[..., Awaitable[list[str]]]:
+    """
+    extract_skills, or its per-section variant when incremental matching is enabled.
+    """
+    return extract_skills_by_section if settings.incremental_matching else extract_skills
+
+async def _extract_skills_llm(text: str, context: str, fallback: bool = True) -> list[str]:
+    """
+    Extract technical skills from text using GPT.
+    """
+    logger.info("Extracting %s skills from text (%s chars)", context, len(text))
+
+    cache_key = make_cache_key(text, context, _cache_version(PROMPT_VERSION), OPENAI_MODEL)
+    if settings.skill_cache_enabled:
+        cached = await skill_cache.get_async(cache_key)
+        if cached is not None:
+            logger.info("Skill cache hit for %s (%s skills)", context, len(cached))
+            return cached
+
+    text = await _compact_for_llm(text, context)
 
     prompt = f"""You are an expert technical recruiter analyzing a {context}. Extract ALL technical skills, tools, frameworks, technologies, methodologies, and competencies.
 
@@ -164,100 +530,314 @@ Return a comprehensive comma-separated list of ALL extracted skills. Be thorough
 SKILLS:"""
     
     try:
-        logger.debug(f"Calling OpenAI API (model: gpt-4o-mini, temp: 0.3)")
-        
-        response = client.responses.create(
-            model="gpt-4o-mini",
+        skills, shared = await _single_flight.do(cache_key, lambda: _request_skills(prompt, context, cache_key))
+        if shared:
+            LLM_REQUESTS.labels("coalesced").inc()
+            logger.info("Reused in-flight %s skill extraction", context)
+        return list(skills)
+
+    except UpstreamUnavailableError as e:
+        logger.warning("OpenAI call shed for %s skills: %s", context, e)
+        raise
+    except Exception as e:
+        LLM_REQUESTS.labels("error").inc()
+        logger.exception("OpenAI API error while extracting %s skills: %s", context, e)
+        if not fallback:
+            raise SkillExtractionError(f"{context} skill extraction failed: {str(e)}") from e
+        logger.warning("Returning empty skills list as fallback")
+        return []
+
+async def _request_skills(prompt: str, context: str, cache_key: str) -> list[str]:
+    """
+    Call OpenAI once for a prompt, parse the skill list and cache it.
+    """
+    logger.debug("Calling OpenAI API (model: %s, temp: 0.3)", OPENAI_MODEL)
+
+    with stage_timer("llm_call"):
+        response = await call_openai(lambda: get_client().responses.create(
+            model=OPENAI_MODEL,
             instructions="You are a technical recruiter expert at identifying skills from job descriptions and resumes.",
             input=prompt,
             max_output_tokens=500,
             temperature=0.3,
+        ))
+    LLM_REQUESTS.labels("success").inc()
+    if response.usage is not None:
+        LLM_TOKENS.labels("input").inc(response.usage.input_tokens)
+        LLM_TOKENS.labels("output").inc(response.usage.output_tokens)
+
+    skills_text = response.output_text.strip()
+    skills = [skill.strip().lower() for skill in skills_text.split(",") if skill.strip()]
+    skills = list(set(skills))
+
+    logger.info("Successfully extracted %s skills from %s", len(skills), context)
+    logger.debug("Skills: %s%s", skills[:5], "..." if len(skills) > 5 else "")
+
+    # Empty results are not cached so a transient bad response is retried
+    if settings.skill_cache_enabled and skills:
+        await skill_cache.set_async(cache_key, skills)
+
+    return skills
+
+async def extract_skills_structured(documents: dict[str, str], fallback: bool = True) -> dict[str, list[str]]:
+    """
+    Extract skills from a job and/or resume ({"job": text, "resume": text})
+    with one structured-output call.
+
+    Each document is cached on its own, so only uncached documents are sent.
+    The result holds, per document, every extracted term plus its canonical name.
+    """
+    results = {}
+    cache_keys = {}
+    for context, text in documents.items():
+        cache_keys[context] = make_cache_key(text, context, _cache_version(STRUCTURED_PROMPT_VERSION), OPENAI_MODEL)
+        cached = await skill_cache.get_async(cache_keys[context]) if settings.skill_cache_enabled else None
+        if cached is not None:
+            logger.info("Skill cache hit for %s (%s skills)", context, len(cached))
+            results[context] = cached
+
+    missing = {context: text for context, text in documents.items() if context not in results}
+    if not missing:
+        return results
+    compacted = await asyncio.gather(*(_compact_for_llm(text, context) for context, text in missing.items()))
+    missing = dict(zip(missing, compacted))
+
+    logger.info("Extracting %s skills in one structured call", ', '.join(missing))
+    flight_key = tuple(cache_keys[context] for context in sorted(missing))
+    try:
+        extracted, shared = await _single_flight.do(
+            flight_key, lambda: _request_skills_structured(missing, cache_keys)
         )
-        
-        skills_text = response.output_text.strip()
-        skills = [skill.strip().lower() for skill in skills_text.split(",") if skill.strip()]
-        skills = list(set(skills))
-        
-        logger.info(f"Successfully extracted {len(skills)} skills from {context}")
-        logger.debug(f"Skills: {skills[:5]}..." if len(skills) > 5 else f"Skills: {skills}")
-        
-        return skills
-    
+        if shared:
+            LLM_REQUESTS.labels("coalesced").inc()
+            logger.info("Reused in-flight structured skill extraction")
+        results.update({context: list(skills) for context, skills in extracted.items()})
+
+    except UpstreamUnavailableError as e:
+        logger.warning("OpenAI call shed for structured extraction: %s", e)
+        raise
+    except IncompleteResponseError as e:
+        logger.error("Structured skill extraction returned no usable result: %s", e)
+        if not fallback:
+            raise
+        logger.warning("Returning empty skills lists as fallback")
+        results.update({context: [] for context in missing})
     except Exception as e:
-        logger.error(f"OpenAI API error while extracting {context} skills: {str(e)}", exc_info=True)
-        logger.warning("Returning empty skills list as fallback")
-        return []
+        LLM_REQUESTS.labels("error").inc()
+        logger.exception("OpenAI API error during structured skill extraction: %s", e)
+        if not fallback:
+            raise SkillExtractionError(f"Structured skill extraction failed: {str(e)}") from e
+        logger.warning("Returning empty skills lists as fallback")
+        results.update({context: [] for context in missing})
+
+    return results
+
+def _record_usage(response) -> None:
+    if response.usage is not None:
+        LLM_TOKENS.labels("input").inc(response.usage.input_tokens)
+        LLM_TOKENS.labels("output").inc(response.usage.output_tokens)
+        cached_tokens = getattr(response.usage.input_tokens_details, "cached_tokens", 0) or 0
+        LLM_TOKENS.labels("cached_input").inc(cached_tokens)
+
+def _skill_terms(items: list[dict]) -> list[str]:
+    """
+    Every extracted term plus its canonical name, lowercased and sorted.
+    """
+    terms = set()
+    for item in items:
+        terms.update(term.strip().lower() for term in (item["skill"], item["canonical"]) if term.strip())
+    return sorted(terms)
+
+def _response_problem(response) -> Optional[str]:
+    """
+    Why a response carries no complete answer (stopped early or refused), or None.
+    """
+    if response.status == "incomplete":
+        reason = getattr(response.incomplete_details, "reason", None) or "unknown reason"
+        return f"response incomplete ({reason})"
+    for item in response.output or []:
+        for part in getattr(item, "content", None) or []:
+            if getattr(part, "type", None) == "refusal":
+                return f"model refused: {part.refusal}"
+    return None
 
-def compare_skills(job_text: str, resume_text: str) -> dict:
+async def _request_skills_structured(documents: dict[str, str], cache_keys: dict[str, str]) -> dict[str, list[str]]:
+    """
+    One JSON-schema call for the given documents; parses and caches each document's skills.
+    """
+    # Documents go last so the instructions form a stable, cacheable prefix
+    prompt = "\n\n".join(
+        f"{STRUCTURED_DOCUMENT_LABELS[context]}:\n<<<\n{documents[context]}\n>>>"
+        for context in ("job", "resume") if context in documents
+    )
+    logger.debug("Calling OpenAI API (model: %s, structured, %d documents)", OPENAI_MODEL, len(documents))
+
+    with stage_timer("llm_call"):
+        response = await call_openai(lambda: get_client().responses.create(
+            model=OPENAI_MODEL,
+            instructions=STRUCTURED_INSTRUCTIONS,
+            input=prompt,
+            text={"format": STRUCTURED_OUTPUT_FORMAT},
+            max_output_tokens=STRUCTURED_MAX_OUTPUT_TOKENS_PER_DOCUMENT * len(documents),
+            temperature=0.3,
+        ))
+    _record_usage(response)
+
+    # Truncated JSON would fail to parse; report why the output stopped instead
+    problem = _response_problem(response)
+    if problem:
+        LLM_REQUESTS.labels("incomplete").inc()
+        raise IncompleteResponseError(f"Structured skill extraction: {problem}")
+    LLM_REQUESTS.labels("success").inc()
+
+    payload = json.loads(response.output_text)
+    results = {}
+    for context in documents:
+        skills = _skill_terms(payload[f"{context}_skills"])
+        results[context] = skills
+        logger.info("Successfully extracted %s skills from %s", len(skills), context)
+
+        # Empty results are not cached so a transient bad response is retried
+        if settings.skill_cache_enabled and skills:
+            await skill_cache.set_async(cache_keys[context], results[context])
+
+    return results
+
+async def compare_skills(job_text: str, resume_text: str, extractor: Optional[str] = None, fallback: bool = True) -> dict:
     """
     Compare skills between job and resume using fuzzy matching and synonyms.
+
+    With fallback=False a failed LLM extraction raises SkillExtractionError
+    instead of matching against an empty skill list.
     """
     logger.info("Starting skills comparison with fuzzy matching and synonyms")
-    
-    job_skills_raw = extract_skills(job_text, context="job")
-    resume_skills_raw = extract_skills(resume_text, context="resume")
-    
-    logger.debug(f"Job skills extracted: {len(job_skills_raw)}")
-    logger.debug(f"Resume skills extracted: {len(resume_skills_raw)}")
+
+    if (extractor or settings.skill_extractor) == "structured" and not settings.incremental_matching:
+        # Both documents in a single request
+        with stage_timer("extract_skills_structured"):
+            extracted = await extract_skills_structured({"job": job_text, "resume": resume_text}, fallback=fallback)
+        return await asyncio.to_thread(match_skill_lists, extracted["job"], extracted["resume"])
+    
+    # Both extractions are independent, so run them concurrently
+    extract = document_skill_extractor()
+    job_skills_raw, resume_skills_raw = await asyncio.gather(
+        extract(job_text, context="job", extractor=extractor, fallback=fallback),
+        extract(resume_text, context="resume", extractor=extractor, fallback=fallback),
+    )
+    
+    # Matching may encode unseen skills, so keep it off the event loop
+    return await asyncio.to_thread(match_skill_lists, job_skills_raw, resume_skills_raw)
+
+# Below this many job x resume pairs, thread start-up costs more than it saves
+FUZZY_PARALLEL_MIN_PAIRS = 20_000
+
+def _containment_matrix(needles: list[str], haystacks: list[str]) -> np.ndarray:
+    """
+    Boolean matrix where [i, j] is True if needles[i] is a substring of haystacks[j].
+
+    Each needle is searched once in all haystacks joined by NUL, so the scan
+    runs in C and the Python loop only visits actual hits.
+    """
+    contained = np.zeros((len(needles), len(haystacks)), dtype=bool)
+    joined = "\x00".join(haystacks)
+    ends = np.cumsum([len(h) + 1 for h in haystacks]) - 1
+
+    for i, needle in enumerate(needles):
+        pos = joined.find(needle)
+        while pos != -1:
+            j = int(np.searchsorted(ends, pos, side="left"))
+            if pos + len(needle) > ends[j]:
+                # Needles never contain NUL, so this only happens for the empty string
+                j += 1
+                if j == len(haystacks):
+                    break
+            contained[i, j] = True
+            # Resume the search at the next haystack
+            pos = joined.find(needle, ends[j] + 1) if j + 1 < len(haystacks) else -1
+
+    return contained
+
+def fuzzy_match_skills(job_skills: set[str], resume_skills: set[str], exact_matches: set[str]) -> tuple[set[str], set[str]]:
+    """
+    Greedily pair each unmatched job skill with its best unmatched resume skill.
+
+    All pair scores are computed up front as one matrix with rapidfuzz's cdist;
+    rows and columns are the interned IDs of the job and resume terms. Each row
+    then takes the first highest-scoring column that is still free, which is the
+    same choice the original pairwise loop made.
+
+    Returns:
+        (matched job skills, matched resume skills)
+    """
+    # Iterate in set order, exactly like the pairwise loop did
+    job_terms = [skill for skill in job_skills if skill not in exact_matches]
+    resume_terms = [skill for skill in resume_skills if skill not in exact_matches]
+    if not job_terms or not resume_terms:
+        return set(), set()
+
+    workers = -1 if len(job_terms) * len(resume_terms) >= FUZZY_PARALLEL_MIN_PAIRS else 1
+    scores = process.cdist(job_terms, resume_terms, scorer=fuzz.ratio, dtype=np.float64, workers=workers)
+
+    # Substring boost
+    substrings = _containment_matrix(job_terms, resume_terms) | _containment_matrix(resume_terms, job_terms).T
+    scores[substrings] = np.maximum(scores[substrings], 85)
+
+    matched_job = set()
+    matched_resume = set()
+    # Taking a column only lowers scores, so rows that never reach the
+    # threshold can be skipped without changing the outcome
+    for job_id in np.flatnonzero(scores.max(axis=1) >= 80):
+        resume_id = int(np.argmax(scores[job_id]))
+        best_score = scores[job_id, resume_id]
+
+        # Accept matches above 80% similarity
+        if best_score >= 80:
+            scores[:, resume_id] = -1
+            matched_job.add(job_terms[job_id])
+            matched_resume.add(resume_terms[resume_id])
+            logger.debug("Fuzzy match: '%s' ~= '%s' (score: %s)", job_terms[job_id], resume_terms[resume_id], best_score)
+
+    return matched_job, matched_resume
+
+def match_skill_lists(job_skills_raw: list[str], resume_skills_raw: list[str]) -> dict:
+    """
+    Match already-extracted job and resume skills using synonyms and fuzzy matching.
+    """
+    logger.debug("Skills extracted - Job: %d, Resume: %d", len(job_skills_raw), len(resume_skills_raw))
     
     # Expand with synonyms
-    job_skills = expand_skills_with_synonyms(job_skills_raw)
-    resume_skills = expand_skills_with_synonyms(resume_skills_raw)
+    with stage_timer("skill_synonyms"):
+        job_skills = expand_skills_with_synonyms(job_skills_raw)
+        resume_skills = expand_skills_with_synonyms(resume_skills_raw)
     
-    logger.debug(f"After synonym expansion - Job: {len(job_skills)}, Resume: {len(resume_skills)}")
+    logger.debug("After synonym expansion - Job: %d, Resume: %d", len(job_skills), len(resume_skills))
     
     # Exact matches
     exact_matches = resume_skills.intersection(job_skills)
     
     # Fuzzy matches
-    fuzzy_matched_resume = set()
-    fuzzy_matched_job = set()
-    
-    # For each job skill, find best match in resume skills
-    for job_skill in job_skills:
-        if job_skill in exact_matches:
-            continue
-        
-        best_match = None
-        best_score = 0
-        
-        for resume_skill in resume_skills:
-            if resume_skill in exact_matches or resume_skill in fuzzy_matched_resume:
-                continue
-            
-            # Calculate similarity
-            score = fuzz.ratio(job_skill, resume_skill)
-            
-            # Substring boost
-            if job_skill in resume_skill or resume_skill in job_skill:
-                score = max(score, 85)
-            
-            if score > best_score:
-                best_score = score
-                best_match = resume_skill
-        
-        # Accept matches above 80% similarity
-        if best_score >= 80:
-            fuzzy_matched_resume.add(best_match)
-            fuzzy_matched_job.add(job_skill)
-            logger.debug(f"Fuzzy match: '{job_skill}' ~= '{best_match}' (score: {best_score})")
-    
-    # Combine exact and fuzzy matches (use original skill names from job)
+    with stage_timer("skill_fuzzy"):
+        fuzzy_matched_job, fuzzy_matched_resume = fuzzy_match_skills(job_skills, resume_skills, exact_matches)
+    
+    # Combine exact and fuzzy matches (use original skill names from job).
+    # A job skill counts as matched if it, or any term in its synonym closure, matched.
+    skill_graph = get_skill_graph()
+    matched_terms = exact_matches | fuzzy_matched_job
+    matched_bits = skill_graph.class_bits(matched_terms)
     all_matched_job_skills = set()
     for skill in job_skills_raw:
         skill_lower = skill.lower().strip()
-        # Check if this original skill or its synonyms matched
-        if skill_lower in exact_matches or skill_lower in fuzzy_matched_job:
+        if skill_lower in matched_terms or skill_graph.closure_bits(skill_lower) & matched_bits:
             all_matched_job_skills.add(skill_lower)
-        else:
-            # Check synonyms
-            if skill_lower in SKILL_SYNONYMS:
-                for synonym in SKILL_SYNONYMS[skill_lower]:
-                    if synonym in exact_matches or synonym in fuzzy_matched_job:
-                        all_matched_job_skills.add(skill_lower)
-                        logger.debug(f"Synonym match: '{skill_lower}' matched via '{synonym}'")
-                        break
     
+    # Semantic matches for what is still missing, e.g. "message broker" ~ "kafka"
+    semantic_matched = set()
+    if settings.semantic_skill_matching:
+        unmatched = sorted(set(s.lower().strip() for s in job_skills_raw) - all_matched_job_skills)
+        with stage_timer("skill_semantic"):
+            semantic_matched = semantic_match_skills(unmatched, sorted(resume_skills), settings.semantic_skill_threshold)
+        all_matched_job_skills |= semantic_matched
+
     matched_job_count = len(all_matched_job_skills)
     
     # Missing skills
@@ -268,8 +848,11 @@ def compare_skills(job_text: str, resume_text: str) -> dict:
     
     match_percentage = round(matched_job_count / len(job_skills_raw) * 100, 2) if job_skills_raw else 0
     
-    logger.info(f"Skills comparison complete - Matched: {matched_job_count}/{len(job_skills_raw)} ({match_percentage}%)")
-    logger.debug(f"Exact: {len(exact_matches)}, Fuzzy: {len(fuzzy_matched_job)}, Missing: {len(missing_skills)}")
+    logger.info("Skills comparison complete - Matched: %s/%s (%s%%)", matched_job_count, len(job_skills_raw), match_percentage)
+    logger.debug(
+        "Exact: %d, Fuzzy: %d, Semantic: %d, Missing: %d",
+        len(exact_matches), len(fuzzy_matched_job), len(semantic_matched), len(missing_skills),
+    )
     
     return {
         "matched_skills": sorted(list(all_matched_job_skills)),
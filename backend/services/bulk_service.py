@@ -0,0 +1,479 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+from backend.core.config import settings
+from backend.services.matcher_service import calculate_job_match
+from backend.services.resilience import UpstreamUnavailableError
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ("similarity_score", "matched_skill_percentage", "matched_skills", "missing_skills", "extra_skills")
+PAGE_SIZE = 500
+
+
+def make_bulk_job_id(data: bytes, extractor: Optional[str]) -> str:
+    """
+    Content-addressed bulk job ID, so submitting the same input again resumes
+    the existing job instead of starting over.
+    """
+    digest = hashlib.sha256(data)
+    digest.update(b"\x00")
+    digest.update((extractor or "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def parse_pairs(data: bytes) -> list[dict]:
+    """
+    Parse JSONL input, one {"job_text", "resume_text", "id" (optional)} object per line.
+    Raises ValueError naming the first invalid line.
+    """
+    pairs = []
+    for line_number, line in enumerate(data.decode("utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_number}: invalid JSON ({e.msg})")
+        if not isinstance(item, dict) or not all(isinstance(item.get(key), str) for key in ("job_text", "resume_text")):
+            raise ValueError(f"Line {line_number}: expected an object with string job_text and resume_text")
+        pair_id = item.get("id")
+        pairs.append({
+            "id": None if pair_id is None else str(pair_id),
+            "job_text": item["job_text"],
+            "resume_text": item["resume_text"],
+        })
+    if not pairs:
+        raise ValueError("Input contains no pairs")
+    return pairs
+
+
+def owner_is_dead(owner: Optional[str]) -> bool:
+    """
+    True if `owner` ("host:pid", see BulkRunner) is a process on this host
+    that no longer exists. Owners on other hosts are never known to be dead.
+    """
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        # The PID exists but belongs to another user
+        return False
+    return False
+
+
+class BulkJobStore:
+    """
+    SQLite store for bulk matching jobs, their pairs and results.
+
+    Each finished pair is checkpointed in its own transaction, so a crash
+    loses at most the pairs in flight and a resumed job only runs the pairs
+    still pending. A job is run by one owner at a time; the owner refreshes
+    `heartbeat_at` while it works, and a running job whose heartbeat is older
+    than `stale_seconds` is treated as abandoned and can be claimed again.
+    """
+
+    def __init__(self, path: str, stale_seconds: float):
+        self.path = Path(path)
+        self.stale_seconds = stale_seconds
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS bulk_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    extractor TEXT,
+                    state TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    heartbeat_at REAL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS bulk_pairs (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    pair_id TEXT,
+                    job_text TEXT NOT NULL,
+                    resume_text TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    result TEXT,
+                    PRIMARY KEY (job_id, idx)
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+            logger.info("Bulk job store opened at %s", self.path)
+        return self._conn
+
+    def create(self, job_id: str, extractor: Optional[str], pairs: list[dict]) -> bool:
+        """
+        Store a queued job with its pairs. Returns False if the job already exists.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO bulk_jobs (job_id, extractor, state, total, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                    (job_id, extractor, len(pairs), time.time()),
+                )
+                if cursor.rowcount == 0:
+                    return False
+                conn.executemany(
+                    "INSERT INTO bulk_pairs (job_id, idx, pair_id, job_text, resume_text) VALUES (?, ?, ?, ?, ?)",
+                    ((job_id, i, pair["id"], pair["job_text"], pair["resume_text"]) for i, pair in enumerate(pairs)),
+                )
+            return True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute(
+                """SELECT job_id, extractor, state, total, done, failed, owner,
+                          created_at, started_at, finished_at FROM bulk_jobs WHERE job_id = ?""",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, extractor, state, total, done, failed, owner, created_at, started_at, finished_at = row
+        return {
+            "job_id": job_id,
+            "extractor": extractor,
+            "state": state,
+            "total": total,
+            "done": done,
+            "failed": failed,
+            "pending": total - done - failed,
+            "owner": owner,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+
+    def claimable(self, limit: int) -> list[str]:
+        """
+        Oldest queued or abandoned jobs, up to `limit`.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                """SELECT job_id FROM bulk_jobs
+                   WHERE state = 'queued' OR (state = 'running' AND heartbeat_at < ?)
+                   ORDER BY created_at LIMIT ?""",
+                (time.time() - self.stale_seconds, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, job_id: str, owner: str) -> bool:
+        """
+        Atomically take a queued or abandoned job (or one `owner` already holds).
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                """UPDATE bulk_jobs
+                   SET state = 'running', owner = ?, heartbeat_at = ?, started_at = COALESCE(started_at, ?)
+                   WHERE job_id = ? AND (state = 'queued' OR (state = 'running' AND (owner = ? OR heartbeat_at < ?)))""",
+                (owner, now, now, job_id, owner, now - self.stale_seconds),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def take_over(self, job_id: str, previous_owner: str, owner: str) -> bool:
+        """
+        Atomically take a running job from `previous_owner`, whatever its
+        heartbeat. Only for owners known to be dead (see owner_is_dead).
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE bulk_jobs SET owner = ?, heartbeat_at = ? WHERE job_id = ? AND state = 'running' AND owner = ?",
+                (owner, now, job_id, previous_owner),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def heartbeat(self, job_ids: list[str], owner: str) -> None:
+        if not job_ids:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "UPDATE bulk_jobs SET heartbeat_at = ? WHERE job_id = ? AND owner = ?",
+                [(time.time(), job_id, owner) for job_id in job_ids],
+            )
+            conn.commit()
+
+    def release(self, job_id: str, owner: str) -> None:
+        """
+        Put an unfinished job back in the queue, e.g. on shutdown, so the next runner picks it up at once.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE bulk_jobs SET state = 'queued', owner = NULL WHERE job_id = ? AND owner = ? AND state = 'running'",
+                (job_id, owner),
+            )
+            conn.commit()
+
+    def finish(self, job_id: str, owner: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE bulk_jobs SET state = 'completed', finished_at = ? WHERE job_id = ? AND owner = ?",
+                (time.time(), job_id, owner),
+            )
+            conn.commit()
+
+    def pending_pairs(self, job_id: str, after: int, limit: int) -> list[tuple[int, Optional[str], str, str]]:
+        with self._lock:
+            return self._connect().execute(
+                """SELECT idx, pair_id, job_text, resume_text FROM bulk_pairs
+                   WHERE job_id = ? AND idx > ? AND state = 'pending' ORDER BY idx LIMIT ?""",
+                (job_id, after, limit),
+            ).fetchall()
+
+    def record(self, job_id: str, index: int, result: dict, failed: bool) -> None:
+        """
+        Checkpoint one finished pair and bump the job's counters in the same transaction.
+        """
+        state = "failed" if failed else "done"
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE bulk_pairs SET state = ?, result = ? WHERE job_id = ? AND idx = ? AND state = 'pending'",
+                    (state, json.dumps(result), job_id, index),
+                )
+                if cursor.rowcount:
+                    conn.execute(
+                        f"UPDATE bulk_jobs SET {state} = {state} + 1, heartbeat_at = ? WHERE job_id = ?",
+                        (time.time(), job_id),
+                    )
+
+    def results(self, job_id: str, after: int = -1) -> Iterator[str]:
+        """
+        Yield finished results as JSON lines in input order, starting after pair index `after`.
+
+        Reads page by page, so a large job is never held in memory and the
+        store stays usable while the results are streamed.
+        """
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    """SELECT idx, result FROM bulk_pairs
+                       WHERE job_id = ? AND idx > ? AND state != 'pending' ORDER BY idx LIMIT ?""",
+                    (job_id, after, PAGE_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            for _, result in rows:
+                yield result + "\n"
+            after = rows[-1][0]
+
+
+class BulkRunner:
+    """
+    Runs bulk jobs in this process: at most `max_jobs` jobs at once, each with
+    up to `concurrency` pairs going through `calculate_job_match` in parallel.
+
+    A poll loop claims queued or abandoned jobs from the store and keeps the
+    heartbeat of running ones fresh. Several workers sharing one store never
+    run the same job twice, because claiming is a conditional UPDATE.
+    """
+
+    def __init__(self, store: BulkJobStore, concurrency: int, max_jobs: int, poll_seconds: float):
+        self.store = store
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._wake = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._poller = asyncio.create_task(self._poll())
+        logger.info("Bulk runner started as %s (concurrency: %s, max jobs: %s)", self.owner, self.concurrency, self.max_jobs)
+
+    def wake(self) -> None:
+        """Check for new jobs now instead of at the next poll."""
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+        tasks = list(self._tasks.items())
+        for _, task in tasks:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for job_id, _ in tasks:
+            await asyncio.to_thread(self.store.release, job_id, self.owner)
+        if tasks:
+            logger.info("Bulk runner stopped, released %s unfinished jobs", len(tasks))
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.store.heartbeat, list(self._tasks), self.owner)
+                free = self.max_jobs - len(self._tasks)
+                if free > 0:
+                    for job_id in await asyncio.to_thread(self.store.claimable, free):
+                        if job_id not in self._tasks and await asyncio.to_thread(self.store.claim, job_id, self.owner):
+                            self._start_job(job_id)
+            except Exception as e:
+                logger.exception("Bulk runner poll failed: %s", e)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _start_job(self, job_id: str) -> None:
+        task = asyncio.create_task(self.run_job(job_id))
+        self._tasks[job_id] = task
+
+        def done(_):
+            self._tasks.pop(job_id, None)
+            self._wake.set()
+
+        task.add_done_callback(done)
+
+    async def run_job(self, job_id: str) -> None:
+        """
+        Run the pending pairs of a job this runner has claimed, then mark it completed.
+
+        Store calls run in worker threads, so SQLite never blocks the event loop.
+        """
+        job = await asyncio.to_thread(self.store.get, job_id)
+        logger.info("Running bulk job %s - %s of %s pairs pending", job_id, job["pending"], job["total"])
+        started = time.perf_counter()
+
+        # Pairs are read page by page into a bounded queue, so memory stays flat for large jobs
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.concurrency)
+
+        async def produce():
+            after = -1
+            while pairs := await asyncio.to_thread(self.store.pending_pairs, job_id, after, PAGE_SIZE):
+                for pair in pairs:
+                    await queue.put(pair)
+                after = pairs[-1][0]
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while (pair := await queue.get()) is not None:
+                await self._run_pair(job_id, job["extractor"], *pair)
+
+        try:
+            await asyncio.gather(produce(), *(work() for _ in range(self.concurrency)))
+        except Exception as e:
+            logger.exception("Bulk job %s stopped: %s", job_id, e)
+            await asyncio.to_thread(self.store.release, job_id, self.owner)
+            return
+
+        await asyncio.to_thread(self.store.finish, job_id, self.owner)
+        job = await asyncio.to_thread(self.store.get, job_id)
+        logger.info(
+            "Bulk job %s completed in %.2fs - %s done, %s failed",
+            job_id, time.perf_counter() - started, job["done"], job["failed"],
+        )
+
+    async def _run_pair(self, job_id: str, extractor: Optional[str], index: int, pair_id: Optional[str], job_text: str, resume_text: str) -> None:
+        while True:
+            try:
+                # A failed LLM extraction fails the pair instead of recording a match with no skills
+                result = await calculate_job_match(job_text, resume_text, extractor=extractor, fallback=False)
+            except UpstreamUnavailableError as e:
+                # Shedding is transient: wait and retry rather than failing the pair
+                logger.warning("Bulk job %s pair %s shed, retrying in %.1fs", job_id, index, e.retry_after)
+                await asyncio.sleep(e.retry_after)
+                continue
+            except Exception as e:
+                logger.error("Bulk job %s pair %s failed: %s", job_id, index, e)
+                await asyncio.to_thread(
+                    self.store.record, job_id, index, {"index": index, "id": pair_id, "status": "failed", "error": str(e)}, failed=True
+                )
+                return
+
+            await asyncio.to_thread(
+                self.store.record,
+                job_id,
+                index,
+                {"index": index, "id": pair_id, "status": "done", **{field: result[field] for field in RESULT_FIELDS}},
+                failed=False,
+            )
+            return
+
+
+_bulk_store: Optional[BulkJobStore] = None
+_bulk_runner: Optional[BulkRunner] = None
+
+def get_bulk_store() -> BulkJobStore:
+    global _bulk_store
+    if _bulk_store is None:
+        _bulk_store = BulkJobStore(path=settings.bulk_store_path, stale_seconds=settings.bulk_stale_seconds)
+    return _bulk_store
+
+async def submit_bulk_job(data: bytes, extractor: Optional[str] = None) -> dict:
+    """
+    Validate JSONL input and queue it as a bulk job. Resubmitting the same
+    input returns the existing job (`created` is False).
+    """
+    # Parsing and hashing an upload of up to BULK_MAX_UPLOAD_MB is CPU-bound, so it runs off the event loop
+    pairs = await asyncio.to_thread(parse_pairs, data)
+    if len(pairs) > settings.bulk_max_pairs:
+        raise ValueError(f"A bulk job may contain at most {settings.bulk_max_pairs} pairs")
+
+    job_id = await asyncio.to_thread(make_bulk_job_id, data, extractor)
+    store = get_bulk_store()
+    created = await asyncio.to_thread(store.create, job_id, extractor, pairs)
+    logger.info("Bulk job %s %s - %s pairs", job_id, 'queued' if created else 'already exists', len(pairs))
+
+    if _bulk_runner is not None:
+        _bulk_runner.wake()
+    return {**await asyncio.to_thread(store.get, job_id), "created": created}
+
+def start_bulk_runner() -> None:
+    global _bulk_runner
+    if _bulk_runner is None:
+        _bulk_runner = BulkRunner(
+            get_bulk_store(),
+            concurrency=settings.bulk_concurrency,
+            max_jobs=settings.bulk_max_running_jobs,
+            poll_seconds=settings.bulk_poll_seconds,
+        )
+        _bulk_runner.start()
+
+async def stop_bulk_runner() -> None:
+    global _bulk_runner
+    if _bulk_runner is not None:
+        await _bulk_runner.stop()
+        _bulk_runner = None
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from backend.core.config import settings
+from backend.core.metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivial whitespace/case edits share a cache entry.
+    """
+    return " ".join(text.lower().split())
+
+
+def make_cache_key(text: str, context: str, prompt_version: str, model_name: str) -> str:
+    """
+    Build a content-addressed key for a skill extraction result.
+    """
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, context, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SkillCache:
+    """
+    Two-tier cache for extracted skill lists.
+
+    - Memory tier: bounded LRU, per process
+    - Disk tier: SQLite file shared by all workers on the host, survives restarts
+
+    Entries expire after `ttl_seconds`; the disk tier is trimmed to `max_entries`
+    by evicting the least recently used rows.
+
+    get() and set() block on SQLite; async callers use get_async() and
+    set_async(), which answer memory hits inline and run disk access in a
+    worker thread.
+    """
+
+    def __init__(self, path: str, memory_size: int, max_entries: int, ttl_seconds: int):
+        self.path = Path(path)
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_trim = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS skill_cache (
+                    key TEXT PRIMARY KEY,
+                    skills TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_skill_cache_accessed ON skill_cache(accessed_at)")
+            conn.commit()
+            self._conn = conn
+            logger.info("Skill cache opened at %s", self.path)
+        return self._conn
+
+    def get(self, key: str) -> Optional[list[str]]:
+        """
+        Look up a cached skill list, promoting disk hits into the memory tier.
+        """
+        now = time.time()
+        with self._lock:
+            skills = self._recall(key, now)
+            if skills is not None:
+                return skills
+
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT skills, created_at FROM skill_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    conn.execute("UPDATE skill_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    skills = json.loads(row[0])
+                    self._remember(key, row[1], skills)
+                    self.disk_hits += 1
+                    return list(skills)
+                if row is not None:
+                    conn.execute("DELETE FROM skill_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    self.evictions += 1
+            except sqlite3.Error as e:
+                logger.warning("Skill cache read failed, treating as miss: %s", e)
+
+            self.misses += 1
+            return None
+
+    async def get_async(self, key: str) -> Optional[list[str]]:
+        """
+        get() without blocking the event loop.
+        """
+        # Only answer inline if the lock is free; it may be held by a thread waiting on SQLite
+        if self._lock.acquire(blocking=False):
+            try:
+                skills = self._recall(key, time.time())
+            finally:
+                self._lock.release()
+            if skills is not None:
+                return skills
+        return await asyncio.to_thread(self.get, key)
+
+    def set(self, key: str, skills: list[str]) -> None:
+        """
+        Store a skill list in both tiers.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, skills)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO skill_cache (key, skills, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(skills), now, now),
+                )
+                conn.commit()
+                self.writes += 1
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim(conn, now)
+            except sqlite3.Error as e:
+                logger.warning("Skill cache write failed: %s", e)
+
+    async def set_async(self, key: str, skills: list[str]) -> None:
+        """
+        set() without blocking the event loop.
+        """
+        await asyncio.to_thread(self.set, key, skills)
+
+    def _recall(self, key: str, now: float) -> Optional[list[str]]:
+        """
+        Memory-tier lookup; the caller holds the lock.
+        """
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        created_at, skills = entry
+        if now - created_at >= self.ttl_seconds:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        self.memory_hits += 1
+        return list(skills)
+
+    def _remember(self, key: str, created_at: float, skills: list[str]) -> None:
+        self._memory[key] = (created_at, list(skills))
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _trim(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Drop expired rows, then the least recently used rows above `max_entries`.
+        """
+        self._writes_since_trim = 0
+        expired = conn.execute(
+            "DELETE FROM skill_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = conn.execute(
+            """DELETE FROM skill_cache WHERE key IN (
+                SELECT key FROM skill_cache ORDER BY accessed_at ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM skill_cache) - ?)
+            )""",
+            (self.max_entries,),
+        ).rowcount
+        conn.commit()
+        if expired or overflow:
+            self.evictions += expired + overflow
+            logger.info("Skill cache trimmed - Expired: %s, Over capacity: %s", expired, overflow)
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and tier sizes.
+        """
+        with self._lock:
+            disk_entries = None
+            try:
+                disk_entries = self._connect().execute("SELECT COUNT(*) FROM skill_cache").fetchone()[0]
+            except sqlite3.Error:
+                pass
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+skill_cache = SkillCache(
+    path=settings.skill_cache_path,
+    memory_size=settings.skill_cache_memory_size,
+    max_entries=settings.skill_cache_max_entries,
+    ttl_seconds=settings.skill_cache_ttl_seconds,
+)
+register_cache("skills", skill_cache)
@@ -0,0 +1,122 @@
+import re
+
+import numpy as np
+
+AGGREGATIONS = ("max", "mean_of_max", "top_k")
+
+# Resume and job posting headings, matched case-insensitively with an optional trailing colon
+SECTION_HEADINGS = {
+    "summary", "profile", "professional summary", "about", "about me", "about us", "objective",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "work history", "education", "skills", "technical skills", "core competencies", "projects",
+    "certifications", "certificates", "publications", "awards", "languages", "interests", "volunteering",
+    "responsibilities", "requirements", "qualifications", "nice to have", "what you will do",
+    "what we offer", "benefits", "about the role", "the role",
+}
+# All-caps heading such as "WORK EXPERIENCE"; at least four letters so acronyms like "AWS" are not headings
+UPPERCASE_HEADING = re.compile(r"^(?=(?:[^a-z]*[A-Z]){4})[A-Z0-9 &/,'-]+:?$")
+MAX_HEADING_WORDS = 5
+
+
+def _is_heading(line: str) -> bool:
+    if not line or len(line.split()) > MAX_HEADING_WORDS:
+        return False
+    return line.rstrip(":").strip().lower() in SECTION_HEADINGS or UPPERCASE_HEADING.match(line) is not None
+
+
+def _blocks(text: str) -> list[str]:
+    """
+    Split text at blank lines and before heading lines. PDF text layers rarely
+    keep blank lines, so headings are what separates the sections of an
+    uploaded resume.
+    """
+    blocks = []
+    current = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line or _is_heading(line):
+            if current:
+                blocks.append("\n".join(current))
+            current = [line] if line else []
+        else:
+            current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def split_sections(text: str, min_words: int) -> list[str]:
+    """
+    Split text into sections at blank lines and headings, merging consecutive
+    sections until each has at least `min_words` words (the last may be
+    shorter).
+
+    Sections are stable under edits: changing a bullet only changes the
+    section that contains it, unless the edit moves a section across
+    `min_words` and shifts where the merged sections start. Text without
+    blank lines or headings is a single section.
+    """
+    sections = []
+    current = []
+    current_words = 0
+    for block in _blocks(text):
+        current.append(block)
+        current_words += len(block.split())
+        if current_words >= min_words:
+            sections.append("\n\n".join(current))
+            current = []
+            current_words = 0
+    if current:
+        sections.append("\n\n".join(current))
+    return sections or [text]
+
+
+def chunk_text(text: str, size: int, overlap: int) -> list[str]:
+    """
+    Split text into windows of `size` words, each overlapping the previous
+    one by `overlap` words.
+
+    The embedding model truncates its input at 256 word-pieces, so `size`
+    should stay well below that. A text that fits in one window is returned
+    unchanged, so short documents share their cache entry with the
+    whole-document embedding.
+    """
+    words = text.split()
+    if len(words) <= size:
+        return [text]
+    step = max(1, size - overlap)
+    # The last window ends at the last word; no trailing window that only repeats the overlap.
+    # At least one window, even if overlap >= size
+    starts = range(0, max(1, len(words) - overlap), step)
+    return [" ".join(words[start:start + size]) for start in starts]
+
+
+def aggregate_chunk_scores(scores: np.ndarray, offsets: np.ndarray, method: str, k: int = 3) -> np.ndarray:
+    """
+    Reduce a chunk similarity matrix to one score per document.
+
+    `scores` holds the cosine similarity of every resume chunk (rows) to
+    every job chunk (columns). The rows of resume i are
+    offsets[i]:offsets[i + 1], so several resumes can be scored against one
+    job in a single call.
+
+    - max: the best single chunk pair
+    - mean_of_max: for each job chunk, its best resume chunk, averaged over
+      job chunks. Rewards resumes that cover every part of the job.
+    - top_k: mean of the `k` highest chunk pairs
+    """
+    if method not in AGGREGATIONS:
+        raise ValueError(f"Unknown chunk aggregation: {method}")
+
+    if method == "top_k":
+        bounds = np.append(offsets, len(scores))
+        result = np.empty(len(offsets), dtype=np.float32)
+        for i in range(len(offsets)):
+            segment = scores[bounds[i]:bounds[i + 1]].ravel()
+            top = min(k, len(segment))
+            result[i] = np.partition(segment, len(segment) - top)[-top:].mean()
+        return result
+
+    # Best resume chunk per job chunk, for every resume at once
+    best = np.maximum.reduceat(scores, offsets, axis=0)
+    return best.max(axis=1) if method == "max" else best.mean(axis=1)
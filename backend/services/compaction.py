@@ -0,0 +1,219 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from backend.services.skill_extractor import get_local_extractor
+
+logger = logging.getLogger(__name__)
+
+# Bump when the compaction rules change, so cached extractions of compacted text are not reused
+COMPACTION_VERSION = "c2"
+
+# Tokenizer of the extraction model; counts fall back to ~4 characters per token without tiktoken
+TIKTOKEN_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+
+# A word broken across a line by the PDF text layer: "micro-\nservices"
+HYPHENATED_BREAK = re.compile(r"([a-z])-\n[ \t]*([a-z])")
+INLINE_SPACE = re.compile(r"[ \t\v\u00a0\u200b]+")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+BULLET = re.compile(r"^[\u2022\u25aa\u25cf\u2023\u2043\u2219\u00b7*-]+\s*")
+# "3", "Page 3", "3 of 5", "3/5"; at most three digits, so a year on its own line is kept
+PAGE_NUMBER = re.compile(r"^(?:page\s+)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+# Form feed, the plain-text page break
+PAGE_BREAK = "\f"
+# Running headers and footers sit within this many lines of a page break
+PAGE_EDGE_LINES = 2
+CONTACT = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"                    # email
+    r"|(?:https?://|www\.)\S+"                    # URL
+    r"|\b(?:linkedin|github)\.com/\S*"            # bare profile links
+    r"|(?<![\w.])\+?\(?\d{1,4}\)?[ .-]?\d{3}[ .-]?\d{3,4}(?:[ .-]?\d{2,4})?(?!\w)",  # phone number
+    re.IGNORECASE,
+)
+CONTACT_LEFTOVER = re.compile(r"[|,;:\u2022\u00b7/()-]|\b(?:email|e-mail|phone|tel|mobile|linkedin|github|website)\b", re.IGNORECASE)
+# Acronyms (AWS), inner capitals (FastAPI), symbols (C++, C#, .NET, Node.js), letters with digits (EC2)
+# and capitalized words after the first one (proper nouns such as Kafka)
+SKILL_SHAPE = re.compile(r"\b[A-Z]{2,}|\b[a-z]+[A-Z]|\w[+#]|\.\w{2,}\b|\b[A-Za-z]+\d+\b|(?<=[\w,;] )[A-Z][a-z]+")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def load_encoding():
+    """
+    Load the tiktoken encoding once; None if tiktoken or its vocabulary file is unavailable.
+
+    Loading may read or download the vocabulary file, so the app calls this
+    during warm-up rather than inside the first request.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+                    logger.info("Counting prompt tokens with tiktoken (%s)", TIKTOKEN_ENCODING)
+                except Exception as e:
+                    logger.warning("tiktoken unavailable (%s), estimating %s chars per token", type(e).__name__, CHARS_PER_TOKEN)
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = load_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _is_contact_line(line: str) -> bool:
+    """A line that is only contact details, plus at most a name or a city."""
+    if not CONTACT.search(line):
+        return False
+    leftover = CONTACT_LEFTOVER.sub(" ", CONTACT.sub(" ", line))
+    return len(leftover.split()) <= 4
+
+
+def _lines(text: str) -> list[Optional[tuple[str, bool]]]:
+    """
+    Normalized lines as (text, is_bullet); "" for a blank line and None for a
+    page break (a form feed or a page-number line). Contact lines are dropped.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = HYPHENATED_BREAK.sub(r"\1\2", text)
+    text = text.replace(PAGE_BREAK, "\n" + PAGE_BREAK + "\n")
+
+    lines = []
+    for line in text.split("\n"):
+        # Checked before strip(), which would remove the form feed
+        if line == PAGE_BREAK or PAGE_NUMBER.match(line.strip()):
+            lines.append(None)
+            continue
+        line = line.strip()
+        is_bullet = BULLET.match(line) is not None
+        line = INLINE_SPACE.sub(" ", BULLET.sub("", line)).strip()
+        if line and _is_contact_line(line):
+            continue
+        lines.append((line, is_bullet))
+    return lines
+
+
+def _running_lines(lines: list[Optional[tuple[str, bool]]]) -> set[str]:
+    """
+    Lowercased lines that are running headers or footers: lines that occur
+    more than once, always within PAGE_EDGE_LINES non-blank lines of a page
+    break or the start or end of the text. Documents without page breaks
+    have none, so repeated lines in the body (two identical bullets) are kept.
+    """
+    if None not in lines:
+        return set()
+
+    # Split into pages of non-blank lines; the text's own start and end count as page edges
+    pages = [[]]
+    for line in lines:
+        if line is None:
+            pages.append([])
+        elif line[0]:
+            pages[-1].append(line[0].lower())
+
+    occurrences = Counter()
+    at_edge = Counter()
+    for page in pages:
+        for i, key in enumerate(page):
+            occurrences[key] += 1
+            if i < PAGE_EDGE_LINES or i >= len(page) - PAGE_EDGE_LINES:
+                at_edge[key] += 1
+    return {key for key, count in occurrences.items() if count > 1 and at_edge[key] == count}
+
+
+def _units(text: str) -> list[str]:
+    """
+    Normalize text and split it into sentences, without page numbers,
+    contact lines or the repeats of running headers and footers.
+
+    Wrapped lines are joined back into paragraphs first; bullets and blank
+    lines start a new paragraph. A paragraph continues across a page break.
+    """
+    lines = _lines(text)
+    running = _running_lines(lines)
+
+    units = []
+    seen_running = set()
+    paragraph = []
+
+    def end_paragraph():
+        if paragraph:
+            units.extend(SENTENCE_BREAK.split(" ".join(paragraph)))
+            paragraph.clear()
+
+    for line in lines:
+        if line is None:
+            continue
+        line, is_bullet = line
+        if not line:
+            end_paragraph()
+            continue
+        key = line.lower()
+        if key in running:
+            if key in seen_running:
+                continue
+            seen_running.add(key)
+        if is_bullet:
+            end_paragraph()
+        paragraph.append(line)
+    end_paragraph()
+    return units
+
+
+def _signal(unit: str) -> int:
+    """Number of taxonomy skills plus skill-shaped tokens in a sentence."""
+    return len(get_local_extractor().extract(unit)) + len(SKILL_SHAPE.findall(unit))
+
+
+def compact_text(text: str, max_tokens: int, drop_unsignalled: bool = False) -> dict:
+    """
+    Shrink a document before it goes into an LLM prompt.
+
+    Whitespace and line-break hyphenation are normalized. Page numbers,
+    contact lines and repeated running headers and footers are removed, and, with
+    `drop_unsignalled`, so are sentences without a single taxonomy skill or
+    skill-shaped token. If the rest is still over `max_tokens`, the
+    sentences with the most skill signal are kept, in their original order.
+
+    Returns the compacted text with token counts before and after.
+    """
+    tokens_before = count_tokens(text)
+    units = _units(text)
+    signals = [_signal(unit) for unit in units]
+
+    kept = [i for i, signal in enumerate(signals) if signal > 0 or not drop_unsignalled]
+    # Never compact a document down to nothing
+    if not kept:
+        kept = list(range(len(units)))
+
+    unit_tokens = {i: count_tokens(units[i]) for i in kept}
+    if sum(unit_tokens.values()) > max_tokens:
+        budget = max_tokens
+        selected = []
+        for i in sorted(kept, key=lambda i: signals[i], reverse=True):
+            if unit_tokens[i] <= budget:
+                selected.append(i)
+                budget -= unit_tokens[i]
+        kept = sorted(selected)
+
+    compacted = "\n".join(units[i] for i in kept)
+    tokens_after = count_tokens(compacted)
+    return {
+        "text": compacted,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "units_kept": len(kept),
+        "units_dropped": len(units) - len(kept),
+    }
@@ -0,0 +1,185 @@
+"""
+Dynamic micro-batching of encode calls across concurrent requests.
+
+Concurrent matches each encode only a couple of texts, so the model mostly
+runs tiny batches. The batcher's worker thread takes the first waiting
+request, keeps collecting requests for up to `embedding_batch_window_ms` (or
+until `embedding_batch_max_texts` texts are queued), runs one encode for all
+of them and resolves each caller's future with its own rows. While an encode
+is running, new requests queue up and form the next batch.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.core.metrics import EMBEDDING_BATCH_TEXTS, EMBEDDING_QUEUE_WAIT
+from backend.services.embedding_model import get_model
+
+logger = logging.getLogger(__name__)
+
+# Number of recent batches kept for percentile stats
+STATS_WINDOW = 1024
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces encode calls from many threads into batched model.encode calls.
+    Returned embeddings are L2-normalized float32.
+    """
+
+    def __init__(self, model, window_ms: float, max_texts: int, encode_batch_size: int):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_texts = max_texts
+        self.encode_batch_size = encode_batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.max_batch_texts = 0
+        self._batch_sizes: deque[int] = deque(maxlen=STATS_WINDOW)
+        self._queue_waits: deque[float] = deque(maxlen=STATS_WINDOW)
+
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+        logger.info("Embedding batcher started - window %sms, max %s texts per batch", window_ms, max_texts)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode `texts` as part of the next batch and block until its rows are ready.
+        """
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        future: Future = Future()
+        self._queue.put((list(texts), time.perf_counter(), future))
+        return future.result()
+
+    def _collect(self) -> list[tuple]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        pending = [first]
+        count = len(first[0])
+        deadline = time.perf_counter() + self.window
+        while count < self.max_texts:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            pending.append(item)
+            count += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._collect()
+            if not pending:
+                return
+
+            started = time.perf_counter()
+            texts = [text for item in pending for text in item[0]]
+            try:
+                vectors = np.asarray(
+                    self.model.encode(texts, batch_size=self.encode_batch_size, normalize_embeddings=True),
+                    dtype=np.float32,
+                )
+            except Exception as e:
+                logger.exception("Batched encode of %s texts failed: %s", len(texts), e)
+                for _, _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, _, future in pending:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+            EMBEDDING_BATCH_TEXTS.observe(len(texts))
+            for _, submitted, _ in pending:
+                EMBEDDING_QUEUE_WAIT.observe(started - submitted)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.requests += len(pending)
+                self.texts += len(texts)
+                self.max_batch_texts = max(self.max_batch_texts, len(texts))
+                self._batch_sizes.append(len(texts))
+                self._queue_waits.extend(started - submitted for _, submitted, _ in pending)
+
+            logger.debug(
+                "Encoded batch of %d texts from %d requests in %.1fms",
+                len(texts), len(pending), (time.perf_counter() - started) * 1000,
+            )
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> dict:
+        """
+        Batch size and queue wait counters, with percentiles over the recent batches.
+        """
+        with self._stats_lock:
+            sizes = np.array(self._batch_sizes) if self._batch_sizes else np.zeros(1)
+            waits = np.array(self._queue_waits) * 1000 if self._queue_waits else np.zeros(1)
+            return {
+                "window_ms": self.window * 1000,
+                "max_texts": self.max_texts,
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "queued_requests": self._queue.qsize(),
+                "avg_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch_texts": self.max_batch_texts,
+                "batch_texts_p50": float(np.percentile(sizes, 50)),
+                "batch_texts_p99": float(np.percentile(sizes, 99)),
+                "queue_wait_ms_p50": round(float(np.percentile(waits, 50)), 3),
+                "queue_wait_ms_p99": round(float(np.percentile(waits, 99)), 3),
+            }
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+_lock = threading.Lock()
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """
+    Start the batcher in front of the shared embedding model on first use.
+    """
+    global _batcher
+    if _batcher is None:
+        with _lock:
+            if _batcher is None:
+                _batcher = EmbeddingBatcher(
+                    get_model(),
+                    window_ms=settings.embedding_batch_window_ms,
+                    max_texts=settings.embedding_batch_max_texts,
+                    encode_batch_size=settings.batch_encode_size,
+                )
+    return _batcher
+
+def current_batcher() -> Optional[EmbeddingBatcher]:
+    """
+    The running batcher, or None if nothing has encoded yet. Never starts one.
+    """
+    return _batcher
+
+def shutdown_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        _batcher.stop()
+        _batcher = None
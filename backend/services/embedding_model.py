@@ -0,0 +1,255 @@
+"""
+Lazy loader for the sentence embedding model, with pluggable backends.
+
+Backends (settings.embedding_backend):
+- torch:     sentence-transformers on PyTorch, fp32 (reference)
+- onnx:      the same weights exported to ONNX, run with ONNX Runtime, fp32
+- onnx-int8: the ONNX export with dynamically quantized int8 weights
+
+The ONNX backends only need onnxruntime, tokenizers and numpy at runtime, not
+torch. Cosine scores stay within these tolerances of the torch backend
+(checked by `verify`):
+- onnx:      |delta cosine| <= 1e-4 (0.01 points on the 0-100 similarity scale)
+- onnx-int8: |delta cosine| <= 0.02 (2 points on the 0-100 similarity scale)
+
+torch/onnxruntime are only imported when the model is first needed (or when
+the app's lifespan warms it up), so importing the API stays fast. With
+EMBEDDING_SERVER_SOCKET set, get_model() returns a client for the shared
+embedding server instead (see embedding_server.py) and nothing is loaded here.
+
+    # Pre-serialize the torch model for offline loading (EMBEDDING_MODEL_PATH)
+    python -m backend.services.embedding_model export /app/models/all-MiniLM-L6-v2
+
+    # One-time ONNX export + int8 quantization into ONNX_MODEL_DIR, then check scores
+    python -m backend.services.embedding_model export-onnx
+    python -m backend.services.embedding_model verify
+"""
+import argparse
+import logging
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+MAX_SEQ_LENGTH = 256
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model-int8.onnx"}
+TOKENIZER_FILE = "tokenizer.json"
+
+TOLERANCES = {"onnx": 1e-4, "onnx-int8": 0.02}
+
+_model = None
+_lock = threading.Lock()
+
+
+class OnnxEmbedder:
+    """
+    ONNX Runtime implementation of the subset of SentenceTransformer used here:
+    tokenize, run the transformer, mean-pool over the attention mask, normalize.
+    """
+
+    def __init__(self, model_dir: str, backend: str):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.onnx_intra_op_threads:
+            options.intra_op_num_threads = settings.onnx_intra_op_threads
+        self.session = ort.InferenceSession(
+            str(model_dir / ONNX_FILES[backend]), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+
+        # Batch texts of similar length together to minimize padding
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            encoded = self.tokenizer.encode_batch([texts[i] for i in batch])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            embeddings[batch] = pooled
+
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+def _load_torch_model():
+    from sentence_transformers import SentenceTransformer
+
+    source = settings.embedding_model_path
+    if source and Path(source).is_dir():
+        logger.info("Loading sentence-transformer model from artifact: %s", source)
+    else:
+        source = MODEL_NAME
+        logger.info("Loading sentence-transformer model: %s", MODEL_NAME)
+    return SentenceTransformer(source, device="cpu")
+
+
+def _load_model(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    if backend == "torch":
+        return _load_torch_model()
+    logger.info("Loading %s embedding model from %s", backend, settings.onnx_model_dir)
+    return OnnxEmbedder(settings.onnx_model_dir, backend)
+
+
+def _connect_embedding_server():
+    from backend.services.embedding_server import RemoteEmbedder
+
+    remote = RemoteEmbedder(settings.embedding_server_socket, settings.embedding_server_connect_timeout_seconds)
+    if remote.model_id != model_id():
+        raise RuntimeError(f"Embedding server serves {remote.model_id}, this worker expects {model_id()}")
+    return remote
+
+
+def get_model():
+    """
+    Return the shared embedding model for the configured backend, loading it on first use.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                started = time.perf_counter()
+                if settings.embedding_server_socket:
+                    _model = _connect_embedding_server()
+                else:
+                    _model = _load_model(settings.embedding_backend)
+                logger.info("Embedding model (%s) loaded in %.2fs", settings.embedding_backend, time.perf_counter() - started)
+    return _model
+
+
+def model_id() -> str:
+    """
+    Identifies the model and backend, so cached vectors from different backends never mix.
+    """
+    return MODEL_NAME if settings.embedding_backend == "torch" else f"{MODEL_NAME}:{settings.embedding_backend}"
+
+
+def is_loaded() -> bool:
+    return _model is not None
+
+
+def warm_up() -> None:
+    """
+    Load the model and run one encode so the first request does not pay for
+    lazy initialization inside the runtime.
+    """
+    started = time.perf_counter()
+    get_model().encode(["warm-up"], normalize_embeddings=True)
+    logger.info("Embedding model warmed up in %.2fs", time.perf_counter() - started)
+
+
+def export_onnx(model_dir: str) -> None:
+    """
+    Export the transformer to ONNX and write a dynamically quantized int8 copy.
+    Needs torch and onnxruntime; only run once, at build time.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    out = Path(model_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    sentence_model = _load_torch_model()
+    transformer = sentence_model[0].auto_model.eval()
+    sentence_model.tokenizer.backend_tokenizer.save(str(out / TOKENIZER_FILE))
+
+    dummy = sentence_model.tokenizer(["export sample"], return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in dummy}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in dummy),
+            str(out / ONNX_FILES["onnx"]),
+            input_names=list(dummy),
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+
+    quantize_dynamic(str(out / ONNX_FILES["onnx"]), str(out / ONNX_FILES["onnx-int8"]), weight_type=QuantType.QInt8)
+    print(f"Exported {MODEL_NAME} to {out} ({', '.join(ONNX_FILES.values())})")
+
+
+VERIFY_PAIRS = [
+    ("Senior Python engineer with FastAPI and PostgreSQL", "Built REST APIs in Python using FastAPI and Postgres"),
+    ("Kubernetes and Docker experience required", "Deployed containerized services on k8s"),
+    ("Machine learning engineer, PyTorch, MLOps", "Frontend developer skilled in React and CSS"),
+    ("Agile team, CI/CD with GitLab", "Scrum practitioner; set up GitHub Actions pipelines"),
+]
+
+
+def verify() -> bool:
+    """
+    Compare cosine scores of every ONNX backend against torch on sample pairs.
+    """
+    reference = _load_model("torch")
+    texts = [text for pair in VERIFY_PAIRS for text in pair]
+    expected = reference.encode(texts, normalize_embeddings=True)
+    expected_scores = (expected[0::2] * expected[1::2]).sum(axis=1)
+
+    ok = True
+    for backend in ONNX_FILES:
+        vectors = OnnxEmbedder(settings.onnx_model_dir, backend).encode(texts, normalize_embeddings=True)
+        scores = (vectors[0::2] * vectors[1::2]).sum(axis=1)
+        max_delta = float(np.abs(scores - expected_scores).max())
+        passed = max_delta <= TOLERANCES[backend]
+        ok = ok and passed
+        print(f"{backend:>10}: max |delta cosine| = {max_delta:.6f} (tolerance {TOLERANCES[backend]}) {'OK' if passed else 'FAIL'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding model utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export = subparsers.add_parser("export", help="Save the torch model to a local directory for offline loading")
+    export.add_argument("path")
+    export_onnx_parser = subparsers.add_parser("export-onnx", help="Export to ONNX and quantize to int8")
+    export_onnx_parser.add_argument("path", nargs="?", default=None)
+    subparsers.add_parser("verify", help="Check ONNX cosine scores against torch")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        _load_torch_model().save(args.path)
+        print(f"Saved {MODEL_NAME} to {args.path}")
+    elif args.command == "export-onnx":
+        export_onnx(args.path or settings.onnx_model_dir)
+    elif args.command == "verify":
+        raise SystemExit(0 if verify() else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Shared embedding server for multi-worker deployments.
+
+Every uvicorn/gunicorn worker that loads the model in-process holds its own
+copy of the weights (and of torch). With EMBEDDING_SERVER_SOCKET set, workers
+instead send encode calls over a Unix socket to one server process that owns
+the only copy, so memory stays flat as HTTP workers are added.
+
+    python -m backend.services.embedding_server &
+    EMBEDDING_SERVER_SOCKET=/tmp/embedding.sock uvicorn backend.main:app --workers 8
+
+Wire format, in both directions: a 4-byte big-endian header length, a JSON
+header, then an optional binary payload whose size the header states.
+- {"op": "info"} -> {"model_id", "dim"}
+- {"op": "encode", "texts": [...], "batch_size": n, "normalize": bool}
+  -> {"rows", "dim"} + rows * dim float32 values (little-endian, row-major)
+- failures -> {"error": "..."}
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEADER_SIZE = struct.Struct(">I")
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Embedding server connection closed")
+        received += count
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(HEADER_SIZE.pack(len(encoded)) + encoded + payload)
+
+
+def recv_header(sock: socket.socket) -> dict:
+    (size,) = HEADER_SIZE.unpack(_recv_exactly(sock, HEADER_SIZE.size))
+    return json.loads(_recv_exactly(sock, size))
+
+
+class RemoteEmbedder:
+    """
+    Client for the embedding server with the subset of the SentenceTransformer
+    interface matcher_service uses. Each thread keeps its own connection.
+    """
+
+    def __init__(self, path: str, connect_timeout: float):
+        self.path = path
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+
+        info = self._request({"op": "info"})[0]
+        self.model_id = info["model_id"]
+        self.dimension = info["dim"]
+        logger.info("Connected to embedding server at %s (%s, dim %s)", path, self.model_id, self.dimension)
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                # The server may still be loading the model
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"Embedding server not reachable at {self.path}")
+                time.sleep(0.2)
+
+    def _request(self, header: dict) -> tuple[dict, bytes]:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = self._local.sock = self._connect()
+        try:
+            send_message(sock, header)
+            response = recv_header(sock)
+            payload = b""
+            if "rows" in response:
+                payload = _recv_exactly(sock, response["rows"] * response["dim"] * 4)
+        except OSError:
+            # Drop the broken connection so the next call reconnects
+            sock.close()
+            self._local.sock = None
+            raise
+        if "error" in response:
+            raise RuntimeError(f"Embedding server error: {response['error']}")
+        return response, payload
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        response, payload = self._request({
+            "op": "encode",
+            "texts": texts,
+            "batch_size": batch_size,
+            "normalize": normalize_embeddings,
+        })
+        embeddings = np.frombuffer(payload, dtype="<f4").reshape(response["rows"], response["dim"])
+        return embeddings[0] if single else embeddings
+
+
+class EmbeddingRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serves requests from one worker connection until it closes.
+    """
+
+    def handle(self):
+        while True:
+            try:
+                header = recv_header(self.request)
+            except ConnectionError:
+                return
+            try:
+                self.server.handle_message(self.request, header)
+            except Exception as e:
+                logger.exception("Embedding server request failed: %s", e)
+                send_message(self.request, {"error": str(e)})
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, model, model_id: str):
+        self.model = model
+        self.model_id = model_id
+        self.dimension = model.get_sentence_embedding_dimension()
+        # Encoding already uses every core, so concurrent calls would only contend
+        self.encode_lock = threading.Lock()
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, EmbeddingRequestHandler)
+
+    def handle_message(self, sock: socket.socket, header: dict) -> None:
+        if header.get("op") == "info":
+            send_message(sock, {"model_id": self.model_id, "dim": self.dimension})
+            return
+        if header.get("op") != "encode":
+            raise ValueError(f"Unknown op: {header.get('op')}")
+
+        texts = header["texts"]
+        with self.encode_lock:
+            embeddings = self.model.encode(
+                texts,
+                batch_size=header.get("batch_size", 32),
+                normalize_embeddings=header.get("normalize", False),
+            )
+        embeddings = np.ascontiguousarray(embeddings, dtype="<f4").reshape(len(texts), self.dimension)
+        send_message(sock, {"rows": len(texts), "dim": self.dimension}, embeddings.tobytes())
+
+
+def main():
+    from backend.core.logging_config import setup_logging
+    from backend.services.embedding_model import _load_model, model_id
+
+    parser = argparse.ArgumentParser(description="Serve the embedding model to API workers over a Unix socket")
+    parser.add_argument("--socket", default=settings.embedding_server_socket or "/tmp/embedding.sock")
+    args = parser.parse_args()
+
+    setup_logging()
+    # Always load in-process here, even though EMBEDDING_SERVER_SOCKET is set for the workers
+    started = time.perf_counter()
+    model = _load_model(settings.embedding_backend)
+    model.encode(["warm-up"], normalize_embeddings=True)
+    logger.info("Embedding model (%s) loaded and warmed up in %.2fs", settings.embedding_backend, time.perf_counter() - started)
+
+    server = EmbeddingServer(args.socket, model, model_id())
+    # Exit through the finally block below on SIGTERM too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info("Embedding server listening on %s (pid %s)", args.socket, os.getpid())
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.sqlite3"
+LOCK_FILE = "store.lock"
+
+
+def make_embedding_key(text: str, model_name: str) -> str:
+    """
+    Build a content-addressed key for an embedding.
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Embedding cache backed by an append-only float32 file.
+
+    - Hot tier: bounded in-process LRU of recently used vectors
+    - Cold tier: `vectors.f32` (row-major, `dim` float32 per row) read through
+      `numpy.memmap`, plus a SQLite index mapping key -> row
+
+    Every worker on the host maps the same file, so vectors are shared through
+    the page cache instead of being copied per process. Writers append under an
+    exclusive file lock; when the file grows past `max_rows` it is compacted down
+    to the most recently used rows and the index generation is bumped so other
+    workers remap.
+    """
+
+    def __init__(self, path: str, dim: int, memory_size: int, max_rows: int, compact_keep_ratio: float = 0.75):
+        self.path = Path(path)
+        self.dim = dim
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.compact_keep_ratio = compact_keep_ratio
+
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock_fd: Optional[int] = None
+        self._mmap: Optional[np.memmap] = None
+        self._mapped_rows = 0
+        self._mapped_generation = -1
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.compactions = 0
+
+    # ---- storage plumbing ----
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path / INDEX_FILE, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    row INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('dim', ?)", (str(self.dim),))
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', '0')")
+            conn.commit()
+
+            stored_dim = int(conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()[0])
+            if stored_dim != self.dim:
+                raise ValueError(
+                    f"Embedding store at {self.path} has dim {stored_dim}, expected {self.dim}"
+                )
+
+            self._conn = conn
+            self._lock_fd = os.open(self.path / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+            (self.path / VECTORS_FILE).touch(exist_ok=True)
+            logger.info("Embedding store opened at %s (dim=%s)", self.path, self.dim)
+        return self._conn
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """
+        Cross-process lock: shared for readers, exclusive for appends and compaction.
+        """
+        if fcntl is None or self._lock_fd is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _generation(self, conn: sqlite3.Connection) -> int:
+        return int(conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0])
+
+    def _file_rows(self) -> int:
+        return (self.path / VECTORS_FILE).stat().st_size // (self.dim * 4)
+
+    def _vectors(self, conn: sqlite3.Connection, needed_rows: int) -> np.memmap:
+        """
+        Return a read-only memmap covering at least `needed_rows`, remapping after
+        appends by other workers or after a compaction.
+        """
+        generation = self._generation(conn)
+        if self._mmap is None or generation != self._mapped_generation or needed_rows > self._mapped_rows:
+            rows = self._file_rows()
+            self._mmap = np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+            self._mapped_rows = rows
+            self._mapped_generation = generation
+        return self._mmap
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ---- public API ----
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """
+        Look up vectors by key. Missing keys are absent from the result.
+        """
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            cold = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+                else:
+                    cold.append(key)
+
+            if not cold:
+                return found
+
+            try:
+                conn = self._connect()
+                with self._file_lock(exclusive=False):
+                    placeholders = ",".join("?" * len(cold))
+                    rows = conn.execute(
+                        f"SELECT key, row FROM embeddings WHERE key IN ({placeholders})", cold
+                    ).fetchall()
+                    if rows:
+                        vectors = self._vectors(conn, max(row for _, row in rows) + 1)
+                        for key, row in rows:
+                            vector = np.array(vectors[row])
+                            found[key] = vector
+                            self._remember(key, vector)
+                        now = time.time()
+                        conn.executemany(
+                            "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows],
+                        )
+                        conn.commit()
+                self.disk_hits += len(rows)
+                self.misses += len(cold) - len(rows)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Embedding store read failed, treating as miss: %s", e)
+                self.misses += len(cold)
+
+        return found
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """
+        Append new vectors to the store. Keys already present are skipped.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector.copy())
+
+            try:
+                conn = self._connect()
+                with self._file_lock(exclusive=True):
+                    placeholders = ",".join("?" * len(keys))
+                    existing = {
+                        key for (key,) in conn.execute(
+                            f"SELECT key FROM embeddings WHERE key IN ({placeholders})", keys
+                        )
+                    }
+                    fresh = []
+                    for i, key in enumerate(keys):
+                        if key not in existing:
+                            existing.add(key)
+                            fresh.append(i)
+                    if not fresh:
+                        return
+
+                    start_row = self._file_rows()
+                    with open(self.path / VECTORS_FILE, "ab") as f:
+                        f.write(vectors[fresh].tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT INTO embeddings (key, row, accessed_at) VALUES (?, ?, ?)",
+                        [(keys[i], start_row + offset, now) for offset, i in enumerate(fresh)],
+                    )
+                    conn.commit()
+                    self.writes += len(fresh)
+
+                    if start_row + len(fresh) > self.max_rows:
+                        self._compact_locked(conn, int(self.max_rows * self.compact_keep_ratio))
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Embedding store write failed: %s", e)
+
+    def compact(self, keep_rows: Optional[int] = None) -> None:
+        """
+        Rewrite the vector file keeping only the most recently used rows.
+        """
+        with self._lock:
+            conn = self._connect()
+            with self._file_lock(exclusive=True):
+                self._compact_locked(conn, keep_rows if keep_rows is not None else self.max_rows)
+
+    def _compact_locked(self, conn: sqlite3.Connection, keep_rows: int) -> None:
+        started = time.perf_counter()
+        kept = conn.execute(
+            "SELECT key, row, accessed_at FROM embeddings ORDER BY accessed_at DESC LIMIT ?", (keep_rows,)
+        ).fetchall()
+        total_rows = self._file_rows()
+        # Keep the surviving rows in file order for sequential reads
+        kept.sort(key=lambda item: item[1])
+
+        tmp_path = self.path / (VECTORS_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            if kept:
+                old = np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(total_rows, self.dim))
+                f.write(np.ascontiguousarray(old[[row for _, row, _ in kept]]).tobytes())
+                del old
+            f.flush()
+            os.fsync(f.fileno())
+
+        with conn:
+            conn.execute("DELETE FROM embeddings")
+            conn.executemany(
+                "INSERT INTO embeddings (key, row, accessed_at) VALUES (?, ?, ?)",
+                [(key, new_row, accessed_at) for new_row, (key, _, accessed_at) in enumerate(kept)],
+            )
+            conn.execute(
+                "UPDATE meta SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE name = 'generation'"
+            )
+            os.replace(tmp_path, self.path / VECTORS_FILE)
+
+        self._mmap = None
+        self.compactions += 1
+        logger.info(
+            "Embedding store compacted from %s to %s rows in %.2fs",
+            total_rows, len(kept), time.perf_counter() - started,
+        )
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and on-disk sizes.
+        """
+        with self._lock:
+            indexed = file_rows = None
+            try:
+                conn = self._connect()
+                indexed = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                file_rows = self._file_rows()
+            except (sqlite3.Error, OSError):
+                pass
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "dim": self.dim,
+                "memory_entries": len(self._memory),
+                "indexed_rows": indexed,
+                "file_rows": file_rows,
+                "file_bytes": file_rows * self.dim * 4 if file_rows is not None else None,
+                "max_rows": self.max_rows,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "compactions": self.compactions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.services.ai_service import extract_skills, match_skill_lists
+from backend.services.cache_service import normalize_text
+from backend.services.matcher_service import encode_texts, get_embedding_store
+
+logger = logging.getLogger(__name__)
+
+
+def make_job_id(job_text: str) -> str:
+    """
+    Content-addressed job ID, so registering the same posting twice is idempotent.
+    """
+    return hashlib.sha256(normalize_text(job_text).encode("utf-8")).hexdigest()[:16]
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index over L2-normalized vectors.
+
+    Vectors are clustered with spherical k-means; a query only scans the
+    members of its `nprobe` closest centroids.
+    """
+
+    def __init__(self, centroids: np.ndarray, lists: list[np.ndarray], size: int):
+        self.centroids = centroids
+        self.lists = lists
+        self.size = size
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: int, iterations: int = 10, sample_size: int = 50_000, seed: int = 0) -> "IVFIndex":
+        started = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = max(1, min(nlist, n))
+
+        sample = vectors[rng.choice(n, size=min(sample_size, n), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        # Assign the full corpus in chunks to bound the temporary score matrix
+        assignment = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 65_536):
+            assignment[start:start + 65_536] = np.argmax(vectors[start:start + 65_536] @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+
+        logger.info("IVF index built over %s vectors with %s lists in %.2fs", n, nlist, time.perf_counter() - started)
+        return cls(centroids.astype(np.float32), lists, n)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        probes = np.argsort(self.centroids @ query)[::-1][:nprobe]
+        return np.concatenate([self.lists[c] for c in probes])
+
+
+class JobIndex:
+    """
+    Corpus of registered job postings for top-k recommendation.
+
+    Postings are persisted in SQLite (text, skills, normalized embedding). Each
+    worker keeps a contiguous float32 matrix of all embeddings in memory and
+    tops it up from SQLite before every search, so postings registered through
+    any worker become searchable everywhere.
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.path = Path(path)
+        self.dim = dim
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._size = 0
+        self._last_rowid = 0
+        self._job_ids: list[str] = []
+        self._titles: list[Optional[str]] = []
+        self._skills: list[list[str]] = []
+        self._ivf: Optional[IVFIndex] = None
+        self._ivf_building = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    job_text TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+            logger.info("Job index opened at %s", self.path)
+        return self._conn
+
+    def _refresh(self) -> None:
+        """
+        Append postings registered since the last refresh to the in-memory matrix.
+        """
+        rows = self._connect().execute(
+            "SELECT rowid, job_id, title, skills, embedding FROM jobs WHERE rowid > ? ORDER BY rowid",
+            (self._last_rowid,),
+        ).fetchall()
+        if not rows:
+            return
+
+        needed = self._size + len(rows)
+        if needed > len(self._matrix):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.empty((max(needed, 2 * len(self._matrix), 1024), self.dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+        for rowid, job_id, title, skills, embedding in rows:
+            self._matrix[self._size] = np.frombuffer(embedding, dtype=np.float32)
+            self._job_ids.append(job_id)
+            self._titles.append(title)
+            self._skills.append(json.loads(skills))
+            self._size += 1
+            self._last_rowid = rowid
+
+        logger.debug("Job index refreshed - %d new postings, %d total", len(rows), self._size)
+
+    def add(self, job_id: str, title: Optional[str], job_text: str, skills: list[str], embedding: np.ndarray) -> bool:
+        """
+        Store a posting. Returns False if it was already registered.
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "INSERT OR IGNORE INTO jobs (job_id, title, job_text, skills, embedding, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, title, job_text, json.dumps(skills), np.asarray(embedding, dtype=np.float32).tobytes(), time.time()),
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT job_id, title, job_text, skills, created_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "title": row[1],
+            "job_text": row[2],
+            "skills": json.loads(row[3]),
+            "created_at": row[4],
+        }
+
+    def size(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._size
+
+    def search(self, query: np.ndarray, k: int) -> list[dict]:
+        """
+        Return the `k` postings with the highest cosine similarity to `query`.
+
+        Brute force is a single matrix-vector product. Above
+        `job_index_ivf_threshold` postings an IVF index narrows the scan; postings
+        added after the index was built are always scanned exactly.
+
+        The lock only covers the refresh and the snapshot of the first `n` rows,
+        which are never written again. Scoring and IVF rebuilds run outside it:
+        one search rebuilds while the others keep using the previous index (or
+        brute force before the first build), and the new index is swapped in
+        when it is done.
+        """
+        with self._lock:
+            self._refresh()
+            n = self._size
+            matrix = self._matrix[:n]
+            ivf = self._ivf
+            use_ivf = n >= settings.job_index_ivf_threshold
+            rebuild = use_ivf and not self._ivf_building and (ivf is None or n > ivf.size * 1.2)
+            if rebuild:
+                self._ivf_building = True
+
+        if n == 0:
+            return []
+
+        if rebuild:
+            built = None
+            try:
+                built = IVFIndex.build(matrix, nlist=int(np.sqrt(n)))
+            finally:
+                with self._lock:
+                    self._ivf_building = False
+                    if built is not None and (self._ivf is None or built.size > self._ivf.size):
+                        self._ivf = built
+            ivf = built
+
+        if use_ivf and ivf is not None:
+            positions = np.concatenate([
+                ivf.candidates(query, settings.job_index_ivf_nprobe),
+                np.arange(ivf.size, n),
+            ])
+            scores = matrix[positions] @ query
+        else:
+            positions = np.arange(n)
+            scores = matrix @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "job_id": self._job_ids[positions[i]],
+                "title": self._titles[positions[i]],
+                "skills": self._skills[positions[i]],
+                "similarity_score": round(float(scores[i]) * 100, 2),
+            }
+            for i in top
+        ]
+
+_job_index: Optional[JobIndex] = None
+
+def get_job_index() -> JobIndex:
+    global _job_index
+    if _job_index is None:
+        _job_index = JobIndex(path=settings.job_index_path, dim=get_embedding_store().dim)
+    return _job_index
+
+async def register_job(job_text: str, title: Optional[str] = None) -> dict:
+    """
+    Extract skills and embed a posting once, then store it in the job index.
+
+    A failed LLM extraction raises SkillExtractionError instead of storing an
+    empty skill list: the job ID is content-addressed, so a stored row is
+    never extracted again.
+    """
+    job_index = get_job_index()
+    job_id = make_job_id(job_text)
+    existing = job_index.get(job_id)
+    if existing is not None:
+        logger.info("Job %s already registered", job_id)
+        return {"job_id": job_id, "title": existing["title"], "skills": existing["skills"], "created": False}
+
+    logger.info("Registering job %s (%s chars)", job_id, len(job_text))
+    embeddings, skills = await asyncio.gather(
+        asyncio.to_thread(encode_texts, [job_text]),
+        extract_skills(job_text, context="job", fallback=False),
+    )
+    created = job_index.add(job_id, title, job_text, skills, embeddings[0])
+    return {"job_id": job_id, "title": title, "skills": skills, "created": created}
+
+async def recommend_jobs(resume_text: str, top_k: int, shortlist_size: int, rerank: bool = True) -> list[dict]:
+    """
+    Find the best matching postings for a resume.
+
+    The corpus is narrowed by embedding similarity; the skill-overlap re-rank
+    then runs only on the shortlist, using one extraction of the resume skills.
+    """
+    logger.info("Searching job index for top %s postings (shortlist: %s)", top_k, shortlist_size)
+
+    query = (await asyncio.to_thread(encode_texts, [resume_text]))[0]
+    shortlist = await asyncio.to_thread(get_job_index().search, query, max(top_k, shortlist_size) if rerank else top_k)
+
+    if rerank and shortlist:
+        resume_skills_raw = await extract_skills(resume_text, context="resume")
+
+        def rerank_shortlist() -> None:
+            for candidate in shortlist:
+                skills_analysis = match_skill_lists(candidate["skills"], resume_skills_raw)
+                candidate.update(
+                    matched_skill_percentage=skills_analysis["matched_skill_percentage"],
+                    matched_skills=skills_analysis["matched_skills"],
+                    missing_skills=skills_analysis["missing_skills"],
+                    overall_score=round((candidate["similarity_score"] + skills_analysis["matched_skill_percentage"]) / 2, 2),
+                )
+
+        # Skill matching can encode skills (semantic matching), so it runs off the event loop
+        await asyncio.to_thread(rerank_shortlist)
+        shortlist.sort(key=lambda c: c["overall_score"], reverse=True)
+    else:
+        for candidate in shortlist:
+            candidate["overall_score"] = candidate["similarity_score"]
+
+    results = shortlist[:top_k]
+    for rank, candidate in enumerate(results, start=1):
+        candidate["rank"] = rank
+
+    logger.info("Job search complete - %s results", len(results))
+    return results
@@ -1,37 +1,151 @@
-from sentence_transformers import SentenceTransformer, util
-from backend.services.ai_service import compare_skills
+from backend.core.config import settings
+from backend.core.metrics import register_cache, stage_timer
+from backend.services.ai_service import compare_skills, document_skill_extractor, extract_skills, match_skill_lists
+from backend.services.chunking import aggregate_chunk_scores, chunk_text, split_sections
+from backend.services.embedding_batcher import get_embedding_batcher
+from backend.services.embedding_model import get_model, model_id
+from backend.services.embedding_store import EmbeddingStore, make_embedding_key
+import asyncio
 import logging
+import numpy as np
+from typing import AsyncIterator, Optional
 
 logger = logging.getLogger(__name__)
 
-logger.info("Laoding sentence-transformer model: all-MinLim-L6-V2")
-model = SentenceTransformer('all-MiniLM-L6-v2')
-logger.info("Sentence-transformer model loaded successfully")
+_embedding_store: Optional[EmbeddingStore] = None
 
-def calculate_job_match(job_text: str, resume_text: str) -> dict:
+def get_embedding_store() -> EmbeddingStore:
+    """
+    Open the embedding store on first use (sized by the model's embedding dimension).
+    """
+    global _embedding_store
+    if _embedding_store is None:
+        _embedding_store = EmbeddingStore(
+            path=settings.embedding_store_path,
+            dim=get_model().get_sentence_embedding_dimension(),
+            memory_size=settings.embedding_cache_memory_size,
+            max_rows=settings.embedding_store_max_rows,
+        )
+        register_cache("embeddings", _embedding_store)
+    return _embedding_store
+
+def current_embedding_store() -> Optional[EmbeddingStore]:
+    """
+    The embedding store if it is open, or None. Never loads the model to open it.
+    """
+    return _embedding_store
+
+def _encode_uncached(texts: list[str]) -> np.ndarray:
+    """
+    Encode through the micro-batcher, which merges concurrent requests into one model call.
+    """
+    with stage_timer("embedding_encode"):
+        if settings.embedding_batching_enabled:
+            return get_embedding_batcher().encode(texts)
+        return get_model().encode(
+            texts,
+            batch_size=settings.batch_encode_size,
+            normalize_embeddings=True,
+        ).astype(np.float32)
+
+def encode_texts(texts: list[str]) -> np.ndarray:
+    """
+    Return L2-normalized float32 embeddings for `texts`, one row per text.
+
+    Cached vectors are reused; only texts not yet in the embedding store are
+    encoded, in a single batched call.
+    """
+    if not settings.embedding_cache_enabled:
+        return _encode_uncached(texts)
+
+    embedding_store = get_embedding_store()
+    keys = [make_embedding_key(text, model_id()) for text in texts]
+    cached = embedding_store.get_many(keys)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+
+    if missing:
+        logger.debug("Encoding %d texts (%d cached)", len(missing), len(texts) - len(missing))
+        vectors = _encode_uncached(list(missing.values()))
+        embedding_store.put_many(list(missing.keys()), vectors)
+        cached.update(zip(missing.keys(), vectors))
+
+    return np.stack([cached[key] for key in keys]) if keys else np.empty((0, embedding_store.dim), dtype=np.float32)
+
+def _document_chunks(text: str) -> list[str]:
+    """
+    Overlapping windows of a document. With incremental matching, windows
+    stay within sections, so an edit only changes the chunks of its own section.
+    """
+    if not settings.incremental_matching or len(text.split()) <= settings.chunk_words:
+        return chunk_text(text, settings.chunk_words, settings.chunk_overlap_words)
+    return [
+        chunk
+        for section in split_sections(text, settings.section_min_words)
+        for chunk in chunk_text(section, settings.chunk_words, settings.chunk_overlap_words)
+    ]
+
+def _chunked_similarities(job_text: str, resume_texts: list[str]) -> np.ndarray:
+    """
+    Score resumes against a job over their full length (0-100 each).
+
+    Every document is split into overlapping windows. All chunks are encoded
+    in one batched call, and each chunk is cached under its own hash. One
+    matrix product then scores every resume chunk against every job chunk,
+    and the scores are aggregated per resume.
+    """
+    job_chunks = _document_chunks(job_text)
+    resume_chunks = [_document_chunks(text) for text in resume_texts]
+    offsets = np.cumsum([0] + [len(chunks) for chunks in resume_chunks[:-1]])
+
+    embeddings = encode_texts(job_chunks + [chunk for chunks in resume_chunks for chunk in chunks])
+    logger.debug("Encoded %d job chunks and %d resume chunks", len(job_chunks), len(embeddings) - len(job_chunks))
+
+    scores = embeddings[len(job_chunks):] @ embeddings[:len(job_chunks)].T
+    return aggregate_chunk_scores(scores, offsets, settings.chunk_aggregation, settings.chunk_top_k) * 100
+
+def precompute_document_embeddings(text: str) -> None:
+    """
+    Encode a document the way the current similarity mode will (whole, or
+    as chunks), so its embeddings are in the embedding store before it is matched.
+    """
+    encode_texts(_document_chunks(text) if settings.similarity_mode == "chunked" else [text])
+
+def _semantic_similarity(job_text: str, resume_text: str) -> float:
+    """
+    Encode both texts in one batch and return their cosine similarity (0-100).
+    """
+    if settings.similarity_mode == "chunked":
+        return float(_chunked_similarities(job_text, [resume_text])[0])
+
+    logger.debug("Encoding job description and resume to embeddings")
+    job_embedding, resume_embedding = encode_texts([job_text, resume_text])
+
+    # Embeddings are L2-normalized, so the dot product is the cosine similarity
+    return float(job_embedding @ resume_embedding) * 100
+
+async def calculate_job_match(job_text: str, resume_text: str, extractor: Optional[str] = None, fallback: bool = True) -> dict:
     """
     Calculate semantic similarity and skills match between job and resume.
+
+    `fallback` is passed to compare_skills; pass False to get
+    SkillExtractionError instead of a match against empty skill lists.
     """
     logger.info("Starting job match calculation")
-    logger.debug(f"Input lengths - Job: {len(job_text)} chars, Resume: {len(resume_text)} chars")
+    logger.debug("Input lengths - Job: %d chars, Resume: %d chars", len(job_text), len(resume_text))
 
     try:
-        # Calculate semantic similarity
-        logger.debug("Encoding job description to embedding")
-        job_embedding = model.encode(job_text, convert_to_tensor=True)
-        
-        logger.debug("Encoding resume to embedding")
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        
-        logger.debug("Calculating cosine similarity")
-        similarity = util.cos_sim(job_embedding, resume_embedding)
-        similarity_score = similarity.item() * 100
-        
-        logger.info(f"Semantic similarity calculated: {round(similarity_score, 2)}%")
+        # Encoding is CPU-bound, so it runs in a worker thread while the
+        # skill extraction calls are awaited on the event loop
+        similarity_score, skills_analysis = await asyncio.gather(
+            asyncio.to_thread(_semantic_similarity, job_text, resume_text),
+            compare_skills(job_text, resume_text, extractor=extractor, fallback=fallback),
+        )
         
-        # Get skills comparison from AI service
-        logger.debug("Starting skills comparison")
-        skills_analysis = compare_skills(job_text, resume_text)
+        logger.info("Semantic similarity calculated: %s%%", round(similarity_score, 2))
         
         result = {
             "similarity_score": round(similarity_score, 2),
@@ -42,19 +156,140 @@ def calculate_job_match(job_text: str, resume_text: str) -> dict:
         }
         
         logger.info(
-            f"Match calculation complete - "
-            f"Semantic: {result['similarity_score']}%, "
-            f"Skills: {result['matched_skill_percentage']}%"
+            "Match calculation complete - Semantic: %s%%, Skills: %s%%",
+            result["similarity_score"], result["matched_skill_percentage"],
         )
         logger.debug(
-            f"Skills breakdown - "
-            f"Matched: {len(result['matched_skills'])}, "
-            f"Missing: {len(result['missing_skills'])}, "
-            f"Extra: {len(result['extra_skills'])}"
+            "Skills breakdown - Matched: %d, Missing: %d, Extra: %d",
+            len(result["matched_skills"]), len(result["missing_skills"]), len(result["extra_skills"]),
         )
         
         return result
         
     except Exception as e:
-        logger.error(f"Error during match calculation: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        logger.exception("Error during match calculation: %s", e)
+        raise
+
+async def stream_job_match(
+    job_text: str,
+    resume_text: str,
+    extractor: Optional[str] = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Run the match pipeline and yield (stage, payload) pairs as each stage finishes.
+
+    Stages: "similarity", "job_skills" and "resume_skills" in completion order,
+    then "result" with the same breakdown calculate_job_match returns. If the
+    consumer stops iterating (e.g. the client disconnected), unfinished stages
+    are cancelled.
+    """
+    logger.info("Starting streaming job match calculation")
+
+    extract = document_skill_extractor()
+    tasks = {
+        asyncio.create_task(asyncio.to_thread(_semantic_similarity, job_text, resume_text)): "similarity",
+        asyncio.create_task(extract(job_text, context="job", extractor=extractor)): "job_skills",
+        asyncio.create_task(extract(resume_text, context="resume", extractor=extractor)): "resume_skills",
+    }
+    results = {}
+
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = tasks[task]
+                results[stage] = task.result()
+                if stage == "similarity":
+                    yield stage, {"similarity_score": round(results[stage], 2)}
+                else:
+                    yield stage, {"skills": sorted(set(s.lower().strip() for s in results[stage]))}
+
+        skills_analysis = await asyncio.to_thread(match_skill_lists, results["job_skills"], results["resume_skills"])
+        result = {"similarity_score": round(results["similarity"], 2), **skills_analysis}
+
+        logger.info(
+            "Streaming match complete - Semantic: %s%%, Skills: %s%%",
+            result["similarity_score"], result["matched_skill_percentage"],
+        )
+        yield "result", result
+
+    finally:
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            logger.info("Streaming match stopped early, cancelled %s stages", len(unfinished))
+
+def _batch_similarities(job_text: str, resume_texts: list[str]) -> np.ndarray:
+    """
+    Encode the job once and all resumes in batches, then score them with one matrix product.
+    """
+    if settings.similarity_mode == "chunked":
+        return _chunked_similarities(job_text, resume_texts)
+
+    embeddings = encode_texts([job_text, *resume_texts])
+    # Embeddings are L2-normalized, so the dot product is the cosine similarity
+    return (embeddings[1:] @ embeddings[0]) * 100
+
+async def calculate_batch_match(
+    job_text: str,
+    resume_texts: list[str],
+    top_k: Optional[int] = None,
+    extractor: Optional[str] = None,
+) -> dict:
+    """
+    Rank many resumes against a single job description.
+
+    The job text is embedded and skill-extracted once. Resume skill extraction
+    fans out with at most `batch_extraction_concurrency` calls in flight.
+    """
+    logger.info("Starting batch match calculation for %s resumes", len(resume_texts))
+
+    semaphore = asyncio.Semaphore(settings.batch_extraction_concurrency)
+
+    async def extract_resume(text: str) -> list[str]:
+        async with semaphore:
+            return await extract_skills(text, context="resume", extractor=extractor)
+
+    try:
+        similarities, job_skills_raw, *resume_skills = await asyncio.gather(
+            asyncio.to_thread(_batch_similarities, job_text, resume_texts),
+            extract_skills(job_text, context="job", extractor=extractor),
+            *(extract_resume(text) for text in resume_texts),
+        )
+
+        def score_resumes() -> list[dict]:
+            results = []
+            for index, (similarity, resume_skills_raw) in enumerate(zip(similarities, resume_skills)):
+                skills_analysis = match_skill_lists(job_skills_raw, resume_skills_raw)
+                similarity_score = round(float(similarity), 2)
+                results.append({
+                    "index": index,
+                    "overall_score": round((similarity_score + skills_analysis["matched_skill_percentage"]) / 2, 2),
+                    "similarity_score": similarity_score,
+                    **skills_analysis,
+                })
+            return results
+
+        # Skill matching can encode skills (semantic matching), so it runs off the event loop
+        results = await asyncio.to_thread(score_resumes)
+        results.sort(key=lambda r: r["overall_score"], reverse=True)
+        if top_k is not None:
+            results = results[:top_k]
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+
+        logger.info(
+            "Batch match complete - %s resumes ranked, best overall: %s%%",
+            len(resume_texts), results[0]["overall_score"] if results else 0,
+        )
+
+        return {
+            "job_skills": sorted(set(s.lower().strip() for s in job_skills_raw)),
+            "results": results,
+        }
+
+    except Exception as e:
+        logger.exception("Error during batch match calculation: %s", e)
+        raise
@@ -1,37 +1,165 @@
 from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import Optional
+from backend.core.config import settings
+from backend.core.metrics import stage_timer
+import asyncio
 import logging
+import multiprocessing
 
 logger = logging.getLogger(__name__)
 
+_executor: Optional[ProcessPoolExecutor] = None
+
 def extract_text_pdf(file_bytes: bytes) -> str:
     logger.info("Starting PDF text Extraction")
 
     try:
-        # Create a file-like object from bytes
-        pdf_file = BytesIO(file_bytes)
+        with stage_timer("pdf_extract"):
+            # Create PDF reader from an in-memory file
+            pdf_reader = PdfReader(BytesIO(file_bytes))
 
-        # Create PDF reader
-        pdf_reader = PdfReader(pdf_file)
+            num_pages = len(pdf_reader.pages)
+            logger.debug("PDF has %d pages", num_pages)
 
-        num_pages = len(pdf_reader.pages)
-        logger.debug(f"PDF has {num_pages} pages")
+            # Extract text
+            pages = []
+            for page_num, page in enumerate(pdf_reader.pages, start=1):
+                page_text = page.extract_text()
+                pages.append(page_text)
+                logger.debug("Extracted text from page %d: %d chars", page_num, len(page_text))
 
-        # Extract text
-        text = ""
-        for page_num, page in enumerate(pdf_reader.pages, start=1):
-            page_text =page.extract_text()
-            text += page_text + "\n"
-            logger.debug(f"Extracted text from page {num_pages}: {len(page_text)} chars")
+            text = "\n".join(pages).strip()
+            total_chars = len(text)
+            logger.info("PDF extraction complete: %s chars from %s pages", total_chars, num_pages)
 
-        total_chars = len(text.strip())
-        logger.info(f"PDF extraction complete: {total_chars} chars from {num_pages} pages")
+            if total_chars < 50:
+                logger.warning("Extracted text is very short, PDF might be image-based or encrypted")
+
+            return text
 
-        if total_chars < 50:
-            logger.warning("Extracted text is very short, PDF might be image-based or encrypted")
-        
-        return text.strip()
-        
     except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}", exc_info=True)
-        raise ValueError(f"Failed to read PDF: {str(e)}")       
+        logger.exception("Error extracting text from PDF: %s", e)
+        raise ValueError(f"Failed to read PDF: {str(e)}")
+
+def _count_pages(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+def _extract_page_range(path: str, start: int, end: int) -> list[str]:
+    """
+    Extract text from pages [start, end). Runs inside a pool worker process.
+    """
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() for i in range(start, end)]
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # The API process already runs threads (batcher, log listener, torch), which fork() would copy
+        # in whatever state they are in; forkserver starts workers from a clean single-threaded process
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.pdf_pool_workers,
+            mp_context=multiprocessing.get_context(start_method),
+        )
+        logger.info("PDF process pool started with %s workers (%s)", settings.pdf_pool_workers, start_method)
+    return _executor
+
+def _discard_executor(executor: ProcessPoolExecutor, reason: str) -> None:
+    """
+    Kill the workers of a pool and stop using it; the next upload starts a
+    fresh pool. Used after a timeout: cancelling the future does not stop a
+    running job, so a slow or hostile PDF would otherwise keep its worker busy
+    for every later upload.
+    """
+    global _executor
+    if _executor is executor:
+        _executor = None
+    # ProcessPoolExecutor has no public way to stop running jobs before Python 3.14
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+    logger.warning("PDF process pool discarded: %s", reason)
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def extract_pdf(path: str) -> dict:
+    """
+    Extract text from a PDF on disk without blocking the event loop.
+
+    Parsing runs in a process pool. Documents with at least
+    `pdf_parallel_min_pages` pages are split into page ranges that are
+    extracted in parallel. Raises ValueError for unreadable PDFs or PDFs over
+    `pdf_max_pages`, and asyncio.TimeoutError after `pdf_extraction_timeout_seconds`.
+    On timeout the pool's workers are killed, so the job does not keep running.
+
+    Returns:
+        {"text": str, "page_count": int}
+    """
+    logger.info("Starting PDF text Extraction")
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+
+    async def run(executor: ProcessPoolExecutor) -> dict:
+        try:
+            num_pages = await loop.run_in_executor(executor, _count_pages, path)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.exception("Error reading PDF: %s", e)
+            raise ValueError(f"Failed to read PDF: {str(e)}")
+
+        logger.debug("PDF has %d pages", num_pages)
+        if num_pages > settings.pdf_max_pages:
+            raise ValueError(f"PDF has {num_pages} pages, the limit is {settings.pdf_max_pages}")
+
+        if num_pages >= settings.pdf_parallel_min_pages:
+            chunk = -(-num_pages // settings.pdf_pool_workers)
+            ranges = [(start, min(start + chunk, num_pages)) for start in range(0, num_pages, chunk)]
+        else:
+            ranges = [(0, num_pages)]
+
+        try:
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(executor, _extract_page_range, path, start, end)
+                for start, end in ranges
+            ))
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.exception("Error extracting text from PDF: %s", e)
+            raise ValueError(f"Failed to read PDF: {str(e)}")
+
+        text = "\n".join(page for pages in chunks for page in pages).strip()
+        logger.info("PDF extraction complete: %s chars from %s pages in %s parts", len(text), num_pages, len(ranges))
+
+        if len(text) < 50:
+            logger.warning("Extracted text is very short, PDF might be image-based or encrypted")
+
+        return {"text": text, "page_count": num_pages}
+
+    async def run_on_live_pool() -> dict:
+        nonlocal executor
+        try:
+            return await run(executor)
+        except BrokenProcessPool:
+            # Another upload timed out and killed the pool under this one; retry once on a fresh pool
+            _discard_executor(executor, "a worker died, retrying on a new pool")
+            executor = _get_executor()
+            try:
+                return await run(executor)
+            except BrokenProcessPool as e:
+                raise ValueError(f"Failed to read PDF: {str(e)}")
+
+    try:
+        with stage_timer("pdf_extract"):
+            return await asyncio.wait_for(run_on_live_pool(), timeout=settings.pdf_extraction_timeout_seconds)
+    except asyncio.TimeoutError:
+        _discard_executor(executor, f"extraction timed out after {settings.pdf_extraction_timeout_seconds}s")
+        raise
@@ -0,0 +1,181 @@
+"""
+Building blocks for calling a slow or flaky upstream (the OpenAI API):
+request coalescing, a concurrency limit with a bounded queue, a circuit
+breaker and jittered exponential backoff.
+
+All of them are per-process and per-event-loop, like the pooled client.
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    The upstream cannot take this call right now. Carries the HTTP status and
+    Retry-After hint the API should answer with.
+    """
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OverloadedError(UpstreamUnavailableError):
+    """Too many calls are already waiting; the caller should back off."""
+    status_code = 429
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """The circuit breaker is open after repeated upstream failures."""
+
+
+class SingleFlight:
+    """
+    Merge concurrent calls with the same key into one.
+
+    The first caller starts the call as a task; later callers with the same
+    key await that task until it finishes. The task is shielded, so one
+    caller being cancelled (e.g. a client disconnect) does not cancel it for
+    the others.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable]) -> tuple[object, bool]:
+        """
+        Returns (result, shared), where `shared` is True if another caller's call was reused.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` calls run at once. Up to `max_queue` more wait for a slot,
+    each for at most `queue_timeout` seconds. Beyond that, calls are shed
+    instead of piling up: a full queue raises OverloadedError (429), a queue
+    wait that times out raises UpstreamUnavailableError (503).
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.running = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                raise OverloadedError(f"{self.waiting} calls already queued for the upstream")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise UpstreamUnavailableError(
+                    f"No upstream slot free within {self.queue_timeout}s", retry_after=self.queue_timeout
+                )
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. After `reset_timeout` seconds one trial
+    call is let through (half-open): success closes the circuit, failure
+    opens it again. A trial that ends with neither (shed by the limiter or
+    cancelled) must be handed back with end_trial(), so the next call can be
+    the trial.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, name: str = "upstream"):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError if the call may not go through. Returns True if
+        this call is the half-open trial.
+        """
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            logger.info("Circuit for %s half-open, sending a trial call", self.name)
+            return True
+        retry_after = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)) if state == "open" else 1.0
+        raise CircuitOpenError(f"Circuit for {self.name} is open", retry_after=max(1.0, retry_after))
+
+    def end_trial(self) -> None:
+        """
+        Called by the trial call when it finishes, however it finishes. A no-op
+        if record_success or record_failure already settled the trial.
+        """
+        if self._trial_in_flight:
+            self._trial_in_flight = False
+            logger.info("Circuit for %s trial call ended without a result, the next call retries it", self.name)
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Circuit for %s closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_in_flight:
+                logger.warning("Circuit for %s opened after %s consecutive failures", self.name, self.failures)
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
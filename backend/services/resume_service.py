@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from backend.core.config import settings
+from backend.core.metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+
+def make_resume_id(pdf_sha256) -> str:
+    """
+    Resume handle from a hashlib.sha256 object fed with the uploaded PDF
+    bytes, so the same file always gets the same ID.
+    """
+    return pdf_sha256.hexdigest()[:32]
+
+
+class ResumeStore:
+    """
+    Uploaded resumes by ID: extracted text and page count, in SQLite shared by
+    all workers.
+
+    Entries expire `ttl_seconds` after they were last used (uploaded again or
+    matched), and the least recently used rows above `max_entries` are
+    evicted. Embeddings and skills are not stored here. They live in the
+    embedding store and skill cache, keyed by the text, so a resume_id
+    reaches them through its text.
+    """
+
+    # Disk only; the attribute keeps the cache metrics uniform
+    memory_hits = 0
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_trim = 0
+
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS resumes (
+                    resume_id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_accessed ON resumes(accessed_at)")
+            conn.commit()
+            self._conn = conn
+            logger.info("Resume store opened at %s", self.path)
+        return self._conn
+
+    def get(self, resume_id: str) -> Optional[dict]:
+        """
+        Look up a resume and refresh its expiry. Returns None if unknown or expired.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT text, page_count, accessed_at FROM resumes WHERE resume_id = ?", (resume_id,)
+                ).fetchone()
+                if row is not None and now - row[2] < self.ttl_seconds:
+                    conn.execute("UPDATE resumes SET accessed_at = ? WHERE resume_id = ?", (now, resume_id))
+                    conn.commit()
+                    self.disk_hits += 1
+                    return {"resume_id": resume_id, "text": row[0], "page_count": row[1]}
+                if row is not None:
+                    conn.execute("DELETE FROM resumes WHERE resume_id = ?", (resume_id,))
+                    conn.commit()
+                    self.evictions += 1
+            except sqlite3.Error as e:
+                logger.warning("Resume store read failed, treating as miss: %s", e)
+
+            self.misses += 1
+            return None
+
+    def put(self, resume_id: str, text: str, page_count: int) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO resumes (resume_id, text, page_count, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (resume_id, text, page_count, now, now),
+                )
+                conn.commit()
+                self.writes += 1
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim(conn, now)
+            except sqlite3.Error as e:
+                logger.warning("Resume store write failed: %s", e)
+
+    def _trim(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Drop expired rows, then the least recently used rows above `max_entries`.
+        """
+        self._writes_since_trim = 0
+        expired = conn.execute(
+            "DELETE FROM resumes WHERE accessed_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = conn.execute(
+            """DELETE FROM resumes WHERE resume_id IN (
+                SELECT resume_id FROM resumes ORDER BY accessed_at ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM resumes) - ?)
+            )""",
+            (self.max_entries,),
+        ).rowcount
+        conn.commit()
+        if expired or overflow:
+            self.evictions += expired + overflow
+            logger.info("Resume store trimmed - Expired: %s, Over capacity: %s", expired, overflow)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = None
+            try:
+                entries = self._connect().execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+            except sqlite3.Error:
+                pass
+            lookups = self.disk_hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round(self.disk_hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+resume_store = ResumeStore(
+    path=settings.resume_store_path,
+    ttl_seconds=settings.resume_ttl_seconds,
+    max_entries=settings.resume_store_max_entries,
+)
+register_cache("resumes", resume_store)
+
+# Keep references to background precompute tasks so they are not garbage collected mid-run
+_prepare_tasks: set[asyncio.Task] = set()
+
+
+def prepare_resume(text: str) -> None:
+    """
+    Embed the resume and extract its skills in the background, so the first
+    match by resume_id already hits the embedding store and skill cache.
+    """
+    async def run():
+        # Imported lazily: the matcher service is heavy and only needed once a resume is uploaded
+        from backend.services.ai_service import document_skill_extractor
+        from backend.services.matcher_service import precompute_document_embeddings
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(precompute_document_embeddings, text),
+                document_skill_extractor()(text, context="resume"),
+            )
+            logger.info("Resume precomputed in %.2fs", time.perf_counter() - started)
+        except Exception as e:
+            logger.warning("Resume precompute failed, the first match will do it: %s", e)
+
+    task = asyncio.create_task(run())
+    _prepare_tasks.add(task)
+    task.add_done_callback(_prepare_tasks.discard)
+
+
+async def cancel_prepare_tasks() -> None:
+    """
+    Cancel running precomputes and wait for them, so shutdown never closes the OpenAI client under one.
+    """
+    tasks = list(_prepare_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if tasks:
+        logger.info("Cancelled %s resume precomputes", len(tasks))
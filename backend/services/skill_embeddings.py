@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.services.embedding_model import model_id
+from backend.services.taxonomy import get_skill_graph
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(texts: list[str]) -> np.ndarray:
+    # Imported lazily: the matcher service imports the AI service, which imports this module
+    from backend.services.matcher_service import encode_texts
+
+    return encode_texts(texts)
+
+
+class SkillEmbeddingTable:
+    """
+    Normalized float32 embeddings of every taxonomy term (canonical names,
+    aliases and related terms), one row per term.
+
+    The matrix is computed once per model and taxonomy and saved as .npy next
+    to a JSON list of its terms. Later processes memory-map it, so workers
+    share one copy through the page cache. Skills outside the taxonomy are
+    encoded in one batched call and memoized in the embedding store.
+    """
+
+    def __init__(self, terms: list[str], matrix: np.ndarray, encode: Callable[[list[str]], np.ndarray]):
+        self.terms = terms
+        self.matrix = matrix
+        self.index = {term: i for i, term in enumerate(terms)}
+        self.encode = encode
+
+    @classmethod
+    def load_or_build(cls, directory: str, terms: list[str], model_name: str, encode: Callable[[list[str]], np.ndarray]) -> "SkillEmbeddingTable":
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        for term in terms:
+            digest.update(b"\x00")
+            digest.update(term.encode("utf-8"))
+        base = Path(directory) / f"skills-{digest.hexdigest()[:16]}"
+        matrix_path, terms_path = base.with_suffix(".npy"), base.with_suffix(".json")
+
+        if matrix_path.exists() and terms_path.exists():
+            matrix = np.load(matrix_path, mmap_mode="r")
+            logger.info("Skill embedding table loaded from %s - %s terms", matrix_path, matrix.shape[0])
+            return cls(terms, matrix, encode)
+
+        started = time.perf_counter()
+        matrix = np.ascontiguousarray(encode(terms), dtype=np.float32)
+        matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under temporary names and rename, so concurrent workers never read a partial file
+        suffix = f".{os.getpid()}.tmp"
+        with open(str(matrix_path) + suffix, "wb") as f:
+            np.save(f, matrix)
+        with open(str(terms_path) + suffix, "w", encoding="utf-8") as f:
+            json.dump({"model": model_name, "terms": terms}, f)
+        os.replace(str(terms_path) + suffix, terms_path)
+        os.replace(str(matrix_path) + suffix, matrix_path)
+        logger.info(
+            "Skill embedding table built in %.2fs - %s terms, saved to %s",
+            time.perf_counter() - started, len(terms), matrix_path,
+        )
+        return cls(terms, matrix, encode)
+
+    def embed(self, skills: list[str]) -> np.ndarray:
+        """
+        One row per skill: taxonomy terms come from the table, the rest from a single batched encode.
+        """
+        rows = np.empty((len(skills), self.matrix.shape[1]), dtype=np.float32)
+        unseen = []
+        for i, skill in enumerate(skills):
+            row = self.index.get(skill)
+            if row is None:
+                unseen.append(i)
+            else:
+                rows[i] = self.matrix[row]
+        if unseen:
+            rows[unseen] = self.encode([skills[i] for i in unseen])
+        logger.debug("Embedded %d skills (%d outside the taxonomy)", len(skills), len(unseen))
+        return rows
+
+
+_table: Optional[SkillEmbeddingTable] = None
+_table_lock = threading.Lock()
+
+def get_skill_embedding_table() -> SkillEmbeddingTable:
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = SkillEmbeddingTable.load_or_build(
+                    settings.skill_embeddings_path,
+                    sorted(get_skill_graph().term_class),
+                    model_id(),
+                    _encode,
+                )
+    return _table
+
+def semantic_match_skills(job_skills: list[str], resume_skills: list[str], threshold: float) -> set[str]:
+    """
+    Job skills whose closest resume skill has cosine similarity >= `threshold`.
+
+    Both lists are embedded together (mostly table lookups, at most one
+    encode call), then scored with a single job x resume matrix product.
+    """
+    if not job_skills or not resume_skills:
+        return set()
+
+    vectors = get_skill_embedding_table().embed(job_skills + resume_skills)
+    scores = vectors[:len(job_skills)] @ vectors[len(job_skills):].T
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(job_skills)), best]
+
+    matched = set()
+    for i in np.flatnonzero(best_scores >= threshold):
+        matched.add(job_skills[i])
+        logger.debug("Semantic match: '%s' ~ '%s' (cosine: %.2f)", job_skills[i], resume_skills[best[i]], best_scores[i])
+    return matched
@@ -0,0 +1,114 @@
+import logging
+import re
+from typing import Optional
+
+from backend.core.config import settings
+from backend.services.taxonomy import load_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Words keep trailing "+"/"#" (c++, c#); any other symbol is its own token so
+# "CI/CD" and "Node.js" line up with their taxonomy entries
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*|[^\sa-z0-9]")
+
+# Trie key marking the end of a term; its value is (canonical skill name, ambiguous)
+TERMINAL = ""
+
+# A word after one of these starts a sentence, so its capital letter means nothing
+SENTENCE_END = ".!?"
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _reads_as_name(text: str, start: int) -> bool:
+    """
+    True if the word at `start` is capitalized and does not start a sentence.
+    """
+    if not text[start].isupper():
+        return False
+    i = start - 1
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i >= 0 and text[i] not in SENTENCE_END
+
+
+class LocalSkillExtractor:
+    """
+    Dictionary-based skill extractor that runs in-process, without an LLM.
+
+    Every canonical name and alias in the taxonomy is compiled into a
+    token-level trie. Extraction walks the trie from every token position and
+    records each term it passes, so cost is linear in the text length (times
+    the longest term) and independent of the taxonomy size. "GitLab CI/CD"
+    yields "gitlab ci/cd", "gitlab" and "ci/cd", mirroring how the LLM prompt
+    extracts components.
+
+    Canonical names marked `ambiguous` in the taxonomy are also English words
+    ("react", "excel"); on their own they only count when written as a name,
+    capitalized and not at the start of a sentence.
+    """
+
+    def __init__(self, entries: list[dict]):
+        self.trie: dict = {}
+        self.canonical_names: set[str] = set()
+        self.max_term_tokens = 0
+
+        for entry in entries:
+            name = entry["name"].lower().strip()
+            self.canonical_names.add(name)
+            self._insert(name, name, ambiguous=entry.get("ambiguous", False))
+            for alias in entry.get("aliases", []):
+                self._insert(alias, name)
+
+        logger.info(
+            "Local skill extractor compiled - %s skills, longest term %s tokens",
+            len(self.canonical_names), self.max_term_tokens,
+        )
+
+    def _insert(self, term: str, name: str, ambiguous: bool = False) -> None:
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # An alias spelled like an ambiguous name is unambiguous
+        if TERMINAL not in node or not ambiguous:
+            node[TERMINAL] = (name, ambiguous)
+        self.max_term_tokens = max(self.max_term_tokens, len(tokens))
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Return the canonical names of all taxonomy skills mentioned in `text`.
+        """
+        lowered = text.lower()
+        matches = list(TOKEN_PATTERN.finditer(lowered))
+        tokens = [match.group() for match in matches]
+        # Offsets into the lowered text only map onto the original if lowering kept the length
+        can_check_case = len(lowered) == len(text)
+        found = set()
+        for i in range(len(tokens)):
+            node = self.trie
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if TERMINAL in node:
+                    name, ambiguous = node[TERMINAL]
+                    if not ambiguous or (can_check_case and _reads_as_name(text, matches[i].start())):
+                        found.add(name)
+        return sorted(found)
+
+
+_extractor: Optional[LocalSkillExtractor] = None
+
+def get_local_extractor() -> LocalSkillExtractor:
+    """
+    Compile the taxonomy on first use and reuse it afterwards.
+    """
+    global _extractor
+    if _extractor is None:
+        _extractor = LocalSkillExtractor(load_taxonomy(settings.skill_taxonomy_path)["skills"])
+    return _extractor
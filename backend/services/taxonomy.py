@@ -0,0 +1,157 @@
+import json
+import logging
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import yaml
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path: str) -> dict:
+    """
+    Load the skill taxonomy data file (YAML or JSON, chosen by extension).
+    """
+    with open(path, encoding="utf-8") as f:
+        if Path(path).suffix == ".json":
+            data = json.load(f)
+        else:
+            data = yaml.safe_load(f)
+    return {"skills": data.get("skills", []), "related": data.get("related", {})}
+
+
+class SkillGraph:
+    """
+    Compiled skill synonym graph.
+
+    Terms are grouped into equivalence classes with union-find: a canonical
+    name and its aliases form one class, as do two terms that list each other
+    as related. Remaining one-way "related" edges become "implies" edges
+    between classes. Every class gets its transitive closure precomputed as an
+    integer bitset over class IDs, so expanding a skill or checking whether a
+    matched term covers it is a dict lookup plus bitwise operations.
+    """
+
+    def __init__(self, entries: list[dict], related: dict[str, list[str]]):
+        started = time.perf_counter()
+
+        term_ids: dict[str, int] = {}
+        parent: list[int] = []
+
+        def intern(term: str) -> int:
+            term = term.lower().strip()
+            if term not in term_ids:
+                term_ids[term] = len(parent)
+                parent.append(len(parent))
+            return term_ids[term]
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(a: int, b: int) -> None:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        for entry in entries:
+            name_id = intern(entry["name"])
+            for alias in entry.get("aliases", []):
+                union(name_id, intern(alias))
+
+        edges = {(intern(source), intern(target)) for source, targets in related.items() for target in targets}
+        for source, target in edges:
+            if (target, source) in edges:
+                union(source, target)
+
+        # Number the equivalence classes densely
+        class_of_root: dict[int, int] = {}
+        self.term_class: dict[str, int] = {}
+        for term, term_id in term_ids.items():
+            root = find(term_id)
+            self.term_class[term] = class_of_root.setdefault(root, len(class_of_root))
+
+        self.class_terms: list[list[str]] = [[] for _ in class_of_root]
+        for term, class_id in self.term_class.items():
+            self.class_terms[class_id].append(term)
+
+        implies: list[set[int]] = [set() for _ in class_of_root]
+        for source, target in edges:
+            source_class = class_of_root[find(source)]
+            target_class = class_of_root[find(target)]
+            if source_class != target_class:
+                implies[source_class].add(target_class)
+
+        self.closures: list[int] = [self._closure(class_id, implies) for class_id in range(len(implies))]
+
+        logger.info(
+            "Skill graph compiled in %.1fms - %s terms, %s classes, %s implies edges",
+            (time.perf_counter() - started) * 1000, len(self.term_class), len(self.class_terms),
+            sum(len(targets) for targets in implies),
+        )
+
+    @staticmethod
+    def _closure(start: int, implies: list[set[int]]) -> int:
+        bits = 1 << start
+        stack = [start]
+        while stack:
+            for target in implies[stack.pop()]:
+                if not bits >> target & 1:
+                    bits |= 1 << target
+                    stack.append(target)
+        return bits
+
+    def closure_bits(self, skill: str) -> int:
+        """
+        Bitset of every class `skill` covers, or 0 for unknown skills.
+        """
+        class_id = self.term_class.get(skill.lower().strip())
+        return 0 if class_id is None else self.closures[class_id]
+
+    def class_bits(self, terms: Iterable[str]) -> int:
+        """
+        Bitset of the classes the given terms belong to.
+        """
+        bits = 0
+        for term in terms:
+            class_id = self.term_class.get(term)
+            if class_id is not None:
+                bits |= 1 << class_id
+        return bits
+
+    def terms(self, bits: int) -> set[str]:
+        """
+        All terms in the classes set in `bits`.
+        """
+        terms = set()
+        while bits:
+            low = bits & -bits
+            terms.update(self.class_terms[low.bit_length() - 1])
+            bits ^= low
+        return terms
+
+    def expand(self, skills: Iterable[str]) -> set[str]:
+        """
+        The skills plus every term their classes transitively imply.
+        """
+        skills = list(skills)
+        bits = 0
+        for skill in skills:
+            bits |= self.closure_bits(skill)
+        return set(skills) | self.terms(bits)
+
+
+@lru_cache(maxsize=None)
+def get_skill_graph() -> SkillGraph:
+    """
+    Compile the synonym graph from the taxonomy file once per process.
+    """
+    taxonomy = load_taxonomy(settings.skill_taxonomy_path)
+    return SkillGraph(taxonomy["skills"], taxonomy["related"])
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from backend.services import bulk_service
+from backend.services.bulk_service import BulkJobStore, BulkRunner, owner_is_dead
+
+PAIRS = [{"id": str(i), "job_text": f"job {i}", "resume_text": f"resume {i}"} for i in range(3)]
+
+
+@pytest.fixture
+def store(tmp_path) -> BulkJobStore:
+    store = BulkJobStore(path=str(tmp_path / "bulk.sqlite3"), stale_seconds=60)
+    assert store.create("job", None, PAIRS)
+    return store
+
+
+def age_heartbeat(store: BulkJobStore, seconds: float) -> None:
+    with store._lock:
+        conn = store._connect()
+        conn.execute("UPDATE bulk_jobs SET heartbeat_at = heartbeat_at - ?", (seconds,))
+        conn.commit()
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_claim_is_exclusive_until_the_lease_expires(store):
+    assert store.claim("job", "a")
+    assert not store.claim("job", "b")
+    # The owner may claim again, e.g. after a restart of its own poll loop
+    assert store.claim("job", "a")
+    assert store.claimable(10) == []
+
+    age_heartbeat(store, 61)
+    assert store.claimable(10) == ["job"]
+    assert store.claim("job", "b")
+    assert store.get("job")["owner"] == "b"
+
+
+def test_heartbeat_keeps_the_lease(store):
+    store.claim("job", "a")
+    age_heartbeat(store, 61)
+    store.heartbeat(["job"], "a")
+    assert not store.claim("job", "b")
+
+
+def test_released_job_is_claimable_at_once(store):
+    store.claim("job", "a")
+    store.release("job", "a")
+    assert store.get("job")["state"] == "queued"
+    assert store.claim("job", "b")
+
+
+def test_resume_after_crash_runs_only_pending_pairs(store, monkeypatch):
+    store.claim("job", "crashed")
+    store.record("job", 0, {"index": 0, "status": "done"}, failed=False)
+    age_heartbeat(store, 61)
+
+    matched = []
+
+    async def fake_match(job_text, resume_text, extractor=None, fallback=True):
+        matched.append(job_text)
+        return {field: [] if field.endswith("skills") else 50.0 for field in bulk_service.RESULT_FIELDS}
+
+    monkeypatch.setattr(bulk_service, "calculate_job_match", fake_match)
+
+    async def resume():
+        runner = BulkRunner(store, concurrency=2, max_jobs=1, poll_seconds=1.0)
+        assert store.claim("job", runner.owner)
+        await runner.run_job("job")
+
+    asyncio.run(resume())
+
+    assert sorted(matched) == ["job 1", "job 2"]
+    job = store.get("job")
+    assert (job["state"], job["done"], job["pending"]) == ("completed", 3, 0)
+    assert [json.loads(line)["index"] for line in store.results("job")] == [0, 1, 2]
+
+
+def test_dead_local_owner_can_be_taken_over(store):
+    dead_owner = f"{socket.gethostname()}:{dead_pid()}"
+    store.claim("job", dead_owner)
+
+    assert owner_is_dead(dead_owner)
+    assert not owner_is_dead(f"{socket.gethostname()}:{os.getpid()}")
+    assert not owner_is_dead(f"some-other-host:{dead_pid()}")
+
+    assert not store.take_over("job", "someone-else", "cli")
+    assert store.take_over("job", dead_owner, "cli")
+    assert store.get("job")["owner"] == "cli"
@@ -0,0 +1,30 @@
+import asyncio
+
+from backend.services.cache_service import SkillCache
+
+
+def make_cache(tmp_path, **overrides) -> SkillCache:
+    options = {"memory_size": 2, "max_entries": 100, "ttl_seconds": 3600, **overrides}
+    return SkillCache(path=str(tmp_path / "skills.sqlite3"), **options)
+
+
+def test_async_access_goes_through_both_tiers(tmp_path):
+    cache = make_cache(tmp_path)
+
+    async def run():
+        await cache.set_async("a", ["python"])
+        memory_hit = await cache.get_async("a")
+        cache._memory.clear()
+        disk_hit = await cache.get_async("a")
+        miss = await cache.get_async("b")
+        return memory_hit, disk_hit, miss
+
+    assert asyncio.run(run()) == (["python"], ["python"], None)
+    assert (cache.memory_hits, cache.disk_hits, cache.misses) == (1, 1, 1)
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=0)
+    cache.set("a", ["python"])
+    assert asyncio.run(cache.get_async("a")) is None
+    assert cache.evictions == 1
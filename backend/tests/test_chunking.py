@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from backend.services.chunking import aggregate_chunk_scores, chunk_text
+
+
+def test_windows_cover_every_word():
+    words = [str(i) for i in range(300)]
+    chunks = chunk_text(" ".join(words), size=128, overlap=32)
+    covered = {word for chunk in chunks for word in chunk.split()}
+    assert covered == set(words)
+    assert chunks[-1].split()[-1] == words[-1]
+
+
+@pytest.mark.parametrize("overlap", [5, 9, 40])
+def test_overlap_not_below_size_still_yields_a_window(overlap):
+    text = " ".join(str(i) for i in range(20))
+    assert chunk_text(text, size=5, overlap=overlap)
+
+
+def test_aggregations_per_resume():
+    # Two resumes against two job chunks: rows 0-1 are resume 0, row 2 is resume 1
+    scores = np.array([[0.2, 0.9], [0.6, 0.1], [0.4, 0.4]], dtype=np.float32)
+    offsets = np.array([0, 2])
+    np.testing.assert_allclose(aggregate_chunk_scores(scores, offsets, "max"), [0.9, 0.4])
+    np.testing.assert_allclose(aggregate_chunk_scores(scores, offsets, "mean_of_max"), [0.75, 0.4])
+    np.testing.assert_allclose(aggregate_chunk_scores(scores, offsets, "top_k", k=2), [0.75, 0.4])
@@ -0,0 +1,45 @@
+from backend.services.compaction import _units, compact_text
+
+
+def test_year_lines_are_kept_and_page_numbers_dropped():
+    text = "Founded the team in\n2021\n\nPage 2 of 3\n\n3\n\n2/3\n\nShipped it."
+    assert _units(text) == ["Founded the team in 2021", "Shipped it."]
+
+
+def test_repeated_bullets_are_kept():
+    text = "Experience\n- Fixed production bugs\n- Wrote Python services\n- Fixed production bugs"
+    assert _units(text) == ["Experience", "Fixed production bugs", "Wrote Python services", "Fixed production bugs"]
+
+
+def test_running_headers_and_footers_are_kept_once():
+    page = "Jane Doe - Resume\n{body}\nConfidential"
+    text = "\n1\n".join(page.format(body=body) for body in ("Built APIs in Go.", "Ran Kafka clusters.", "Led a team."))
+    assert _units(text) == [
+        "Jane Doe - Resume Built APIs in Go.",
+        "Confidential Ran Kafka clusters.",
+        "Led a team.",
+    ]
+
+
+def test_form_feed_is_a_page_break():
+    text = "Jane Doe\n\nUsed Docker daily.\fJane Doe\n\nUsed Terraform daily."
+    assert _units(text) == ["Jane Doe", "Used Docker daily.", "Used Terraform daily."]
+
+
+def test_repeats_away_from_page_edges_are_kept():
+    body = "\n\n".join(["Intro line.", "Second line.", "Kept twice.", "Fourth line.", "Fifth line."])
+    text = f"{body}\n\nPage 1\n\n{body}"
+    assert _units(text).count("Kept twice.") == 2
+
+
+def test_contact_lines_and_hyphenation():
+    text = "jane@example.com | +1 555 123 4567\nDesigned micro-\nservices on AWS."
+    assert _units(text) == ["Designed microservices on AWS."]
+
+
+def test_budget_keeps_the_most_skilled_sentences_in_order():
+    text = "I like hiking. Built Kafka and Docker pipelines on AWS. We had a nice office. Wrote Python and SQL daily."
+    result = compact_text(text, max_tokens=20)
+    assert result["text"] == "Built Kafka and Docker pipelines on AWS.\nWrote Python and SQL daily."
+    assert result["tokens_after"] <= 20
+    assert result["units_dropped"] == 2
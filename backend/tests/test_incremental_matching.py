@@ -0,0 +1,116 @@
+import asyncio
+import json
+import re
+
+import numpy as np
+import pytest
+
+from backend.services import ai_service, matcher_service
+from backend.services.cache_service import SkillCache
+from backend.services.chunking import chunk_text, split_sections
+from backend.services.embedding_store import EmbeddingStore
+from backend.services.resilience import CircuitBreaker
+from backend.services.skill_extractor import get_local_extractor
+from backend.tests.test_structured_extraction import make_response
+
+# PDF text layers keep line breaks but rarely blank lines
+RESUME = """Jane Doe
+SUMMARY
+Backend engineer who builds Python services and data pipelines for payment companies.
+EXPERIENCE
+Acme Corp, Senior Engineer. Built FastAPI microservices on AWS and moved batch jobs to Kafka.
+Ran PostgreSQL and Redis in production and wrote the on-call runbooks.
+Skills:
+Python, Docker, Kubernetes, Terraform, GitHub Actions and pytest for every service we shipped."""
+
+EDITED = RESUME.replace("Ran PostgreSQL and Redis", "Ran MongoDB and Redis")
+
+SECTION_PATTERN = re.compile(r"SECTION (\d+):\n<<<\n(.*?)\n>>>", re.DOTALL)
+
+
+class SectionClient:
+    """Stands in for AsyncOpenAI; answers section prompts with local-extractor skills."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.responses = self
+
+    async def create(self, **kwargs):
+        sections = SECTION_PATTERN.findall(kwargs["input"])
+        self.calls.append([text for _, text in sections])
+        payload = {"sections": [
+            {"section": int(number), "skills": [{"skill": s, "canonical": s} for s in get_local_extractor().extract(text)]}
+            for number, text in sections
+        ]}
+        return make_response(json.dumps(payload))
+
+
+@pytest.fixture
+def incremental(monkeypatch, tmp_path):
+    monkeypatch.setattr(ai_service.settings, "incremental_matching", True)
+    monkeypatch.setattr(ai_service.settings, "section_min_words", 8)
+    monkeypatch.setattr(ai_service.settings, "skill_cache_enabled", True)
+    monkeypatch.setattr(ai_service.settings, "llm_input_compaction", False)
+    monkeypatch.setattr(ai_service.settings, "openai_max_retries", 0)
+    monkeypatch.setattr(ai_service, "_limiter", None)
+    monkeypatch.setattr(ai_service, "_breaker", CircuitBreaker(failure_threshold=5, reset_timeout=30.0))
+    cache = SkillCache(path=str(tmp_path / "skills.sqlite3"), memory_size=100, max_entries=1000, ttl_seconds=3600)
+    monkeypatch.setattr(ai_service, "skill_cache", cache)
+    client = SectionClient()
+    monkeypatch.setattr(ai_service, "get_client", lambda: client)
+    return client
+
+
+def test_headings_split_pdf_text_without_blank_lines():
+    sections = split_sections(RESUME, min_words=8)
+    assert [section.split("\n")[0] for section in sections] == ["Jane Doe", "EXPERIENCE", "Skills:"]
+    assert "AWS" not in [line for section in sections for line in section.split("\n")]
+
+
+def test_first_extraction_is_one_call_per_document(incremental):
+    skills = asyncio.run(ai_service.extract_skills_by_section(RESUME, context="resume", extractor="llm"))
+
+    assert len(incremental.calls) == 1
+    assert len(incremental.calls[0]) == len(split_sections(RESUME, 8)) > 1
+    assert {"fastapi", "kafka", "postgresql", "kubernetes"} <= set(skills)
+
+
+def test_edit_re_extracts_only_the_changed_section(incremental):
+    asyncio.run(ai_service.extract_skills_by_section(RESUME, context="resume", extractor="llm"))
+    skills = asyncio.run(ai_service.extract_skills_by_section(EDITED, context="resume", extractor="llm"))
+
+    assert len(incremental.calls) == 2
+    assert len(incremental.calls[1]) == 1
+    assert "MongoDB" in incremental.calls[1][0]
+    assert "mongodb" in skills and "postgresql" not in skills
+
+    asyncio.run(ai_service.extract_skills_by_section(EDITED, context="resume", extractor="llm"))
+    assert len(incremental.calls) == 2
+
+
+def test_edit_re_embeds_only_the_changed_section(monkeypatch, tmp_path):
+    monkeypatch.setattr(matcher_service.settings, "incremental_matching", True)
+    monkeypatch.setattr(matcher_service.settings, "section_min_words", 8)
+    monkeypatch.setattr(matcher_service.settings, "similarity_mode", "chunked")
+    monkeypatch.setattr(matcher_service.settings, "chunk_words", 12)
+    monkeypatch.setattr(matcher_service.settings, "chunk_overlap_words", 4)
+    monkeypatch.setattr(matcher_service.settings, "embedding_cache_enabled", True)
+    store = EmbeddingStore(path=str(tmp_path / "embeddings"), dim=8, memory_size=100, max_rows=1000)
+    monkeypatch.setattr(matcher_service, "_embedding_store", store)
+
+    encoded: list[list[str]] = []
+
+    def fake_encode(texts: list[str]) -> np.ndarray:
+        encoded.append(texts)
+        vectors = np.random.default_rng(0).normal(size=(len(texts), 8)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    monkeypatch.setattr(matcher_service, "_encode_uncached", fake_encode)
+
+    matcher_service.precompute_document_embeddings(RESUME)
+    matcher_service.precompute_document_embeddings(EDITED)
+
+    changed_section = split_sections(EDITED, 8)[1]
+    assert len(encoded) == 2
+    assert any("MongoDB" in chunk for chunk in encoded[1])
+    assert set(encoded[1]) <= set(chunk_text(changed_section, 12, 4))
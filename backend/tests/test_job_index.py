@@ -0,0 +1,106 @@
+import threading
+
+import numpy as np
+import pytest
+
+from backend.services import job_index_service
+from backend.services.job_index_service import IVFIndex, JobIndex
+
+DIM = 16
+
+
+def clustered_vectors(n: int, clusters: int = 20, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIM))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def fill(index: JobIndex, vectors: np.ndarray, offset: int = 0) -> None:
+    for i, vector in enumerate(vectors, start=offset):
+        index.add(f"job-{i}", None, f"posting {i}", [], vector)
+
+
+def top_ids(index: JobIndex, query: np.ndarray, k: int) -> list[str]:
+    return [hit["job_id"] for hit in index.search(query, k)]
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list[str]:
+    return [f"job-{i}" for i in np.argsort(-(vectors @ query), kind="stable")[:k]]
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch) -> JobIndex:
+    monkeypatch.setattr(job_index_service.settings, "job_index_ivf_threshold", 500)
+    monkeypatch.setattr(job_index_service.settings, "job_index_ivf_nprobe", 16)
+    return JobIndex(path=str(tmp_path / "jobs.sqlite3"), dim=DIM)
+
+
+def test_ivf_with_every_list_probed_matches_brute_force(index, monkeypatch):
+    vectors = clustered_vectors(600)
+    fill(index, vectors)
+    monkeypatch.setattr(job_index_service.settings, "job_index_ivf_nprobe", 10_000)
+
+    for query in clustered_vectors(20, seed=1):
+        assert top_ids(index, query, 10) == brute_force(vectors, query, 10)
+    assert index._ivf is not None
+
+
+def test_ivf_recall_at_default_nprobe(index):
+    vectors = clustered_vectors(600)
+    fill(index, vectors)
+
+    queries = clustered_vectors(50, seed=1)
+    found = sum(len(set(top_ids(index, q, 10)) & set(brute_force(vectors, q, 10))) for q in queries)
+    assert found / (10 * len(queries)) >= 0.95
+
+
+def test_backend_switches_at_the_threshold(index):
+    vectors = clustered_vectors(500)
+    fill(index, vectors[:499])
+    query = vectors[0]
+
+    assert top_ids(index, query, 5) == brute_force(vectors[:499], query, 5)
+    assert index._ivf is None
+
+    fill(index, vectors[499:], offset=499)
+    index.search(query, 5)
+    assert index._ivf is not None and index._ivf.size == 500
+
+
+def test_postings_added_after_the_build_are_found(index):
+    fill(index, clustered_vectors(500))
+    index.search(clustered_vectors(1, seed=1)[0], 5)
+
+    outlier = np.zeros(DIM, dtype=np.float32)
+    outlier[0] = 1.0
+    index.add("late", None, "late posting", [], outlier)
+
+    assert top_ids(index, outlier, 1) == ["late"]
+    assert index._ivf.size == 500
+
+
+def test_searches_are_not_blocked_by_a_rebuild(index, monkeypatch):
+    vectors = clustered_vectors(500)
+    fill(index, vectors)
+
+    started, release = threading.Event(), threading.Event()
+    real_build = IVFIndex.build
+
+    def slow_build(*args, **kwargs):
+        started.set()
+        assert release.wait(10)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(IVFIndex, "build", slow_build)
+    builder = threading.Thread(target=index.search, args=(vectors[0], 5))
+    builder.start()
+    try:
+        assert started.wait(10)
+        # Falls back to brute force while the first index is being built
+        assert top_ids(index, vectors[1], 5) == brute_force(vectors, vectors[1], 5)
+        assert index._ivf is None
+    finally:
+        release.set()
+        builder.join()
+    assert index._ivf is not None
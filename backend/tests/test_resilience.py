@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from backend.services import ai_service
+from backend.services.resilience import CircuitBreaker, ConcurrencyLimiter, OverloadedError
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, name="test")
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    return breaker
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = half_open_breaker()
+    monkeypatch.setattr(ai_service, "_breaker", breaker)
+    monkeypatch.setattr(ai_service.settings, "openai_max_retries", 0)
+    return breaker
+
+
+def test_shed_trial_is_handed_back(breaker, monkeypatch):
+    async def run():
+        limiter = ConcurrencyLimiter(limit=1, max_queue=0, queue_timeout=1.0)
+        monkeypatch.setattr(ai_service, "_limiter", limiter)
+        async with limiter.slot():
+            with pytest.raises(OverloadedError):
+                await ai_service.call_openai(lambda: asyncio.sleep(0, "unreachable"))
+        return await ai_service.call_openai(lambda: asyncio.sleep(0, "ok"))
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_cancelled_trial_is_handed_back(breaker, monkeypatch):
+    async def run():
+        monkeypatch.setattr(ai_service, "_limiter", ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=1.0))
+        trial = asyncio.create_task(ai_service.call_openai(lambda: asyncio.sleep(60)))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await ai_service.call_openai(lambda: asyncio.sleep(0, "ok"))
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_settled_trial_is_not_released_twice():
+    breaker = half_open_breaker()
+    assert breaker.before_call() is True
+    breaker.record_failure()
+    breaker.end_trial()
+    # The failed trial reopened the circuit; ending it afterwards must not hand out a second trial
+    breaker.reset_timeout = 60.0
+    assert breaker.state == "open"
@@ -0,0 +1,49 @@
+from backend.core.config import settings
+from backend.services.skill_extractor import LocalSkillExtractor
+from backend.services.taxonomy import SkillGraph, load_taxonomy
+
+TAXONOMY = load_taxonomy(settings.skill_taxonomy_path)
+extractor = LocalSkillExtractor(TAXONOMY["skills"])
+graph = SkillGraph(TAXONOMY["skills"], TAXONOMY["related"])
+
+
+def test_english_words_are_not_skills():
+    text = (
+        "We want people who excel at teamwork, express ideas clearly and react quickly "
+        "to change. No shell company. Payments are made monthly; our helm is steady."
+    )
+    assert extractor.extract(text) == []
+
+
+def test_ambiguous_names_count_when_written_as_names():
+    text = "Built reports in Excel, a UI in React and an API on Express, deployed with Helm."
+    assert extractor.extract(text) == ["excel", "express", "helm", "react"]
+
+
+def test_capitalized_sentence_start_is_not_a_name():
+    assert extractor.extract("React quickly to incidents. Excel at communication!") == []
+
+
+def test_qualified_aliases_always_count():
+    text = "reactjs and express.js services, microsoft excel macros, payment processing, shell scripting"
+    assert {"react", "express", "excel", "payments", "bash"} <= set(extractor.extract(text))
+
+
+def test_aliases_resolve_to_canonical_names():
+    assert extractor.extract("Ran k8s clusters backed by Postgres") == ["kubernetes", "postgresql"]
+
+
+def test_multi_token_terms_yield_their_components():
+    assert extractor.extract("Pipelines in GitLab CI/CD") == ["ci/cd", "gitlab", "gitlab ci/cd"]
+
+
+def test_aliases_are_equivalent_in_the_graph():
+    assert "kubernetes" in graph.expand(["k8s"])
+    assert "k8s" in graph.expand(["kubernetes"])
+
+
+def test_implication_is_one_way():
+    assert {"serverless", "aws lambda"} <= graph.expand(["lambda"])
+    assert "lambda" not in graph.expand(["serverless"])
+    assert "unit testing" in graph.expand(["pytest"])
+    assert "pytest" not in graph.expand(["unit testing"])
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import ai_service
+from backend.services.resilience import CircuitBreaker
+
+
+def make_response(payload: str, status: str = "completed", reason=None, refusal=None) -> SimpleNamespace:
+    content = [SimpleNamespace(type="refusal", refusal=refusal)] if refusal else [
+        SimpleNamespace(type="output_text", text=payload)
+    ]
+    return SimpleNamespace(
+        status=status,
+        incomplete_details=SimpleNamespace(reason=reason) if reason else None,
+        output=[SimpleNamespace(type="message", content=content)],
+        output_text=payload,
+        usage=None,
+    )
+
+
+class StubClient:
+    """Stands in for AsyncOpenAI; returns a canned response and records the request."""
+
+    def __init__(self, response: SimpleNamespace):
+        self.response = response
+        self.requests = []
+        self.responses = self
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.response
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    monkeypatch.setattr(ai_service.settings, "skill_cache_enabled", False)
+    monkeypatch.setattr(ai_service.settings, "llm_input_compaction", False)
+    monkeypatch.setattr(ai_service.settings, "openai_max_retries", 0)
+    monkeypatch.setattr(ai_service, "_limiter", None)
+    monkeypatch.setattr(ai_service, "_breaker", CircuitBreaker(failure_threshold=5, reset_timeout=30.0))
+
+    def install(response: SimpleNamespace) -> StubClient:
+        client = StubClient(response)
+        monkeypatch.setattr(ai_service, "get_client", lambda: client)
+        return client
+
+    return install
+
+
+def test_both_documents_are_parsed_from_one_call(stub_client):
+    payload = json.dumps({
+        "job_skills": [{"skill": "k8s", "canonical": "kubernetes"}, {"skill": "python", "canonical": "python"}],
+        "resume_skills": [{"skill": "React.js", "canonical": "react"}],
+    })
+    client = stub_client(make_response(payload))
+
+    result = asyncio.run(ai_service.extract_skills_structured({"job": "job text", "resume": "resume text"}))
+
+    assert result == {"job": ["k8s", "kubernetes", "python"], "resume": ["react", "react.js"]}
+    assert len(client.requests) == 1
+    assert client.requests[0]["max_output_tokens"] >= 2 * 2000
+
+
+def test_truncated_response_raises_without_fallback(stub_client):
+    stub_client(make_response('{"job_skills": [{"skill": "pyth', status="incomplete", reason="max_output_tokens"))
+
+    with pytest.raises(ai_service.IncompleteResponseError, match="max_output_tokens"):
+        asyncio.run(ai_service.extract_skills_structured({"job": "job text"}, fallback=False))
+
+
+def test_truncated_response_falls_back_to_empty_lists(stub_client):
+    stub_client(make_response('{"job_skills": [', status="incomplete", reason="max_output_tokens"))
+
+    result = asyncio.run(ai_service.extract_skills_structured({"job": "job text", "resume": "resume text"}))
+
+    assert result == {"job": [], "resume": []}
+
+
+def test_refusal_is_reported(stub_client):
+    stub_client(make_response("", refusal="I can't help with that."))
+
+    with pytest.raises(ai_service.IncompleteResponseError, match="refused"):
+        asyncio.run(ai_service.extract_skills_structured({"resume": "resume text"}, fallback=False))
@@ -11,6 +11,12 @@ interface MatchResult {
   Status?: string;
 }
 
+// A resume uploaded as PDF: the server keeps its text under `id`
+interface UploadedResume {
+  id: string;
+  text: string;
+}
+
 function App() {
   const [jobText, setJobText] = useState('')
   const [resumeText, setResumeText] = useState('')
@@ -18,6 +24,7 @@ function App() {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [uploadingResume, setUploadingResume] = useState(false)
+  const [uploadedResume, setUploadedResume] = useState<UploadedResume | null>(null)
 
   const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
@@ -42,6 +49,7 @@ function App() {
 
       const data = await response.json()
       setResumeText(data.text)
+      setUploadedResume({ id: data.resume_id, text: data.text })
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to process PDF')
       console.error('PDF upload error:', err)
@@ -60,18 +68,29 @@ function App() {
     setError(null)
     setMatchResult(null)
 
-    try {
-      const response = await fetch(`${API_URL}/cvjob-compare`, {
+    const compare = (resume: { resume_id: string } | { resume_text: string }) =>
+      fetch(`${API_URL}/cvjob-compare`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
           job_text: jobText,
-          resume_text: resumeText,
+          ...resume,
         }),
       })
 
+    try {
+      // An unedited upload is sent by ID, so the resume text is not re-sent for every match
+      const useResumeId = uploadedResume !== null && uploadedResume.text === resumeText
+      let response = await compare(useResumeId ? { resume_id: uploadedResume.id } : { resume_text: resumeText })
+
+      if (useResumeId && response.status === 404) {
+        // The stored resume expired on the server; fall back to sending the text
+        setUploadedResume(null)
+        response = await compare({ resume_text: resumeText })
+      }
+
       if (!response.ok) {
         throw new Error(`API error: ${response.status}`)
       }